@@ -2,14 +2,64 @@ from panda3d.core import NodePath, CollisionNode, CollisionSphere, BitMask32
 from direct.actor.Actor import Actor
 import time
 
+from .animation import ZombieAnimator, IDLE, WALK, ATTACK, SPAWN, DIE, STATES
+from .ecs import default_store
+
+# Pick-mask bit shared by every actor's collider component
+PICK_MASK = 1 << 1
+
 
 class ActorBase:
-    def __init__(self, node: NodePath, name: str):
+    """Thin handle: the scene node plus an entity in an ``ecs.EntityStore``.
+
+    Per-actor state lives in the store's component arrays; the handle only
+    keeps what cannot be stored there (Panda3D objects and callbacks).
+    """
+
+    __slots__ = ("node", "name", "store", "entity", "__weakref__")
+
+    def __init__(self, node: NodePath, name: str, store=None):
         self.node = node
         self.name = name
+        self.store = store if store is not None else default_store()
+        self.entity = self.store.create(**self._components())
         # CHANGE: Panda3D NodePath uses camelCase API (setTag)
         self.node.setTag("actor", name)
 
+    def _components(self) -> dict:
+        """Components (and initial values) of this actor's entity."""
+        return {"transform": None}
+
+    @property
+    def position(self):
+        x, y, z, _ = self.store.get(self.entity, "transform").item()
+        return x, y, z
+
+    def sync_node(self):
+        """Copy the entity's transform (moved by a system) onto the node."""
+        x, y, z, h = self.store.get(self.entity, "transform").item()
+        self.node.setPos(x, y, z)
+        self.node.setH(h)
+        return x, y, z
+
+    def move_to(self, x, y, z=None, h=None):
+        """Move the entity and its node; ``z``/``h`` default to the current ones."""
+        t = self.store.get(self.entity, "transform")
+        t["x"], t["y"] = x, y
+        if z is not None:
+            t["z"] = z
+        if h is None:
+            self.node.setPos(x, y, float(t["z"]))
+        else:
+            t["h"] = h
+            self.node.setPosHpr(x, y, float(t["z"]), h, 0, 0)
+
+    def destroy(self):
+        """Release the entity; the handle must not be used afterwards."""
+        if self.entity >= 0:
+            self.store.destroy(self.entity)
+            self.entity = -1
+
     def set_pos(self, x, y=None, z=None):
         """Set position on the underlying NodePath.
 
@@ -22,15 +72,17 @@ class ActorBase:
             try:
                 # Supports Vec3/Point3 (x, y, z properties) or sequences
                 if hasattr(v, 'x') and hasattr(v, 'y') and hasattr(v, 'z'):
-                    self.node.setPos(v.x, v.y, v.z)
+                    x, y, z = v.x, v.y, v.z
                 else:
-                    self.node.setPos(*v)
+                    x, y, z = v
+                self.node.setPos(x, y, z)
             except Exception:
                 # Fallback: re-raise with clearer context
                 raise TypeError("set_pos() expected (x, y, z) or a 3-component vector/sequence")
         else:
             # Three-argument form
             self.node.setPos(x, y, z)
+        self.store.set(self.entity, "transform", {"x": x, "y": y, "z": z})
         return self
 
     def reparent_to(self, parent: NodePath):
@@ -38,49 +90,76 @@ class ActorBase:
         self.node.reparentTo(parent)
         return self
 
+    def _add_pick_solid(self, cname: str, solid, collision=None, moving: bool = True):
+        """Make this actor clickable by the picking ray (mask bit 1).
 
-class NPC(ActorBase):
-    def __init__(self, node: NodePath, name: str, dialog_lines=None):
-        super().__init__(node, name)
-        self.dialog_lines = dialog_lines or []
-        # collision for clicking
-        cnode = CollisionNode(f"npc-{name}")
+        With a ``CollisionLayers`` the solid lives on its pick layer and follows
+        this node from there; without one it is attached under the node.
+        """
+        if collision is not None:
+            from .collision import PICK
+
+            return collision.add_solid(PICK, solid, owner=self.node, node_name=cname, moving=moving)
+        cnode = CollisionNode(cname)
         # CHANGE: CollisionNode.addSolid (camelCase)
-        cnode.addSolid(CollisionSphere(0, 0, 0.5, 1.0))
+        cnode.addSolid(solid)
         # CHANGE: NodePath.attachNewNode (camelCase)
         cnp = self.node.attachNewNode(cnode)
-        # Make this clickable by the picking ray (mask bit 1)
         cnp.node().setIntoCollideMask(BitMask32.bit(1))
+        return cnp
+
+
+class NPC(ActorBase):
+    __slots__ = ("dialog_lines",)
+
+    def __init__(self, node: NodePath, name: str, dialog_lines=None, collision=None, store=None):
+        super().__init__(node, name, store)
+        self.dialog_lines = dialog_lines or []
+        # collision for clicking; NPCs stand still
+        self._add_pick_solid(f"npc-{name}", CollisionSphere(0, 0, 0.5, 1.0), collision, moving=False)
+
+
+    def _components(self) -> dict:
+        return {"transform": None, "collider": {"radius": 1.0, "offset_z": 0.5, "mask": PICK_MASK}}
 
 
 class Item(ActorBase):
-    def __init__(self, node: NodePath, name: str, description: str = ""):
-        super().__init__(node, name)
+    __slots__ = ("description",)
+
+    def __init__(self, node: NodePath, name: str, description: str = "", collision=None, store=None):
+        super().__init__(node, name, store)
         self.description = description
-        cnode = CollisionNode(f"item-{name}")
-        cnode.addSolid(CollisionSphere(0, 0, 0.25, 0.5))
-        cnp = self.node.attachNewNode(cnode)
         # Clickable by picking ray
-        cnp.node().setIntoCollideMask(BitMask32.bit(1))
+        self._add_pick_solid(f"item-{name}", CollisionSphere(0, 0, 0.25, 0.5), collision, moving=False)
         # CHANGE: NodePath.setTag (camelCase)
         self.node.setTag("collectible", "1")
 
+    def _components(self) -> dict:
+        return {
+            "transform": None,
+            "collider": {"radius": 0.5, "offset_z": 0.25, "mask": PICK_MASK},
+            "collectible": None,
+        }
+
+
 class Zombie(ActorBase):
-    def __init__(self, node: NodePath, name: str, dialog_lines=None):
-        super().__init__(node, name)
+    __slots__ = ("dialog_lines", "actor", "horde_slot", "_animator", "_anim_clock", "_blend_time")
+
+    def __init__(self, node: NodePath, name: str, dialog_lines=None, collision=None, anim_clock=None,
+                 blend_time: float = 0.0, store=None):
+        super().__init__(node, name, store)
         self.dialog_lines = dialog_lines or []
+        # Animation state machine settings; see the animator property
+        self._animator = None
+        self._anim_clock = anim_clock or time.monotonic
+        self._blend_time = blend_time
         # Tag for easy identification during picking
         self.node.setTag("zombie", "1")
-        # Basic health/state
-        self.max_health = 100
-        self.health = self.max_health
-        self.alive = True
+        # Basic health/state (stored in the entity's health component)
+        self.store.set(self.entity, "health", {"hp": 100, "max_hp": 100, "alive": True})
         # CHANGE: add a simple click-collision and attach a skinned model Actor to this node
         # so the zombie is visible and can animate.
-        cnode = CollisionNode(f"npc-{name}")
-        cnode.addSolid(CollisionSphere(0, 0, 0.5, 1.0))
-        cnp = self.node.attachNewNode(cnode)
-        cnp.node().setIntoCollideMask(BitMask32.bit(1))
+        self._add_pick_solid(f"npc-{name}", CollisionSphere(0, 0, 0.5, 1.0), collision)
 
         # CHANGE: load the simple enemy actor and parent it under this zombie node.
         # If assets are missing in runtime, the game will still work due to outer
@@ -120,20 +199,115 @@ class Zombie(ActorBase):
         # zombies converge on the player.
         self.speed = 4.0  # units per second
 
-    def set_walking(self, walking: bool):
-        """CHANGE: helper to swap between idle and walk animations if available."""
-        if not getattr(self, 'actor', None):
+    def _components(self) -> dict:
+        return {
+            "transform": None,
+            "health": None,
+            "motion": None,
+            "collider": {"radius": 1.0, "offset_z": 0.5, "mask": PICK_MASK},
+            "animation": {"state": STATES.index(IDLE)},
+        }
+
+    # --- component-backed state ---
+    @property
+    def health(self) -> int:
+        return int(self.store.get(self.entity, "health")["hp"])
+
+    @health.setter
+    def health(self, value: int):
+        self.store.get(self.entity, "health")["hp"] = value
+
+    @property
+    def max_health(self) -> int:
+        return int(self.store.get(self.entity, "health")["max_hp"])
+
+    @max_health.setter
+    def max_health(self, value: int):
+        self.store.get(self.entity, "health")["max_hp"] = value
+
+    @property
+    def alive(self) -> bool:
+        return self.entity >= 0 and bool(self.store.get(self.entity, "health")["alive"])
+
+    @alive.setter
+    def alive(self, value: bool):
+        self.store.get(self.entity, "health")["alive"] = value
+
+    @property
+    def speed(self) -> float:
+        return float(self.store.get(self.entity, "motion")["speed"])
+
+    @speed.setter
+    def speed(self, value: float):
+        self.store.get(self.entity, "motion")["speed"] = value
+
+    @property
+    def animator(self):
+        """State machine for ``self.actor`` (None without one); see animation.py."""
+        actor = getattr(self, 'actor', None)
+        if actor is None:
+            return None
+        if self._animator is None or self._animator.actor is not actor:
+            # the constructor leaves a fresh actor looping 'stand'
+            self._animator = ZombieAnimator(actor, IDLE, self._blend_time, self._anim_clock)
+        return self._animator
+
+    def _animate(self, state: str):
+        animator = self.animator
+        if animator is None:
             return
         try:
-            if walking:
-                if self.actor.getCurrentAnim() != 'walk':
-                    self.actor.loop('walk')
-            else:
-                if self.actor.getCurrentAnim() != 'stand':
-                    self.actor.loop('stand')
+            if animator.request(state) or animator.state != state:
+                self.store.get(self.entity, "animation")["state"] = STATES.index(animator.state)
         except Exception:
             pass
 
+    def cleanup(self):
+        """Free the Actor's animations, remove the node and release the entity.
+
+        Detaching alone keeps the Actor, its animation bundles and the node
+        alive as long as anything still references the handle.
+        """
+        actor = getattr(self, 'actor', None)
+        if actor is not None:
+            try:
+                actor.cleanup()
+            except Exception:
+                pass
+            self.actor = None
+        self._animator = None
+        try:
+            self.node.removeNode()
+        except Exception:
+            pass
+        self.destroy()
+
+    def set_walking(self, walking: bool):
+        """CHANGE: helper to swap between idle and walk animations if available.
+
+        Called for every zombie every substep; only a change of state reaches
+        the Actor.
+        """
+        self._animate(WALK if walking else IDLE)
+
+    def set_animated(self, animated: bool):
+        """Animation level of detail: False holds the pose of a distant zombie."""
+        animator = self.animator
+        if animator is not None:
+            animator.set_animated(animated)
+
+    def play_spawn(self):
+        """Rise from the ground; walking requests wait until this has played."""
+        self._animate(SPAWN)
+
+    def attack(self):
+        self._animate(ATTACK)
+
+    @property
+    def is_spawning(self) -> bool:
+        animator = self.animator
+        return animator is not None and animator.state == SPAWN and animator.busy
+
     # --- combat helpers ---
     def take_damage(self, amount: int) -> int:
         """Apply damage and return remaining health. If reaches zero, mark dead."""
@@ -148,12 +322,5 @@ class Zombie(ActorBase):
         if not self.alive:
             return
         self.alive = False
-        try:
-            if getattr(self, 'actor', None):
-                # play a die animation if available; otherwise stop anims
-                try:
-                    self.actor.play('die')
-                except Exception:
-                    self.actor.stop()
-        except Exception:
-            pass
+        # play a die animation if available (the animator stops anims otherwise)
+        self._animate(DIE)
@@ -0,0 +1,139 @@
+"""Time-budgeted, round-robin scheduler for per-entity AI updates.
+
+Each frame the scheduler spends at most ``budget_ms`` of wall time calling the
+update callback. Priority entities (near the player or on screen) are visited
+first; everything else is visited round-robin from where the previous frame
+stopped. An entity that is skipped keeps accumulating simulation time, so when
+it is next updated it receives the full ``dt`` since its last update.
+
+Priority is not evaluated for every entity every step: a classification
+cursor re-checks ``classify_per_step`` entities per step and keeps the
+result, so the cost of a step does not grow with the number of entities.
+"""
+import time
+import weakref
+from typing import Callable, Optional, Sequence
+
+
+class AIScheduler:
+    def __init__(
+        self,
+        budget_ms: float = 2.0,
+        min_updates: int = 1,
+        clock: Callable[[], float] = time.perf_counter,
+        classify_per_step: int = 32,
+    ):
+        self.budget_ms = budget_ms
+        # Always update at least this many entities per frame so far-away
+        # entities cannot starve when priority entities eat the budget.
+        self.min_updates = min_updates
+        self.classify_per_step = classify_per_step
+        self._clock = clock
+        self.sim_time = 0.0
+        self._last_update = weakref.WeakKeyDictionary()
+        # entities last classified as priority, in the order they were found
+        self._urgent = weakref.WeakKeyDictionary()
+        self._classify_cursor = 0
+        self._priority_cursor = 0
+        self._rest_cursor = 0
+        # untracked entities owe the time since the current lap started
+        self._lap_start = 0.0
+        self._frame_start = None
+        self._frame_updates = 0
+        # stats of the last completed step
+        self.last_updated = 0
+        self.last_deferred = 0
+
+    def begin_frame(self):
+        """Start a new frame budget; call once per rendered frame."""
+        self._frame_start = self._clock()
+        self._frame_updates = 0
+
+    def track(self, entity):
+        """Register a new entity; its first update covers only the time since now."""
+        self._last_update[entity] = self.sim_time
+
+    def forget(self, entity):
+        """Drop bookkeeping for an entity that left the simulation."""
+        self._last_update.pop(entity, None)
+        self._urgent.pop(entity, None)
+
+    def pending_dt(self, entity) -> float:
+        """Simulation time the entity has accumulated since its last update."""
+        return self.sim_time - self._last_update.get(entity, self._lap_start)
+
+    def step(
+        self,
+        entities: Sequence,
+        dt: float,
+        update: Callable[[object, float], None],
+        priority: Optional[Callable[[object], bool]] = None,
+    ) -> int:
+        """Advance simulation time by ``dt`` and update entities within budget.
+
+        ``update(entity, entity_dt)`` is called for each visited entity with the
+        time accumulated since that entity was last updated (see ``track``).
+        Returns the number of entities updated during this step.
+        """
+        if self._frame_start is None:
+            self.begin_frame()
+        self.sim_time += dt
+        n = len(entities)
+        if priority is not None:
+            self._classify(entities, priority)
+
+        budget_s = self.budget_ms / 1000.0
+        urgent = list(self._urgent)
+        self._priority_cursor, updated = self._run(urgent, self._priority_cursor, update, budget_s)
+        # everything else, round-robin; priority entities were visited above
+        cursor = self._rest_cursor % n if n else 0
+        visited = 0
+        while visited < n and not self._over_budget(budget_s):
+            e = entities[(cursor + visited) % n]
+            visited += 1
+            if e in self._urgent:
+                continue
+            self._visit(e, update)
+            updated += 1
+        if n and cursor + visited >= n:
+            self._lap_start = self.sim_time
+        self._rest_cursor = (cursor + visited) % n if n else 0
+
+        self.last_updated = updated
+        self.last_deferred = max(0, n - updated)
+        return updated
+
+    def _classify(self, entities: Sequence, priority: Callable[[object], bool]):
+        """Re-check the priority of the next ``classify_per_step`` entities."""
+        n = len(entities)
+        if n == 0:
+            return
+        start = self._classify_cursor % n
+        for i in range(min(n, self.classify_per_step)):
+            e = entities[(start + i) % n]
+            if priority(e):
+                self._urgent[e] = True
+            else:
+                self._urgent.pop(e, None)
+        self._classify_cursor = (start + min(n, self.classify_per_step)) % n
+
+    def _over_budget(self, budget_s: float) -> bool:
+        return self._frame_updates >= self.min_updates and self._clock() - self._frame_start >= budget_s
+
+    def _visit(self, e, update):
+        entity_dt = self.sim_time - self._last_update.get(e, self._lap_start)
+        self._last_update[e] = self.sim_time
+        update(e, entity_dt)
+        self._frame_updates += 1
+
+    def _run(self, group, cursor, update, budget_s):
+        """Visit ``group`` round-robin from ``cursor``; return (cursor, count)."""
+        n = len(group)
+        if n == 0:
+            return 0, 0
+        cursor %= n
+        done = 0
+        while done < n and not self._over_budget(budget_s):
+            self._visit(group[(cursor + done) % n], update)
+            done += 1
+        return (cursor + done) % n, done
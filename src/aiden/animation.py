@@ -0,0 +1,170 @@
+"""Per-zombie animation state machine.
+
+The current state lives in Python, so asking for the state a zombie is
+already in costs a comparison instead of a ``getCurrentAnim()`` call into the
+Actor. The Actor is only touched on a transition, plus once per frame while a
+cross-fade is running.
+
+States and the transitions allowed between them::
+
+    (idle) -> spawn -> idle/walk/attack -> die
+                       idle <-> walk <-> attack
+
+``spawn`` and ``attack`` are one-shots: requests for ``idle`` or ``walk``
+made while they play are remembered and applied when the one-shot ends.
+``die`` is final. Nothing plays ``spawn`` unless it is asked for.
+
+``set_animated(False)`` is the level-of-detail switch for distant zombies:
+the Actor holds its pose and looping states are only tracked until
+animation is switched back on. One-shots still play.
+"""
+import time
+from typing import Callable
+
+SPAWN = "spawn"
+IDLE = "stand"
+WALK = "walk"
+ATTACK = "attack"
+DIE = "die"
+
+# Stable order; the index is what an entity's animation component stores
+STATES = (IDLE, WALK, SPAWN, ATTACK, DIE)
+LOOPING = frozenset((IDLE, WALK))
+ONE_SHOT = frozenset((SPAWN, ATTACK, DIE))
+TRANSITIONS = {
+    SPAWN: frozenset((IDLE, WALK, ATTACK, DIE)),
+    # a freshly built zombie stands idle until it is told to rise
+    IDLE: frozenset((SPAWN, WALK, ATTACK, DIE)),
+    WALK: frozenset((IDLE, ATTACK, DIE)),
+    ATTACK: frozenset((IDLE, WALK, DIE)),
+    DIE: frozenset(),
+}
+# Used when an Actor cannot report an animation's length
+DEFAULT_DURATION = 1.0
+
+
+class ZombieAnimator:
+    def __init__(
+        self,
+        actor,
+        state: str = IDLE,
+        blend_time: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Drive ``actor``, which is assumed to be playing ``state`` already."""
+        self.actor = actor
+        self.state = state
+        self.blend_time = blend_time
+        self._clock = clock
+        # looping state to return to when a one-shot ends
+        self._next = IDLE if state in ONE_SHOT else state
+        self._one_shot_end = None
+        self._fade = None  # (from anim, started at)
+        self._durations = {}
+        self.transitions = 0
+        self.animated = True
+        if blend_time > 0:
+            try:
+                actor.enableBlend()
+                actor.setControlEffect(state, 1.0)
+            except Exception:
+                self.blend_time = 0.0
+
+    @property
+    def busy(self) -> bool:
+        """True while a one-shot (spawn or attack) is still playing."""
+        self.update()
+        return self.state in (SPAWN, ATTACK)
+
+    def request(self, state: str) -> bool:
+        """Move to ``state`` if allowed; True when the Actor was told to."""
+        self.update()
+        if state in LOOPING and self.state in (SPAWN, ATTACK):
+            self._next = state
+            return False
+        if state == self.state or state not in TRANSITIONS[self.state]:
+            return False
+        self._enter(state)
+        return True
+
+    def set_animated(self, animated: bool):
+        """Resume or freeze the looping animation (one-shots run to their end)."""
+        if animated == self.animated:
+            return
+        self.animated = animated
+        if self.state not in LOOPING:
+            return
+        try:
+            if animated:
+                self.actor.loop(self.state)
+            else:
+                self.actor.stop()
+        except Exception:
+            pass
+
+    def update(self):
+        """Finish one-shots and cross-fades that have run their course.
+
+        Does nothing (no Actor calls) unless one of them is in progress.
+        """
+        if self._one_shot_end is None and self._fade is None:
+            return
+        now = self._clock()
+        if self._fade is not None:
+            source, started = self._fade
+            w = min(1.0, (now - started) / self.blend_time)
+            try:
+                self.actor.setControlEffect(self.state, w)
+                self.actor.setControlEffect(source, 1.0 - w)
+                if w >= 1.0:
+                    self.actor.stop(source)
+            except Exception:
+                w = 1.0
+            if w >= 1.0:
+                self._fade = None
+        if self._one_shot_end is not None and now >= self._one_shot_end:
+            self._one_shot_end = None
+            if self.state != DIE:
+                self._enter(self._next)
+
+    def _enter(self, state: str):
+        source = self.state
+        self.state = state
+        self.transitions += 1
+        if state in LOOPING:
+            self._next = state
+            self._one_shot_end = None
+            if not self.animated:
+                # frozen: remember the state, leave the Actor alone
+                self._fade = None
+                return
+            self.actor.loop(state)
+        else:
+            self._one_shot_end = self._clock() + self._duration(state)
+            try:
+                self.actor.play(state)
+            except Exception:
+                self.actor.stop()
+        if self.blend_time > 0 and source != state:
+            if self._fade is not None:
+                # fading again before the last fade ended: drop its source
+                try:
+                    self.actor.setControlEffect(self._fade[0], 0.0)
+                except Exception:
+                    pass
+            self._fade = (source, self._clock())
+            try:
+                self.actor.setControlEffect(state, 0.0)
+            except Exception:
+                self._fade = None
+
+    def _duration(self, anim: str) -> float:
+        d = self._durations.get(anim)
+        if d is None:
+            try:
+                d = float(self.actor.getDuration(anim))
+            except Exception:
+                d = DEFAULT_DURATION
+            self._durations[anim] = d
+        return d
+
@@ -0,0 +1,186 @@
+"""Headless render-plus-logic frame benchmark.
+
+Runs ``AdventureGame`` into an offscreen buffer drawn by Panda3D's software
+renderer (p3tinydisplay), so no GPU or display is needed. For each zombie
+count the player flies the same scripted path through the scene while every
+frame (logic, cull and draw) is timed. The clock runs in non-real-time mode
+at a fixed step, so every run simulates the same game time.
+
+Per zombie count the report has the frame-time distribution, draw calls
+(geoms submitted after culling) and the scene's node, geom and triangle
+counts. Output is JSON like ``aiden.rag.bench``:
+
+    python -m aiden.bench_render --zombies 0,50,200 --frames 600 --output render.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Sequence
+
+from .rag.bench import _git_commit, percentiles
+
+FRAME_RATE = 60.0
+# Scripted path: a loop around the scene with a slow in-and-out sweep
+PATH_RADIUS = 30.0
+PATH_SWEEP = 12.0
+PATH_PERIOD = 20.0  # seconds of game time per lap
+HEADLESS_PRC = "window-type offscreen\nload-display p3tinydisplay\naudio-library-name null"
+
+
+def headless_game(width: int = 64, height: int = 64, **kwargs):
+    """An ``AdventureGame`` rendering into a software offscreen buffer."""
+    from panda3d.core import loadPrcFileData
+
+    loadPrcFileData("", f"{HEADLESS_PRC}\nwin-size {width} {height}")
+    from .game import AdventureGame
+
+    return AdventureGame(**kwargs)
+
+
+def camera_path(t: float):
+    """Player ``(x, y, heading)`` at game time ``t``; repeats every lap."""
+    a = 2.0 * math.pi * t / PATH_PERIOD
+    r = PATH_RADIUS + PATH_SWEEP * math.sin(3.0 * a)
+    x, y = r * math.cos(a), r * math.sin(a)
+    # face along the path (Panda3D heading 0 looks down +Y)
+    dr = 3.0 * PATH_SWEEP * math.cos(3.0 * a)
+    dx = dr * math.cos(a) - r * math.sin(a)
+    dy = dr * math.sin(a) + r * math.cos(a)
+    return x, y, math.degrees(math.atan2(-dx, dy))
+
+
+def draw_calls(win) -> int:
+    """Geoms the last frame submitted for drawing, over all display regions."""
+    from panda3d.core import SceneGraphAnalyzer
+
+    total = 0
+    for i in range(win.getNumDisplayRegions()):
+        graph = win.getDisplayRegion(i).makeCullResultGraph()
+        if graph is None:
+            continue
+        analyzer = SceneGraphAnalyzer()
+        analyzer.addNode(graph)
+        total += analyzer.getNumGeoms()
+    return total
+
+
+def scene_stats(root) -> Dict[str, int]:
+    from panda3d.core import SceneGraphAnalyzer
+
+    analyzer = SceneGraphAnalyzer()
+    analyzer.addNode(root.node())
+    return {
+        "nodes": analyzer.getNumNodes(),
+        "geom_nodes": analyzer.getNumGeomNodes(),
+        "geoms": analyzer.getNumGeoms(),
+        "triangles": analyzer.getNumTris(),
+    }
+
+
+def summarize(zombies: int, frame_ms: Sequence[float], draws: Sequence[int], scene: Dict[str, int]) -> Dict:
+    frame = percentiles(frame_ms)
+    return {
+        "zombies": zombies,
+        "frame": frame,
+        "fps_mean": round(1000.0 / frame["mean_ms"], 2) if frame and frame["mean_ms"] else None,
+        "draw_calls": {
+            "mean": round(sum(draws) / len(draws), 2) if draws else None,
+            "max": max(draws) if draws else None,
+        },
+        "scene": scene,
+        "frame_ms": [round(t, 4) for t in frame_ms],
+    }
+
+
+def populate(game, zombies: int):
+    """Replace the live zombies with ``zombies`` fresh ones around the player."""
+    for z in list(game.zombies):
+        game._despawn_zombie(z)
+    for _ in range(zombies):
+        game._spawn_zombie_at(game._random_spawn_position())
+
+
+def bench_zombies(game, zombies: int, frames: int, warmup: int, seed: int = 0) -> Dict:
+    random.seed(seed)
+    populate(game, zombies)
+    frame_ms, draws = [], []
+    for i in range(warmup + frames):
+        x, y, h = camera_path(i / FRAME_RATE)
+        game.player.setPos(x, y, game.player.getZ())
+        game.player.setH(h)
+        start = time.perf_counter()
+        game.taskMgr.step()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        if i >= warmup:
+            frame_ms.append(elapsed)
+            draws.append(draw_calls(game.win))
+    result = summarize(zombies, frame_ms, draws, scene_stats(game.render))
+    result["live_zombies"] = len(game.zombies)
+    return result
+
+
+def run(args) -> Dict:
+    from panda3d.core import ClockObject
+
+    counts = [int(n) for n in args.zombies.split(",")]
+    game = headless_game(args.width, args.height, world_dir=args.world)
+    # fixed workload: no timed spawns, and a caught player is back next frame
+    game.zombie_spawner.cancel()
+    game.respawn_delay = 0.0
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MNonRealTime)
+    clock.setFrameRate(FRAME_RATE)
+    results = {
+        "meta": {
+            "benchmark": "render",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "renderer": game.win.getGsg().getDriverRenderer(),
+            "size": [args.width, args.height],
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "world": args.world,
+        },
+        "runs": [bench_zombies(game, n, args.frames, args.warmup, args.seed) for n in counts],
+    }
+    if game.world_streamer is not None:
+        game.world_streamer.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark render and logic frame times offscreen")
+    parser.add_argument("--zombies", default="0,50,200", help="comma-separated zombie counts")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per zombie count")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames before each run")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--world", default=None, metavar="DIR", help="stream this chunked world instead of the fixed map")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    for r in results["runs"]:
+        f = r["frame"]
+        print(
+            f"zombies {r['zombies']:5d}  mean {f['mean_ms']:8.3f} ms  p95 {f['p95_ms']:8.3f}  "
+            f"p99 {f['p99_ms']:8.3f}  draws {r['draw_calls']['mean']:7.1f}  nodes {r['scene']['nodes']}",
+            file=sys.stderr,
+        )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Collision layers: one collision root per collide-mask bit.
+
+Traversing ``render`` makes every ray visit the whole scene graph, including
+visible geometry that can never be hit. Here each layer owns a small root
+holding only its own CollisionNodes, and each layer has its own traverser, so
+a traversal only walks the solids that can answer it.
+
+Solids that belong to something in the scene are registered with an
+``owner`` NodePath. A moving owner's transform is copied onto its solid when
+that layer is traversed, so solids that are never queried never cost a sync.
+Static owners are copied once, on the first traversal after they are added.
+"""
+from panda3d.core import BitMask32, CollisionHandlerQueue, CollisionNode, CollisionTraverser, NodePath
+
+PICK = "pick"
+GROUND = "ground"
+# Mask bits the game has always used: picking ray on 1, grounding ray on 2
+LAYER_BITS = {PICK: 1, GROUND: 2}
+
+_OWNER_TAG = "collision_owner"
+
+
+class _Layer:
+    def __init__(self, name: str, bit: int, root: NodePath):
+        self.name = name
+        self.mask = BitMask32.bit(bit)
+        self.root = root
+        self.traverser = CollisionTraverser(f"{name}-traverser")
+        self.moving = []  # (solid NodePath, owner NodePath), synced every traversal
+        self.static = []  # placed once, on the first traversal after being added
+        self.pending = False
+
+
+class CollisionLayers:
+    def __init__(self, parent: NodePath, layers=None):
+        """Create one root per layer under ``parent`` (normally ``render``)."""
+        self._layers = {}
+        for name, bit in (layers or LAYER_BITS).items():
+            root = parent.attachNewNode(f"collision-{name}")
+            self._layers[name] = _Layer(name, bit, root)
+
+    def layer(self, name: str) -> _Layer:
+        try:
+            return self._layers[name]
+        except KeyError:
+            raise KeyError(f"unknown collision layer {name!r}") from None
+
+    def root(self, name: str) -> NodePath:
+        return self.layer(name).root
+
+    def mask(self, name: str):
+        return self.layer(name).mask
+
+    def add_solid(self, name: str, solid, owner: NodePath = None, node_name: str = None, moving: bool = True):
+        """Put ``solid`` on a layer and return its NodePath.
+
+        With an ``owner`` the solid is expressed in the owner's local space and
+        picks resolve back to the owner (see ``owner_of``); without one it is
+        placed directly in layer (world) space.
+        """
+        layer = self.layer(name)
+        cnode = CollisionNode(node_name or f"{name}-solid")
+        cnode.addSolid(solid)
+        cnode.setIntoCollideMask(layer.mask)
+        cnode.setFromCollideMask(BitMask32.allOff())
+        cnp = layer.root.attachNewNode(cnode)
+        if owner is not None:
+            cnp.setPythonTag(_OWNER_TAG, owner)
+            if moving:
+                layer.moving.append((cnp, owner))
+            else:
+                layer.static.append((cnp, owner))
+                layer.pending = True
+        return cnp
+
+    def add_collider(self, name: str, from_np: NodePath, handler=None):
+        """Register a from-object (e.g. a ray) that collides with one layer."""
+        layer = self.layer(name)
+        node = from_np.node()
+        node.setFromCollideMask(layer.mask)
+        node.setIntoCollideMask(BitMask32.allOff())
+        handler = handler if handler is not None else CollisionHandlerQueue()
+        layer.traverser.addCollider(from_np, handler)
+        return handler
+
+    def traverse(self, name: str):
+        """Sync owned solids on this layer, then test its colliders against it."""
+        layer = self.layer(name)
+        self._sync(layer)
+        layer.traverser.traverse(layer.root)
+
+    def _sync(self, layer: _Layer):
+        if layer.pending:
+            for cnp, owner in layer.static:
+                if not owner.isEmpty():
+                    cnp.setTransform(owner.getTransform(layer.root))
+            layer.pending = False
+        alive = []
+        for cnp, owner in layer.moving:
+            if owner.isEmpty():
+                cnp.removeNode()
+                continue
+            cnp.setTransform(owner.getTransform(layer.root))
+            alive.append((cnp, owner))
+        layer.moving = alive
+
+    def remove(self, owner: NodePath):
+        """Drop every solid registered for ``owner`` (when it leaves the world)."""
+        for layer in self._layers.values():
+            for attr in ("moving", "static"):
+                kept = []
+                for cnp, o in getattr(layer, attr):
+                    if o == owner:
+                        cnp.removeNode()
+                    else:
+                        kept.append((cnp, o))
+                setattr(layer, attr, kept)
+
+    @staticmethod
+    def owner_of(np: NodePath) -> NodePath:
+        """Scene NodePath a hit solid stands for; ``np`` itself if unowned."""
+        if np.hasPythonTag(_OWNER_TAG):
+            return np.getPythonTag(_OWNER_TAG)
+        return np
+
+    def count(self, name: str) -> int:
+        return self.layer(name).root.getNumChildren()
@@ -0,0 +1,282 @@
+"""Archetype entity-component store.
+
+Components are numpy structured dtypes. Entities that have exactly the same
+set of components share an archetype, which stores one packed column per
+component plus the entity ids of its rows. Removing an entity moves the
+archetype's last row into the hole, so columns stay dense and a system can
+run over ``column[:count]`` with array operations instead of visiting Python
+objects.
+
+An entity costs the bytes of its components plus two int32 slots in the
+location table. Game objects (``actors.ActorBase`` and subclasses) are thin
+``__slots__`` handles that keep their entity id and read and write their
+state here.
+"""
+import numpy as np
+
+COMPONENTS = {
+    "transform": np.dtype([("x", "f4"), ("y", "f4"), ("z", "f4"), ("h", "f4")]),
+    "health": np.dtype([("hp", "i4"), ("max_hp", "i4"), ("alive", "?")]),
+    "motion": np.dtype([("speed", "f4")]),
+    "collider": np.dtype([("radius", "f4"), ("offset_z", "f4"), ("mask", "u4")]),
+    "animation": np.dtype([("state", "u1")]),
+    "collectible": np.dtype([("collected", "?")]),
+    # slot in a ShardedHorde whose transforms this entity follows
+    "horde": np.dtype([("slot", "i4")]),
+}
+
+INITIAL_CAPACITY = 64
+
+
+class Archetype:
+    def __init__(self, components):
+        self.components = tuple(sorted(components))
+        self.count = 0
+        self.entities = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.columns = {c: np.zeros(INITIAL_CAPACITY, dtype=COMPONENTS[c]) for c in self.components}
+
+    def _reserve(self, n: int):
+        cap = len(self.entities)
+        if n <= cap:
+            return
+        while cap < n:
+            cap *= 2
+        self.entities = np.resize(self.entities, cap)
+        for c, col in self.columns.items():
+            grown = np.zeros(cap, dtype=col.dtype)
+            grown[: self.count] = col[: self.count]
+            self.columns[c] = grown
+
+    def append(self, eid: int) -> int:
+        self._reserve(self.count + 1)
+        row = self.count
+        self.entities[row] = eid
+        for col in self.columns.values():
+            col[row] = np.zeros((), dtype=col.dtype)
+        self.count += 1
+        return row
+
+    def remove(self, row: int) -> int:
+        """Drop ``row`` by moving the last row into it; returns the moved entity or -1."""
+        last = self.count - 1
+        moved = -1
+        if row != last:
+            moved = int(self.entities[last])
+            self.entities[row] = moved
+            for col in self.columns.values():
+                col[row] = col[last]
+        self.count = last
+        return moved
+
+    def view(self, component: str) -> np.ndarray:
+        return self.columns[component][: self.count]
+
+    def nbytes(self) -> int:
+        return self.entities.nbytes + sum(col.nbytes for col in self.columns.values())
+
+
+class EntityStore:
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.archetypes = []
+        self._by_key = {}
+        # location table: archetype index (-1 = free) and row, per entity id
+        self._arch = np.full(capacity, -1, dtype=np.int32)
+        self._row = np.zeros(capacity, dtype=np.int32)
+        self._free = []
+        self._next = 0
+
+    def _archetype(self, components) -> int:
+        key = frozenset(components)
+        unknown = key - COMPONENTS.keys()
+        if unknown:
+            raise KeyError(f"unknown components: {sorted(unknown)}")
+        idx = self._by_key.get(key)
+        if idx is None:
+            idx = len(self.archetypes)
+            self.archetypes.append(Archetype(key))
+            self._by_key[key] = idx
+        return idx
+
+    def _new_id(self) -> int:
+        if self._free:
+            return self._free.pop()
+        eid = self._next
+        self._next += 1
+        if eid >= len(self._arch):
+            cap = len(self._arch) * 2
+            self._arch = np.concatenate([self._arch, np.full(cap - len(self._arch), -1, dtype=np.int32)])
+            self._row = np.resize(self._row, cap)
+        return eid
+
+    def create(self, **components) -> int:
+        """New entity with the given components; values are tuples or dicts."""
+        eid = self._new_id()
+        a = self._archetype(components)
+        self._arch[eid] = a
+        self._row[eid] = self.archetypes[a].append(eid)
+        for name, value in components.items():
+            if value is not None:
+                self.set(eid, name, value)
+        return eid
+
+    def create_many(self, n: int, **columns) -> np.ndarray:
+        """Create ``n`` entities in one archetype; values are per-field arrays.
+
+        ``columns`` maps component name to a dict of field -> scalar or array
+        (or ``None`` for zeros), e.g. ``transform={"x": xs, "y": ys}``.
+        """
+        a = self._archetype(columns)
+        arch = self.archetypes[a]
+        eids = np.array([self._new_id() for _ in range(n)], dtype=np.int32)
+        start = arch.count
+        arch._reserve(start + n)
+        arch.entities[start : start + n] = eids
+        for col in arch.columns.values():
+            col[start : start + n] = np.zeros((), dtype=col.dtype)
+        for name, fields in columns.items():
+            for field, values in (fields or {}).items():
+                arch.columns[name][field][start : start + n] = values
+        arch.count += n
+        self._arch[eids] = a
+        self._row[eids] = np.arange(start, start + n, dtype=np.int32)
+        return eids
+
+    def destroy(self, eid: int):
+        if not self.alive(eid):
+            return
+        arch = self.archetypes[self._arch[eid]]
+        moved = arch.remove(int(self._row[eid]))
+        if moved >= 0:
+            self._row[moved] = self._row[eid]
+        self._arch[eid] = -1
+        self._free.append(eid)
+
+    def alive(self, eid: int) -> bool:
+        return 0 <= eid < self._next and self._arch[eid] >= 0
+
+    def components(self, eid: int):
+        return self.archetypes[self._arch[eid]].components if self.alive(eid) else ()
+
+    def has(self, eid: int, component: str) -> bool:
+        return component in self.components(eid)
+
+    def get(self, eid: int, component: str):
+        """The entity's component as a record view (writes go to the store)."""
+        arch = self.archetypes[self._arch[eid]]
+        return arch.columns[component][self._row[eid]]
+
+    def set(self, eid: int, component: str, value):
+        record = self.get(eid, component)
+        if isinstance(value, dict):
+            for field, v in value.items():
+                record[field] = v
+        else:
+            self.archetypes[self._arch[eid]].columns[component][self._row[eid]] = tuple(value)
+
+    def add(self, eid: int, component: str, value=None):
+        """Give an entity another component (moves it to a new archetype)."""
+        self._move(eid, set(self.components(eid)) | {component})
+        if value is not None:
+            self.set(eid, component, value)
+
+    def remove(self, eid: int, component: str):
+        self._move(eid, set(self.components(eid)) - {component})
+
+    def _move(self, eid: int, components):
+        old = self.archetypes[self._arch[eid]]
+        a = self._archetype(components)
+        if self.archetypes[a] is old:
+            return
+        new = self.archetypes[a]
+        old_row = int(self._row[eid])
+        row = new.append(eid)
+        for c in new.components:
+            if c in old.columns:
+                new.columns[c][row] = old.columns[c][old_row]
+        moved = old.remove(old_row)
+        if moved >= 0:
+            self._row[moved] = old_row
+        self._arch[eid] = a
+        self._row[eid] = row
+
+    def query(self, *components):
+        """Yield ``(entity ids, {component: column})`` per matching archetype.
+
+        Columns are views: assigning into them updates the store. Do not
+        create or destroy entities while iterating.
+        """
+        want = set(components)
+        for arch in self.archetypes:
+            if arch.count and want.issubset(arch.components):
+                yield arch.entities[: arch.count], {c: arch.view(c) for c in components}
+
+    def count(self, *components) -> int:
+        return sum(len(ids) for ids, _ in self.query(*components))
+
+    def __len__(self):
+        return self._next - len(self._free)
+
+    def nbytes(self) -> int:
+        return self._arch.nbytes + self._row.nbytes + sum(a.nbytes() for a in self.archetypes)
+
+
+_default_store = None
+
+
+def default_store() -> EntityStore:
+    """Store used by handles created without an explicit one."""
+    global _default_store
+    if _default_store is None:
+        _default_store = EntityStore()
+    return _default_store
+
+
+# --- systems ---
+def seek(store: EntityStore, target_x: float, target_y: float, dt: float, reach: float = 1.0,
+         held=()) -> np.ndarray:
+    """Move every living entity with a speed toward a target; face it.
+
+    Entities never overshoot the target; entities whose ids are in ``held``
+    stay where they are. Returns the ids of the living, unheld entities
+    within ``reach`` of it.
+    """
+    contacts = []
+    held = np.asarray(held, dtype=np.int32)
+    for ids, cols in store.query("transform", "motion", "health"):
+        t, alive = cols["transform"], cols["health"]["alive"]
+        if held.size:
+            alive = alive & ~np.isin(ids, held)
+        dx = target_x - t["x"]
+        dy = target_y - t["y"]
+        dist = np.hypot(dx, dy)
+        step = np.where(alive & (dist > 0.01), np.minimum(cols["motion"]["speed"] * dt, dist), 0.0)
+        inv = step / np.maximum(dist, 1e-6)
+        t["x"] += dx * inv
+        t["y"] += dy * inv
+        moving = step > 0
+        # Panda3D heading: 0 faces +Y, positive turns toward -X
+        t["h"][moving] = np.degrees(np.arctan2(-dx[moving], dy[moving]))
+        contacts.append(ids[alive & (np.hypot(target_x - t["x"], target_y - t["y"]) < reach)])
+    return np.concatenate(contacts) if contacts else np.empty(0, dtype=np.int32)
+
+
+def follow_slots(store: EntityStore, pos: np.ndarray, heading: np.ndarray, touching=(), held=()) -> np.ndarray:
+    """Copy positions and headings simulated elsewhere into the transforms.
+
+    Every entity with a ``horde`` component takes ``pos[slot]`` and
+    ``heading[slot]``; entities whose ids are in ``held`` keep theirs.
+    Returns the ids of the unheld entities whose slot is in ``touching``.
+    """
+    contacts = []
+    held = np.asarray(held, dtype=np.int32)
+    touching = np.asarray(touching, dtype=np.int64)
+    for ids, cols in store.query("transform", "horde"):
+        t, slot = cols["transform"], cols["horde"]["slot"]
+        free = ~np.isin(ids, held) if held.size else np.ones(len(ids), dtype=bool)
+        s = slot[free]
+        t["x"][free] = pos[s, 0]
+        t["y"][free] = pos[s, 1]
+        t["h"][free] = heading[s]
+        if touching.size:
+            contacts.append(ids[free & np.isin(slot, touching)])
+    return np.concatenate(contacts) if contacts else np.empty(0, dtype=np.int32)
@@ -0,0 +1,137 @@
+"""Lets the Elder answer questions from the document corpus.
+
+Retrieval and generation run on an asyncio loop in a background thread, so
+the Panda3D frame loop never waits on them. The game asks a question with
+``ask()`` and drains ``poll()`` once per frame; tokens arrive as
+``(request_id, "token", text)`` events followed by ``"done"`` or ``"error"``.
+
+Answers to ``COMMON_QUESTIONS`` are generated in the background at start-up
+and served from memory, so the most likely questions are answered at once.
+"""
+import asyncio
+import itertools
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .rag.response_cache import normalize_question
+
+COMMON_QUESTIONS = (
+    "Why are tennis balls yellow?",
+    "Where does the word love come from in tennis?",
+    "What did people use before rackets?",
+    "Is it racket or racquet?",
+    "How far does a player run in a match?",
+)
+
+# Events handed to the frame loop per poll(); the rest wait for the next frame
+MAX_EVENTS_PER_POLL = 256
+
+
+def default_pipeline_factory(persist_dir: str = ".rag", ollama_url: str = "http://localhost:11434",
+                             model: str = "llama3.2"):
+    """Return a factory building the chat pipeline used by ``aiden.rag.server``."""
+
+    def factory():
+        from .rag.config import RagConfig
+        from .rag.llm import OllamaClient
+        from .rag.server import build_pipeline
+
+        return build_pipeline(RagConfig(persist_dir=persist_dir), OllamaClient(ollama_url, model))
+
+    return factory
+
+
+class ElderOracle:
+    def __init__(self, pipeline_factory: Callable, common_questions=COMMON_QUESTIONS):
+        # the factory runs on the worker thread: loading the store and the
+        # embedding model must not stall the game either
+        self._factory = pipeline_factory
+        self._events = queue.SimpleQueue()
+        self._ids = itertools.count(1)
+        self._futures: Dict[int, object] = {}
+        # normalised question -> answer, written by the worker, read by the game
+        self.precomputed: Dict[str, str] = {}
+        self.pipeline = None
+        self.loop = asyncio.new_event_loop()
+        self._ready = None
+        self._thread = threading.Thread(target=self._run, name="elder-oracle", daemon=True)
+        self._thread.start()
+        self._warmup = asyncio.run_coroutine_threadsafe(self._precompute(common_questions), self.loop)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _pipeline(self):
+        if self._ready is None:
+            self._ready = self.loop.create_task(asyncio.to_thread(self._factory))
+        if self.pipeline is None:
+            ready = self._ready
+            try:
+                # shielded: a cancelled question must not cancel the shared start-up
+                self.pipeline = await asyncio.shield(ready)
+            except Exception:
+                # a failed start-up is retried by the next question
+                if self._ready is ready:
+                    self._ready = None
+                raise
+        return self.pipeline
+
+    async def _precompute(self, questions):
+        for question in questions:
+            try:
+                pipeline = await self._pipeline()
+                answer = "".join([t async for t in pipeline.stream(question)])
+            except Exception:
+                # the model may be offline; live questions will report it
+                return
+            self.precomputed[normalize_question(question)] = answer
+
+    # --- game-thread API ---
+    def cached(self, question: str) -> Optional[str]:
+        return self.precomputed.get(normalize_question(question))
+
+    def ask(self, question: str) -> int:
+        """Start answering ``question``; returns the id its events carry."""
+        rid = next(self._ids)
+        self._futures[rid] = asyncio.run_coroutine_threadsafe(self._answer(rid, question), self.loop)
+        return rid
+
+    def cancel(self, rid: int):
+        fut = self._futures.pop(rid, None)
+        if fut is not None:
+            fut.cancel()
+
+    def poll(self, max_events: int = MAX_EVENTS_PER_POLL) -> List[Tuple[int, str, Optional[str]]]:
+        """Events produced since the last call; never blocks."""
+        events = []
+        try:
+            while len(events) < max_events:
+                event = self._events.get_nowait()
+                if event[1] != "token":
+                    self._futures.pop(event[0], None)
+                events.append(event)
+        except queue.Empty:
+            pass
+        return events
+
+    def close(self):
+        for rid in list(self._futures):
+            self.cancel(rid)
+        self._warmup.cancel()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=1.0)
+
+    # --- worker side ---
+    async def _answer(self, rid: int, question: str):
+        try:
+            pipeline = await self._pipeline()
+            async for token in pipeline.stream(question):
+                self._events.put((rid, "token", token))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._events.put((rid, "error", str(exc) or type(exc).__name__))
+            return
+        self._events.put((rid, "done", None))
@@ -1,36 +1,78 @@
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
     WindowProperties,
-    CollisionTraverser,
+    GraphicsWindow,
     CollisionNode,
     CollisionRay,
-    CollisionHandlerQueue,
-    BitMask32,
+    CollisionBox,
 )
 from panda3d.core import AmbientLight, DirectionalLight, Vec4, Vec3, ClockObject
 from direct.task import Task
+import math
 import random  # CHANGE: used for random zombie spawn timing/locations
-import time  # CHANGE: used for respawn timers and scheduling
+
+import numpy as np
 
 from .gui import HUD, Dialog
 from .actors import NPC, Item, Zombie
 from .quests import QuestLog, Quest
 from .scenes import load_environment
+from .ai_scheduler import AIScheduler
+from .horde import ShardedHorde
+from .collision import CollisionLayers, PICK, GROUND
+from .timers import TimerScheduler, Cooldown
+from .ecs import EntityStore, follow_slots, seek
+from .world import ChunkStreamer, WorldIndex
+from .governor import QualityLevel
 
 # ZOMBIE_RESPAWN_INTERVAL = 60.0 + random.uniform(0.0, 30.0)
 ZOMBIE_RESPAWN_INTERVAL = 20
+# Wall-clock milliseconds per frame available to zombie AI updates
+AI_BUDGET_MS = 2.0
+# Zombies closer than this (or on screen) are updated before the rest
+AI_NEAR_RADIUS = 15.0
+# Worker processes for the sharded zombie simulation (0 = main thread only)
+ZOMBIE_SHARD_WORKERS = 0
+HORDE_CAPACITY = 4096
+# Seconds to cross-fade zombie animations (0 = switch instantly)
+ZOMBIE_ANIM_BLEND = 0.0
+# Most zombies alive at once; no more spawn while the cap is reached
+ZOMBIE_CAP = 200
+# Zombies farther away than this hold their pose instead of animating
+ZOMBIE_ANIM_DISTANCE = float("inf")
+# Game seconds between telemetry tick events
+TELEMETRY_TICK = 1.0
+# Zombies spawn this far from the player, so they converge from outside view
+SPAWN_RING_MIN = 25.0
+SPAWN_RING_MAX = 45.0
 
 
 class AdventureGame(ShowBase):
-    def __init__(self):
+    def __init__(self, shard_workers: int = ZOMBIE_SHARD_WORKERS, elder_oracle=None, profiler=None,
+                 profile_out: str = "profile", world_dir=None, governor=None, telemetry=None):
         super().__init__()
         self.disableMouse()  # we implement our own camera
         self._setup_window()
         self._setup_lighting()
 
-        # World
-        self.world = load_environment(self.loader)
-        self.world.reparentTo(self.render)
+        # One collision root per layer; rays only traverse their own layer
+        self.collision = CollisionLayers(self.render)
+
+        # World: one monolithic environment, or chunks streamed around the player
+        self.world_streamer = None
+        if world_dir is not None:
+            self.world = self.render.attachNewNode("world")
+            self.world_streamer = ChunkStreamer(
+                WorldIndex.load(world_dir),
+                self.world,
+                lambda path: self._load_model_safe([path]),
+                collision=self.collision,
+                on_item_load=self._add_world_item,
+                on_item_unload=self._remove_world_item,
+            )
+        else:
+            self.world = load_environment(self.loader, self.collision)
+            self.world.reparentTo(self.render)
 
         # GUI
         self.hud = HUD()
@@ -44,23 +86,56 @@ class AdventureGame(ShowBase):
 
         # State
         self.inventory = []
+        # Component data of every actor; the actor objects are handles into it
+        self.entities = EntityStore()
         self.actors = {}
+        # Optional corpus-backed Elder (see elder.py); answers stream in via _poll_elder
+        self.elder_oracle = elder_oracle
+        self._elder_request = None
+        self._elder_waiting = False
+
+        # Game-time timers (spawns, respawn, cooldowns, despawns, quest limits);
+        # advanced once per frame, paused and scaled with the simulation
+        self.timers = TimerScheduler()
 
         # CHANGE: add zombie/spawn/death state
         self.zombies = []
-        now = time.time()
-        self.next_zombie_spawn_at = (
-            now + ZOMBIE_RESPAWN_INTERVAL
-        )  # no more frequent than 1 min
+        # entity id -> zombie, for contacts reported by the seek system or the horde
+        self._zombie_by_entity = {}
+        # zombies still playing their spawn clip; they do not move yet
+        self._spawning = set()
+        self.zombie_spawner = self.timers.call_every(
+            ZOMBIE_RESPAWN_INTERVAL, self._spawn_random_zombie, name="zombie-spawn"
+        )
         self.player_alive = True
-        self.respawn_deadline = None
+        self.respawn_timer = None
         self.respawn_delay = 5.0
         self.player_spawn_point = Vec3(0, -20, 0)
+        self.ai_scheduler = AIScheduler(budget_ms=AI_BUDGET_MS)
+        # Zombie cap, spawn rate, animation distance and AI budget; an optional
+        # LoadGovernor (see governor.py) trades them for frame time
+        self.quality = QualityLevel("default", ZOMBIE_CAP, ZOMBIE_RESPAWN_INTERVAL, ZOMBIE_ANIM_DISTANCE, AI_BUDGET_MS)
+        self.governor = governor
+        if governor is not None:
+            governor.on_change = self._apply_quality
+            self._apply_quality(governor.level)
+        # Optional Telemetry (see telemetry.py): gameplay events plus a
+        # once-a-second tick with frame and load stats
+        self.telemetry = telemetry
+        self._tick_frames = []  # frame times (ms) since the last tick
+        if telemetry is not None:
+            self.timers.call_every(TELEMETRY_TICK, self._emit_tick, name="telemetry-tick")
+        # Optional FrameSampler (see profiler.py): samples _update, then exits
+        self.profiler = profiler
+        self.profile_out = profile_out
+        # Optional multi-process horde; zombies then only mirror its transforms
+        self.horde = None
+        if shard_workers > 0:
+            self.horde = ShardedHorde(capacity=HORDE_CAPACITY, workers=shard_workers)
 
         # Player attack config
         self.attack_damage = 34  # damage per click
-        self.attack_cooldown = 0.35  # seconds
-        self._last_attack_time = 0.0
+        self.attack_cooldown = Cooldown(self.timers, 0.35)  # seconds
 
         # Quests
         self.quests = QuestLog()
@@ -85,11 +160,16 @@ class AdventureGame(ShowBase):
 
         # Grounding (terrain-aware via downward ray); init after player is created
         self._init_grounding()
+        if self.world_streamer is not None:
+            # load the chunks around the spawn point before the first frame
+            self.world_streamer.update(self.player_spawn_point.x, self.player_spawn_point.y, wait=True)
 
         self.taskMgr.add(self._update, "update")
 
     # --- setup helpers ---
     def _setup_window(self):
+        if not isinstance(self.win, GraphicsWindow):
+            return  # offscreen or headless (soak tests, benchmarks): nothing to title
         props = WindowProperties()
         props.setTitle("z")
         self.win.requestProperties(props)
@@ -112,38 +192,31 @@ class AdventureGame(ShowBase):
             self.accept(key, self._set_key, [key, True])
             self.accept(f"{key}-up", self._set_key, [key, False])
         self.accept("mouse1", self._on_click)
+        self.accept("p", self.toggle_pause)
 
     def _set_key(self, key, value):
+        # typing a question to the Elder must not walk the player around
+        if value and self.dialog.is_typing:
+            return
         self.keys[key] = value
 
     def _init_picking(self):
-        self.picker = CollisionTraverser()
-        self.pq = CollisionHandlerQueue()
         self.picker_node = CollisionNode("mouseRay")
         self.picker_np = self.camera.attachNewNode(self.picker_node)
-        # Ray should only be a FROM object on mask bit 1 and never be hittable
-        self.picker_node.setFromCollideMask(BitMask32.bit(1))
-        self.picker_node.setIntoCollideMask(BitMask32.allOff())
         self.picker_ray = CollisionRay()
         self.picker_node.addSolid(self.picker_ray)
-        self.picker.addCollider(self.picker_np, self.pq)
-
-        # Set this mask to actor collision nodes we care about
-        self.actor_mask = BitMask32.bit(1)
+        # Ray is only a FROM object on the pick layer (mask bit 1), never hittable
+        self.pq = self.collision.add_collider(PICK, self.picker_np)
 
     def _init_grounding(self):
         """Set up a downward ray to find ground height (mask bit 2)."""
-        self.ground_trav = CollisionTraverser()
-        self.ground_queue = CollisionHandlerQueue()
         self.ground_node = CollisionNode("groundRay")
-        # Grounding ray casts against ground (bit 2) and must not be hittable
-        self.ground_node.setFromCollideMask(BitMask32.bit(2))
-        self.ground_node.setIntoCollideMask(BitMask32.allOff())
         # Attach to player so origin follows player; cast from above head downwards
         self.ground_np = self.player.attachNewNode(self.ground_node)
         self.ground_ray = CollisionRay(0, 0, 10.0, 0, 0, -1)
         self.ground_node.addSolid(self.ground_ray)
-        self.ground_trav.addCollider(self.ground_np, self.ground_queue)
+        # Grounding ray casts against the ground layer only and is not hittable
+        self.ground_queue = self.collision.add_collider(GROUND, self.ground_np)
 
     def _init_content(self):
         # Spawn NPC elder at center
@@ -157,14 +230,22 @@ class AdventureGame(ShowBase):
         # elder.reparent_to(self.render).set_pos(0, 10, 0)
         # elder.node.setCollideMask(self.actor_mask)
         # self.actors['elder'] = elder
+        if self.elder_oracle is not None:
+            elder_model = self._load_model_safe(["models/misc/smiley", "models/misc/sphere"])
+            elder_model.setScale(1.4)
+            elder = NPC(elder_model, name="Elder", collision=self.collision, store=self.entities)
+            elder.reparent_to(self.render).set_pos(0, 10, 0)
+            self.actors["elder"] = elder
 
         # CHANGE: remove the always-on starting zombie; zombies now spawn at random
         # intervals via the runtime update (see _maybe_spawn_zombie). Keeping the
         # pre-placed zombie would violate the "at random" intent and complicate
         # the cooldown rule, so we rely on the spawner exclusively.
 
-        # Place three shard items around the map
+        # Place three shard items around the map (streamed worlds bring their own)
         positions = [(-8, 25, 0.2), (10, 35, 0.2), (6, 18, 0.2)]
+        if self.world_streamer is not None:
+            positions = []
         for i, pos in enumerate(positions, 1):
             shard_model = self._load_model_safe(
                 ["models/misc/rgbCube", "models/misc/sphere"]
@@ -175,9 +256,10 @@ class AdventureGame(ShowBase):
                 shard_model,
                 name=f"Shard {i}",
                 description="A glowing fragment of the grove",
+                collision=self.collision,
+                store=self.entities,
             )
             item.reparent_to(self.render).set_pos(*pos)
-            item.node.setCollideMask(self.actor_mask)
             self.actors[f"shard{i}"] = item
 
         # Gate as a target
@@ -189,6 +271,7 @@ class AdventureGame(ShowBase):
         gate_model.setColorScale(0.4, 0.4, 0.9, 1)
         gate_model.reparentTo(self.render)
         gate_model.setTag("gate", "1")
+        self._add_gate_solid(gate_model)
 
         # Quests
         self.quests.add(Quest("meet_elder", "Speak to the Elder at the clearing."))
@@ -198,18 +281,143 @@ class AdventureGame(ShowBase):
         self.quests.add(
             Quest("restore_gate", "Return to the gate to restore the path.")
         )
+        for quest in self.quests.quests:
+            if quest.time_limit is not None:
+                self.timers.call_later(quest.time_limit, self._quest_timed_out, quest, name=f"quest-{quest.name}")
+
+    def _add_world_item(self, spec, model):
+        """Turn an item from a streamed chunk into a collectible Item."""
+        item = Item(model, name=spec.get("name", spec.get("id", "item")),
+                    description=spec.get("description", ""), collision=self.collision, store=self.entities)
+        item.reparent_to(self.world)
+        item.set_pos(model.getPos(self.world))
+        self.actors[spec.get("id", item.name)] = item
+        return item
+
+    def _remove_world_item(self, item):
+        self.collision.remove(item.node)
+        item.node.removeNode()
+        item.destroy()
+        self.actors = {k: v for k, v in self.actors.items() if v is not item}
+
+    def _add_gate_solid(self, gate_model):
+        """Make the gate clickable with a box around its model."""
+        try:
+            lo, hi = gate_model.getTightBounds(gate_model)
+            box = CollisionBox(lo, hi)
+        except Exception:
+            return
+        self.collision.add_solid(PICK, box, owner=gate_model, node_name="gate", moving=False)
 
     # --- runtime ---
     def _update(self, task: Task):
-        dt = ClockObject.getGlobalClock().getDt()
+        if self.profiler is None:
+            return self._step(task)
+        with self.profiler.frame():
+            result = self._step(task)
+        if self.profiler.done:
+            self._finish_profile()
+            return Task.done
+        return result
+
+    def _finish_profile(self):
+        self.profiler.stop()
+        collapsed, table = self.profiler.write(self.profile_out)
+        print(f"profile written to {collapsed} and {table}")
+        print(self.profiler.report(limit=15))
+        self.userExit()
+
+    def _step(self, task: Task):
+        frame_dt = ClockObject.getGlobalClock().getDt()
+        if self.governor is not None:
+            # may step quality up or down (see _apply_quality)
+            self.governor.record(frame_dt * 1000.0)
+        if self.telemetry is not None and not self.timers.paused:
+            # paused frames would skew the next tick's percentiles; no tick fires meanwhile
+            self._tick_frames.append(frame_dt * 1000.0)
+        # due timers fire here; dt is game time (0 while paused)
+        dt = self.timers.advance(frame_dt)
         self._update_camera(dt)
-        # CHANGE: update zombie system and handle spawn/death/respawn
-        for _ in range(random.randrange(1, 5)):
-            self._maybe_spawn_zombie()
+        self.ai_scheduler.begin_frame()
+        self._poll_elder()
+        if self.world_streamer is not None:
+            pos = self.player.getPos(self.render)
+            self.world_streamer.update(pos.x, pos.y)
+        # CHANGE: update zombie system; spawns and respawns run off self.timers
+        substeps = random.randrange(1, 5)
+        if self.horde is not None:
+            # one round trip to the shard workers per frame covers every substep
+            self._step_horde(dt * substeps)
+        for _ in range(substeps):
             self._update_zombies(dt)
-            self._update_respawn()
         return Task.cont
 
+    def _emit(self, kind: str, **fields):
+        """Queue a telemetry event stamped with game time (no-op without telemetry)."""
+        if self.telemetry is not None:
+            self.telemetry.emit(kind, gt=round(self.timers.now, 3), **fields)
+
+    def _emit_tick(self):
+        frames, self._tick_frames = self._tick_frames, []
+        p50, p95, worst = np.percentile(frames, [50, 95, 100]) if frames else (0.0, 0.0, 0.0)
+        self._emit(
+            "tick",
+            frames=len(frames),
+            frame_p50_ms=round(float(p50), 2),
+            frame_p95_ms=round(float(p95), 2),
+            frame_max_ms=round(float(worst), 2),
+            zombies=len(self.zombies),
+            entities=len(self.entities),
+            quality=self.quality.name,
+            ai_updated=self.ai_scheduler.last_updated,
+            ai_deferred=self.ai_scheduler.last_deferred,
+        )
+
+    def _apply_quality(self, level: QualityLevel):
+        """Switch zombie cap, spawn interval, animation distance and AI budget.
+
+        Lowering the cap despawns the zombies farthest from the player.
+        """
+        old = self.quality
+        self.quality = level
+        self._emit("quality", level=level.name, previous=old.name)
+        self.ai_scheduler.budget_ms = level.ai_budget_ms
+        if level.zombie_cap < old.zombie_cap:
+            self._cull_zombies(level.zombie_cap)
+        if level.spawn_interval != old.spawn_interval and self.zombie_spawner.active:
+            # keep the time already waited, capped by the new interval
+            remaining = min(self.zombie_spawner.due - self.timers.now, level.spawn_interval)
+            self.zombie_spawner.cancel()
+            self.zombie_spawner = self.timers.call_every(
+                level.spawn_interval, self._spawn_random_zombie, name="zombie-spawn", first=remaining
+            )
+
+    def _cull_zombies(self, cap: int):
+        """Despawn the living zombies farthest from the player beyond ``cap``.
+
+        Dying zombies are not counted; their cleanup timers remove them anyway.
+        """
+        living = [z for z in self.zombies if getattr(z, "alive", True)]
+        if len(living) <= cap:
+            return
+        p = self.player.getPos(self.render)
+
+        def dist2(z):
+            x, y, _ = z.position
+            return (x - p.x) ** 2 + (y - p.y) ** 2
+
+        living.sort(key=dist2)
+        culled = living[cap:]
+        for z in culled:
+            self._despawn_zombie(z, announce=False)
+        self._emit("cull", zombies=len(culled), cap=cap)
+
+    def toggle_pause(self):
+        if self.dialog.is_typing:
+            return
+        self.timers.paused = not self.timers.paused
+        self.hud.show_info("Paused" if self.timers.paused else "")
+
     def _update_camera(self, dt: float):
         speed = 18.0 * (1.6 if self.keys.get("shift") else 1.0)
         mov = Vec3(0, 0, 0)
@@ -228,7 +436,7 @@ class AdventureGame(ShowBase):
         self.player.setPos(self.player, mov)
 
         # Terrain-aware height: cast downward each frame to find ground height
-        self.ground_trav.traverse(self.render)
+        self.collision.traverse(GROUND)
         if self.ground_queue.getNumEntries() > 0:
             self.ground_queue.sortEntries()
             ground_entry = self.ground_queue.getEntry(0)
@@ -239,7 +447,7 @@ class AdventureGame(ShowBase):
             self.player.setZ(0.0)
 
         # Mouse look: hold right mouse to rotate (yaw on player, pitch on camera)
-        if self.mouseWatcherNode.hasMouse() and self.win.getPointer(0):
+        if self.mouseWatcherNode is not None and self.mouseWatcherNode.hasMouse() and self.win.getPointer(0):
             if self.mouseWatcherNode.is_button_down("mouse3"):
                 md = self.win.getPointer(0)
                 cx = self.win.getXSize() // 2
@@ -270,118 +478,193 @@ class AdventureGame(ShowBase):
             ["models/misc/smiley", "models/misc/sphere"]
         )  # fallback if Actor fails
         model.setScale(1.2)
-        z = Zombie(model, name=f"Zombie{len(self.zombies)+1}")
+        # animation blends and the spawn clip run on game time, so pausing holds them
+        z = Zombie(model, name=f"Zombie{len(self.zombies)+1}", collision=self.collision,
+                   anim_clock=lambda: self.timers.now, blend_time=ZOMBIE_ANIM_BLEND, store=self.entities)
         z.reparent_to(self.render).set_pos(pos)
-        z.node.setCollideMask(self.actor_mask)
+        z.play_spawn()
+        if self.horde is not None:
+            # held in place (speed 0) until the spawn clip finishes
+            z.horde_slot = self.horde.spawn(pos.x, pos.y, 0.0)
+            self.entities.add(z.entity, "horde", {"slot": z.horde_slot})
         self.zombies.append(z)
+        self._zombie_by_entity[z.entity] = z
+        self._spawning.add(z)
+        self.ai_scheduler.track(z)
+        self._emit("spawn", zombie=z.name, x=round(pos.x, 2), y=round(pos.y, 2))
 
     def _random_spawn_position(self) -> Vec3:
         """CHANGE: choose a random position in a ring around the player so they
-        converge from outside the immediate view. Use simple trig to rotate."""
-        r = random.uniform(25.0, 45.0)
+        converge from outside the immediate view. Use simple trig to rotate.
+
+        In a streamed world zombies rise from a spawn zone of a loaded chunk
+        that lies outside the ring's inner radius; without one they fall back
+        to the ring.
+        """
+        base_pos = self.player.getPos(self.render)
+        zones = []
+        if self.world_streamer is not None:
+            zones = self.world_streamer.spawn_zones(base_pos.x, base_pos.y, SPAWN_RING_MIN)
+        if zones:
+            zone = random.choice(zones)
+            (zx, zy), zr = zone["pos"], zone.get("radius", 0.0)
+            return Vec3(zx + random.uniform(-zr, zr), zy + random.uniform(-zr, zr), 0.0)
+        r = random.uniform(SPAWN_RING_MIN, SPAWN_RING_MAX)
         ang_deg = random.uniform(0.0, 360.0)
-        import math
 
         ang = math.radians(ang_deg)
         dx = r * math.cos(ang)
         dy = r * math.sin(ang)
-        base_pos = self.player.getPos(self.render)
         return Vec3(base_pos.x + dx, base_pos.y + dy, 0.0)
 
-    def _maybe_spawn_zombie(self):
-        """CHANGE: spawn at random intervals but never more frequent than once per minute."""
-        now = time.time()
-        if now >= self.next_zombie_spawn_at:
-            self._spawn_zombie_at(self._random_spawn_position())
-            # schedule next: at least 60s plus a random offset
-            self.next_zombie_spawn_at = now + ZOMBIE_RESPAWN_INTERVAL
+    def _spawn_random_zombie(self):
+        """CHANGE: called by the zombie-spawn timer every quality.spawn_interval."""
+        if len(self.zombies) >= self.quality.zombie_cap:
+            return
+        self._spawn_zombie_at(self._random_spawn_position())
 
     def _update_zombies(self, dt: float):
-        """CHANGE: make all zombies converge on the player and handle contact kill."""
+        """Move zombies, handle contact kills and sync them within the AI budget.
+
+        Movement and contact are not budgeted: they run for every zombie every
+        step, as the ``seek`` system over the entity store's arrays or, with a
+        horde, on the shard workers once per frame (see _step_horde). Their
+        cost grows with the horde, but per array, not per Python object.
+
+        The AI budget bounds only the per-zombie part, copying the transform
+        onto the node and switching animation, which runs through the AI
+        scheduler: zombies near the player or on screen first, the rest
+        round-robin. That part needs no time step of its own (a deferred
+        zombie jumps to where the arrays already moved it), so the scheduler's
+        per-zombie dt is unused. Which zombies count as near or on screen is
+        re-checked for a few zombies per step (see AIScheduler.classify_per_step).
+        """
         if not self.zombies:
             return
         player_pos = self.player.getPos(self.render)
-        for z in self.zombies:
-            # Skip dead or already detached zombies
-            try:
-                if not getattr(z, "alive", True):
-                    z.set_walking(False)
-                    continue
-                if z.node.isEmpty():
-                    continue
-            except Exception:
-                continue
-            if not self.player_alive:
-                z.set_walking(False)
-                continue
-            zpos = z.node.getPos(self.render)
-            to_player = player_pos - zpos
-            to_player.z = 0.0
-            dist = to_player.length()
-            if dist > 0.01:
-                dir_vec = to_player / dist
-                move = dir_vec * z.speed * dt
-                z.node.setPos(self.render, zpos + move)
-                # face the player
-                try:
-                    z.node.lookAt(self.player)
-                except Exception:
-                    pass
-                z.set_walking(True)
-            else:
-                z.set_walking(False)
-
-            # contact check (simple radius overlap)
-            if self.player_alive and getattr(z, "alive", True) and dist < 1.0:
+        self._release_spawned()
+        # with a horde the shard workers moved everyone (see _step_horde)
+        if self.horde is None and self.player_alive:
+            held = [z.entity for z in self._spawning]
+            contacts = seek(self.entities, player_pos.x, player_pos.y, dt, reach=1.0, held=held)
+            for eid in contacts.tolist():
+                z = self._zombie_by_entity.get(eid)
+                if z is not None:
+                    z.attack()
+            if len(contacts):
                 self._on_player_killed()
+        self.ai_scheduler.step(
+            self.zombies,
+            dt,
+            # movement already happened above, so the accumulated zdt is not needed
+            lambda z, zdt: self._update_zombie(z, player_pos),
+            priority=lambda z: self._zombie_is_priority(z, player_pos),
+        )
 
-        # Compact zombie list to keep only live, attached ones
+    def _release_spawned(self):
+        """Let zombies whose spawn clip has finished start moving."""
+        for z in [z for z in self._spawning if not z.is_spawning]:
+            self._spawning.discard(z)
+            if self.horde is not None and getattr(z, "horde_slot", None) is not None:
+                self.horde.set_speed(z.horde_slot, z.speed)
+
+    def _step_horde(self, dt: float):
+        """Advance zombies on the shard workers and copy their transforms
+        into the entity store in bulk; nodes follow via ``_update_zombie``."""
+        if not self.zombies or not self.player_alive:
+            return
+        self._release_spawned()
+        player_pos = self.player.getPos(self.render)
+        contacts = self.horde.step(dt, player_pos.x, player_pos.y)
+        pos, heading = self.horde.transforms()
+        # zombies still rising from the ground neither move nor catch the player
+        held = [z.entity for z in self._spawning]
+        touching = follow_slots(self.entities, pos, heading, touching=contacts, held=held)
+        for eid in touching.tolist():
+            z = self._zombie_by_entity.get(eid)
+            if z is not None:
+                z.attack()
+        if len(touching):
+            self._on_player_killed()
+
+    def _leave_horde(self, z):
+        """Free the zombie's horde slot, once, and stop following it."""
+        if self.horde is not None and self.entities.has(z.entity, "horde"):
+            self.horde.kill(z.horde_slot)
+            self.entities.remove(z.entity, "horde")
+
+    def _zombie_is_priority(self, z, player_pos) -> bool:
+        """True when the zombie is close to the player or inside the view."""
         try:
-            self.zombies = [
-                z
-                for z in self.zombies
-                if getattr(z, "alive", True) and not z.node.isEmpty()
-            ]
+            if z.node.isEmpty():
+                return False
+            offset = z.node.getPos(self.render) - player_pos
+            if offset.lengthSquared() <= AI_NEAR_RADIUS * AI_NEAR_RADIUS:
+                return True
+            return self.camNode.isInView(z.node.getPos(self.camera))
         except Exception:
-            pass
+            return False
+
+    def _update_zombie(self, z, player_pos):
+        """Show one zombie where the seek system or the horde moved it and animate it."""
+        # Skip dead or already detached zombies
+        try:
+            if z.node.isEmpty():
+                return
+            if not z.alive:
+                z.set_walking(False)
+                return
+        except Exception:
+            return
+        if z in self._spawning:
+            return
+        x, y, _ = z.sync_node()
+        if not self.player_alive:
+            z.set_walking(False)
+            return
+        dist = math.hypot(player_pos.x - x, player_pos.y - y)
+        z.set_animated(dist <= self.quality.anim_distance)
+        z.set_walking(dist > 0.01)
 
     def _on_player_killed(self):
         """CHANGE: handle player death and schedule a 5-second respawn."""
         if not self.player_alive:
             return
         self.player_alive = False
-        self.respawn_deadline = time.time() + self.respawn_delay
+        self.respawn_timer = self.timers.call_later(self.respawn_delay, self._respawn_player, name="respawn")
+        pos = self.player.getPos(self.render)
+        self._emit("player_death", x=round(pos.x, 2), y=round(pos.y, 2), zombies=len(self.zombies))
         self.hud.show_info("You were caught by a zombie! Respawning in 5 seconds...")
 
-    def _update_respawn(self):
+    def _respawn_player(self):
         """CHANGE: respawn the player after the delay."""
-        if self.player_alive or self.respawn_deadline is None:
-            return
-        if time.time() >= self.respawn_deadline:
-            # reset player state and position
-            self.player.setPos(self.player_spawn_point)
-            self.player.setHpr(0, 0, 0)
-            self.yaw = 0.0
-            self.pitch = 0.0
-            # ensure grounded height will update next frame
-            self.player_alive = True
-            self.respawn_deadline = None
-            self.hud.show_info("You have respawned. Run!")
+        # reset player state and position
+        self.player.setPos(self.player_spawn_point)
+        self.player.setHpr(0, 0, 0)
+        self.yaw = 0.0
+        self.pitch = 0.0
+        # ensure grounded height will update next frame
+        self.player_alive = True
+        self.respawn_timer = None
+        self._emit("respawn")
+        self.hud.show_info("You have respawned. Run!")
 
     def _on_click(self):
-        if not self.mouseWatcherNode.hasMouse():
+        if self.mouseWatcherNode is None or not self.mouseWatcherNode.hasMouse():
             return
         mpos = self.mouseWatcherNode.getMouse()
         self.picker_ray.setFromLens(self.camNode, mpos.getX(), mpos.getY())
-        self.picker.traverse(self.render)
+        self.collision.traverse(PICK)
         if self.pq.getNumEntries() == 0:
             return
         self.pq.sortEntries()
         entry = self.pq.getEntry(0)
-        np = entry.getIntoNodePath().findNetTag("actor")
+        # hits are on the pick layer; map back to the scene node they stand for
+        hit = self.collision.owner_of(entry.getIntoNodePath())
+        np = hit.findNetTag("actor")
         if np.isEmpty():
             # try collectible tag
-            np = entry.getIntoNodePath()
+            np = hit
         self._handle_pick(np)
 
     def _handle_pick(self, np):
@@ -431,16 +714,15 @@ class AdventureGame(ShowBase):
         return None
 
     def _attack_zombie(self, z):
-        now = time.time()
-        if (now - self._last_attack_time) < self.attack_cooldown:
+        if not self.attack_cooldown.trigger():
             return
-        self._last_attack_time = now
         if not z or not getattr(z, "alive", True):
             return
         try:
             remaining = z.take_damage(self.attack_damage)
         except Exception:
             return
+        self._emit("hit", zombie=getattr(z, "name", "Zombie"), damage=self.attack_damage, hp=remaining)
         try:
             self.hud.show_info(
                 f"Hit {getattr(z, 'name', 'Zombie')}! HP: {remaining}/{getattr(z, 'max_health', remaining)}"
@@ -448,42 +730,62 @@ class AdventureGame(ShowBase):
         except Exception:
             pass
         if not getattr(z, "alive", True):
-            # Stop moving immediately
-            try:
-                z.set_walking(False)
-            except Exception:
-                pass
+            self._on_zombie_killed(z)
 
-            # Cleanup after short delay to allow die animation
-            def _cleanup(task):
-                try:
-                    z.node.detachNode()
-                except Exception:
-                    pass
-                try:
-                    if z in self.zombies:
-                        self.zombies.remove(z)
-                except Exception:
-                    pass
-                try:
-                    self.hud.show_info(f"{getattr(z, 'name', 'Zombie')} defeated!")
-                except Exception:
-                    pass
-                return Task.done
+    def _on_zombie_killed(self, z):
+        self._emit("kill", zombie=getattr(z, "name", "Zombie"))
+        # Stop moving immediately
+        try:
+            z.set_walking(False)
+        except Exception:
+            pass
+        self._leave_horde(z)
+        # Cleanup after short delay to allow die animation; a bound method
+        # rather than a closure, so the timer holds nothing else alive
+        self.timers.call_later(0.6, self._despawn_zombie, z, name=f"cleanup-{getattr(z, 'name', 'zombie')}")
+
+    def _despawn_zombie(self, z, announce: bool = True):
+        """Release everything a zombie owns (see leaks.py for the checks)."""
+        self._zombie_by_entity.pop(z.entity, None)
+        self._leave_horde(z)
+        try:
+            self.collision.remove(z.node)
+            z.cleanup()
+        except Exception:
+            pass
+        self.ai_scheduler.forget(z)
+        self._spawning.discard(z)
+        try:
+            if z in self.zombies:
+                self.zombies.remove(z)
+        except Exception:
+            pass
+        if not announce:
+            return
+        try:
+            self.hud.show_info(f"{getattr(z, 'name', 'Zombie')} defeated!")
+        except Exception:
+            pass
 
-            try:
-                self.taskMgr.doMethodLater(
-                    0.6, _cleanup, f"cleanup-{getattr(z, 'name', 'zombie')}"
-                )
-            except Exception:
-                _cleanup(None)
+    def _quest_timed_out(self, quest):
+        if quest.is_complete:
+            return
+        try:
+            quest.on_timeout()
+        except Exception:
+            pass
+        self._emit("quest_timeout", quest=quest.name)
+        self.hud.show_info(f"Out of time: {quest.description}")
 
     # --- interactions ---
     def _talk_elder(self):
         if not any(
             q.name == "meet_elder" and not q.is_complete for q in self.quests.quests
         ):
-            self.dialog.say("May the grove guide you.")
+            if self.elder_oracle is not None:
+                self._prompt_elder_question()
+            else:
+                self.dialog.say("May the grove guide you.")
             return
 
         lines = [
@@ -501,11 +803,66 @@ class AdventureGame(ShowBase):
             else:
                 # complete quest 1
                 self.quests.quests[0].is_complete = True
+                self._emit("quest_completed", quest=self.quests.quests[0].name)
                 self.hud.set_objective(self.quests.objective_text())
                 self.hud.show_info("Quest updated: Collect the three shards.")
+                if self.elder_oracle is not None:
+                    self._prompt_elder_question()
 
         next_line()
 
+    def _prompt_elder_question(self):
+        self.dialog.ask(
+            "Ask the Elder a question (Enter to ask):",
+            self._ask_elder,
+            on_continue=self._cancel_elder,
+        )
+
+    def _ask_elder(self, question: str):
+        """Answer from memory if precomputed, else stream from the oracle."""
+        if not question:
+            self.dialog.say("May the grove guide you.")
+            return
+        self._cancel_elder()
+        answer = self.elder_oracle.cached(question)
+        if answer is not None:
+            self.dialog.say(answer, on_continue=self._prompt_elder_question)
+            return
+        self._elder_request = self.elder_oracle.ask(question)
+        self._elder_waiting = True
+        self.dialog.say("The Elder ponders your question...", on_continue=self._cancel_elder)
+
+    def _cancel_elder(self):
+        self._elder_waiting = False
+        if self._elder_request is not None:
+            self.elder_oracle.cancel(self._elder_request)
+            self._elder_request = None
+
+    def _poll_elder(self):
+        """Show streamed Elder tokens; called every frame, never blocks."""
+        if self.elder_oracle is None:
+            return
+        tokens, finished, error = [], False, None
+        for rid, kind, data in self.elder_oracle.poll():
+            if rid != self._elder_request:
+                continue  # answer to a question the player walked away from
+            if kind == "token":
+                tokens.append(data)
+            else:
+                finished = True
+                error = data if kind == "error" else None
+        if error:
+            tokens.append(f" (The Elder falls silent: {error})")
+        if tokens:
+            if self._elder_waiting:
+                self._elder_waiting = False
+                self.dialog.say("", on_continue=self._cancel_elder)
+            # one text update per frame however many tokens arrived
+            self.dialog.append("".join(tokens))
+        if finished:
+            self._elder_request = None
+            self.dialog.set_continue(self._prompt_elder_question)
+
     def _collect_item(self, np):
         # Find which shard
         name = np.getNetTag("actor") or np.getName()
@@ -513,19 +870,31 @@ class AdventureGame(ShowBase):
         base = np.findNetTag("actor")
         if base.isEmpty():
             base = np
+        self.collision.remove(base)
         base.detachNode()
+        for key, actor in list(self.actors.items()):
+            if actor.node == base:
+                actor.destroy()
+                del self.actors[key]
+        if self.world_streamer is not None and base.getTag("item_id"):
+            self.world_streamer.collected.add(base.getTag("item_id"))
         # Update inventory
         self.inventory.append(name)
+        self._emit("item_collected", item=name, inventory=len(self.inventory))
         self.hud.show_info(f"Collected {name}")
 
         # If we were on collect quest and we got 3, complete it
         if len([n for n in self.inventory if "Shard" in n]) >= 3:
+            if not self.quests.quests[1].is_complete:
+                self._emit("quest_completed", quest=self.quests.quests[1].name)
             self.quests.quests[1].is_complete = True
             self.hud.set_objective(self.quests.objective_text())
             self.hud.show_info("You have all shards. Return to the gate.")
 
     def _try_restore_gate(self):
         if self.quests.quests[1].is_complete:
+            if not self.quests.quests[2].is_complete:
+                self._emit("quest_completed", quest=self.quests.quests[2].name)
             self.quests.quests[2].is_complete = True
             self.dialog.say(
                 "The gate hums as the shards fuse. The path is restored! You win."
@@ -0,0 +1,103 @@
+"""Frame-time driven quality governor.
+
+``LoadGovernor.record(frame_ms)`` keeps a rolling window of frame times and
+compares a high percentile of it with the frame budget. When the percentile
+stays over budget the governor steps down one ``QualityLevel`` (fewer live
+zombies, slower spawns, animation only close up, a smaller AI budget); when
+it falls well under budget it steps back up.
+
+Two things keep it from oscillating: a dead band between ``upgrade_below``
+and ``downgrade_above`` (fractions of the budget) in which nothing changes,
+and a hold after each change until the window has refilled with frames
+measured at the new level. ``downgrade_above`` sits well over 1.0 because
+with vsync on, frames at the target rate jitter around the budget itself.
+With vsync on, frame times never drop much below the refresh interval, so
+a lowered level only comes back when frames are fast again; target a rate
+the host reaches with vsync off, or one well below the refresh rate.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    zombie_cap: int
+    spawn_interval: float  # seconds of game time between spawns
+    anim_distance: float  # zombies farther away than this stop animating
+    ai_budget_ms: float
+
+
+LEVELS = (
+    QualityLevel("high", zombie_cap=200, spawn_interval=20.0, anim_distance=float("inf"), ai_budget_ms=2.0),
+    QualityLevel("medium", zombie_cap=120, spawn_interval=30.0, anim_distance=60.0, ai_budget_ms=1.5),
+    QualityLevel("low", zombie_cap=60, spawn_interval=45.0, anim_distance=35.0, ai_budget_ms=1.0),
+    QualityLevel("minimal", zombie_cap=30, spawn_interval=60.0, anim_distance=20.0, ai_budget_ms=0.5),
+)
+TARGET_FPS = 60.0
+WINDOW = 120  # frames (two seconds at 60 fps)
+PERCENTILE = 95.0
+DOWNGRADE_ABOVE = 1.15
+UPGRADE_BELOW = 0.7
+
+
+class LoadGovernor:
+    def __init__(
+        self,
+        target_fps: float = TARGET_FPS,
+        levels=LEVELS,
+        window: int = WINDOW,
+        percentile: float = PERCENTILE,
+        downgrade_above: float = DOWNGRADE_ABOVE,
+        upgrade_below: float = UPGRADE_BELOW,
+        on_change: Optional[Callable[[QualityLevel], None]] = None,
+    ):
+        if upgrade_below >= downgrade_above:
+            raise ValueError("upgrade_below must be smaller than downgrade_above")
+        self.budget_ms = 1000.0 / target_fps
+        self.levels = tuple(levels)
+        self.window = window
+        self.percentile = percentile
+        self.downgrade_above = downgrade_above
+        self.upgrade_below = upgrade_below
+        self.on_change = on_change
+        self.index = 0
+        self._frames = deque(maxlen=window)
+        self.last_percentile = None
+        self.changes = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    def record(self, frame_ms: float) -> Optional[QualityLevel]:
+        """Add one frame time; returns the new level when it changed."""
+        self._frames.append(frame_ms)
+        if len(self._frames) < self.window:
+            return None  # holding: not enough frames at the current level yet
+        p = float(np.percentile(self._frames, self.percentile))
+        self.last_percentile = p
+        if p > self.budget_ms * self.downgrade_above and self.index < len(self.levels) - 1:
+            return self._set(self.index + 1)
+        if p < self.budget_ms * self.upgrade_below and self.index > 0:
+            return self._set(self.index - 1)
+        return None
+
+    def _set(self, index: int) -> QualityLevel:
+        self.index = index
+        self.changes += 1
+        self._frames.clear()
+        if self.on_change is not None:
+            self.on_change(self.level)
+        return self.level
+
+    def stats(self):
+        return {
+            "level": self.level.name,
+            "budget_ms": self.budget_ms,
+            "p_frame_ms": self.last_percentile,
+            "changes": self.changes,
+        }
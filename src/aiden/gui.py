@@ -1,4 +1,4 @@
-from direct.gui.DirectGui import OnscreenText, DirectFrame, DirectButton
+from direct.gui.DirectGui import OnscreenText, DirectFrame, DirectButton, DirectEntry
 from panda3d.core import TextNode
 
 
@@ -43,17 +43,55 @@ class Dialog:
         self.root = DirectFrame(frameColor=(0, 0, 0, 0.6), frameSize=(-1.2, 1.2, -0.3, 0.3), pos=(0, 0, -0.6))
         self.root.hide()
         self.text = OnscreenText(text="", parent=self.root, pos=(-1.1, 0.15), scale=0.06, align=TextNode.ALeft,
-                                 fg=(1, 1, 1, 1), shadow=(0, 0, 0, 1), mayChange=True)
+                                 fg=(1, 1, 1, 1), shadow=(0, 0, 0, 1), mayChange=True, wordwrap=36)
         self.btn = DirectButton(parent=self.root, text="Continue", scale=0.06, pos=(1.0, 0, -0.2),
                                 command=self._on_continue)
+        self.entry = DirectEntry(parent=self.root, scale=0.05, pos=(-1.1, 0, -0.05), width=38,
+                                 command=self._on_submit, initialText="", numLines=1)
+        self.entry.hide()
         self._callback = None
+        self._on_answer = None
+        self._shown = ""
+
+    @property
+    def is_typing(self) -> bool:
+        return self._on_answer is not None
 
     def say(self, text: str, on_continue=None):
         self._callback = on_continue
+        self._shown = text
         self.text.setText(text)
         self.root.show()
 
+    def set_continue(self, on_continue):
+        self._callback = on_continue
+
+    def append(self, text: str):
+        """Extend the current text, e.g. with tokens streamed from a model."""
+        self._shown += text
+        self.text.setText(self._shown)
+
+    def ask(self, prompt: str, on_submit, on_continue=None):
+        """Show ``prompt`` with a text field; ``on_submit`` gets the typed text."""
+        self.say(prompt, on_continue)
+        self._on_answer = on_submit
+        self.entry.enterText("")
+        self.entry.show()
+        self.entry["focus"] = 1
+
+    def _on_submit(self, text):
+        cb = self._on_answer
+        self._on_answer = None
+        self.entry["focus"] = 0
+        self.entry.hide()
+        if cb:
+            cb(text.strip())
+
     def _on_continue(self):
+        if self._on_answer is not None:
+            self._on_answer = None
+            self.entry["focus"] = 0
+            self.entry.hide()
         self.root.hide()
         cb = self._callback
         self._callback = None
@@ -0,0 +1,208 @@
+"""Optional multi-core zombie simulation over shared memory.
+
+The horde state (positions, headings, speeds, liveness and shard ownership)
+lives in one ``multiprocessing.shared_memory`` block viewed as NumPy arrays.
+The world is split into vertical strips along X, one per worker process. Each
+tick every worker advances the zombies its strip owns and writes the new owner
+of each of them into the *next* ownership buffer, so zombies that cross a
+strip boundary are handed off without two workers ever touching the same slot
+in the same tick. The main process only reads back final transforms.
+
+Use ``workers=0`` to run the same kernel in-process, shard after shard.
+"""
+import multiprocessing as mp
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Ticks between re-partitioning the strips so they follow the horde
+REBALANCE_EVERY = 30
+
+_FIELDS = (
+    # name, dtype, per-slot shape
+    ("pos", np.float64, (2,)),
+    ("heading", np.float32, ()),
+    ("speed", np.float32, ()),
+    ("alive", np.bool_, ()),
+    ("contact", np.bool_, ()),
+    ("owner", np.int16, None),  # (2, capacity): double-buffered ownership
+)
+
+
+def _aligned(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class HordeState:
+    """NumPy views over a shared-memory block holding the horde arrays."""
+
+    def __init__(self, buf, capacity: int, shards: int):
+        self.capacity = capacity
+        self.shards = shards
+        offset = 0
+        for name, dtype, shape in _FIELDS:
+            full = (2, capacity) if shape is None else (capacity, *shape)
+            arr = np.ndarray(full, dtype=dtype, buffer=buf, offset=offset)
+            setattr(self, name, arr)
+            offset += _aligned(arr.nbytes)
+        # shard boundaries along X: shards + 1 edges, first/last are infinite
+        self.bounds = np.ndarray((shards + 1,), dtype=np.float64, buffer=buf, offset=offset)
+
+    @staticmethod
+    def nbytes(capacity: int, shards: int) -> int:
+        total = 0
+        for _name, dtype, shape in _FIELDS:
+            full = (2, capacity) if shape is None else (capacity, *shape)
+            total += _aligned(int(np.prod(full)) * np.dtype(dtype).itemsize)
+        return total + (shards + 1) * np.dtype(np.float64).itemsize
+
+
+def advance_shard(state: HordeState, shard: int, parity: int, dt: float,
+                  target_x: float, target_y: float, kill_radius: float) -> int:
+    """Move every zombie owned by ``shard`` toward the target; return count."""
+    idx = np.flatnonzero(state.owner[parity] == shard)
+    if idx.size == 0:
+        return 0
+    pos = state.pos[idx]
+    delta = np.array((target_x, target_y)) - pos
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    step = np.minimum(state.speed[idx] * dt, dist)
+    scale = np.divide(step, dist, out=np.zeros_like(dist), where=dist > 1e-6)
+    pos += delta * scale[:, None]
+    state.pos[idx] = pos
+    # Panda3D heading: 0 faces +Y, positive turns toward -X
+    state.heading[idx] = np.degrees(np.arctan2(-delta[:, 0], delta[:, 1]))
+    state.contact[idx] = dist < kill_radius
+    # hand-off: owner for the next tick is decided by the new position
+    state.owner[1 - parity][idx] = np.searchsorted(state.bounds[1:-1], pos[:, 0], side="right")
+    return int(idx.size)
+
+
+# --- worker process side ---
+_worker = {}
+
+
+def _worker_init(shm_name: str, capacity: int, shards: int):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm
+    _worker["state"] = HordeState(shm.buf, capacity, shards)
+
+
+def _worker_step(args) -> int:
+    return advance_shard(_worker["state"], *args)
+
+
+def _release(shm, pool):
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+    try:
+        shm.close()
+    except BufferError:
+        # views still alive at interpreter exit; unlinking is what matters
+        pass
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ShardedHorde:
+    def __init__(self, capacity: int = 4096, workers: int = 0, shards: int = None,
+                 kill_radius: float = 1.0):
+        self.capacity = capacity
+        self.workers = workers
+        self.shards = shards or max(1, workers)
+        self.kill_radius = kill_radius
+        self._shm = shared_memory.SharedMemory(create=True, size=HordeState.nbytes(capacity, self.shards))
+        self.state = HordeState(self._shm.buf, capacity, self.shards)
+        self.state.owner[:] = -1
+        self.state.alive[:] = False
+        self.state.contact[:] = False
+        self.state.bounds[:] = np.linspace(-1.0, 1.0, self.shards + 1)
+        self.state.bounds[0], self.state.bounds[-1] = -np.inf, np.inf
+        self._parity = 0
+        self._ticks = 0
+        self._free = list(range(capacity - 1, -1, -1))
+        self._pool = None
+        if workers > 0:
+            # spawn, not fork: the parent may hold a live graphics context
+            ctx = mp.get_context("spawn")
+            self._pool = ctx.Pool(workers, initializer=_worker_init,
+                                  initargs=(self._shm.name, capacity, self.shards))
+        self._finalizer = weakref.finalize(self, _release, self._shm, self._pool)
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def spawn(self, x: float, y: float, speed: float) -> int:
+        """Allocate a slot for a new zombie and return its index."""
+        if not self._free:
+            raise RuntimeError("horde is full")
+        slot = self._free.pop()
+        s = self.state
+        s.pos[slot] = (x, y)
+        s.speed[slot] = speed
+        s.heading[slot] = 0.0
+        s.contact[slot] = False
+        s.alive[slot] = True
+        s.owner[:, slot] = self._shard_of(x)
+        return slot
+
+    def set_speed(self, slot: int, speed: float):
+        """Change a live zombie's speed (0 holds it in place)."""
+        self.state.speed[slot] = speed
+
+    def kill(self, slot: int):
+        """Remove a zombie from the simulation and free its slot."""
+        s = self.state
+        if not s.alive[slot]:
+            return
+        s.alive[slot] = False
+        s.contact[slot] = False
+        s.owner[:, slot] = -1
+        self._free.append(slot)
+
+    def step(self, dt: float, target_x: float, target_y: float) -> np.ndarray:
+        """Advance all shards one tick; return slots that touched the target."""
+        if self._ticks % REBALANCE_EVERY == 0:
+            self._rebalance()
+        self._ticks += 1
+        jobs = [(k, self._parity, dt, target_x, target_y, self.kill_radius) for k in range(self.shards)]
+        if self._pool is not None:
+            self._pool.map(_worker_step, jobs)
+        else:
+            for job in jobs:
+                advance_shard(self.state, *job)
+        self._parity = 1 - self._parity
+        s = self.state
+        return np.flatnonzero(s.contact & s.alive)
+
+    def transforms(self):
+        """Read-only views of (positions, headings) indexed by slot."""
+        pos = self.state.pos.view()
+        heading = self.state.heading.view()
+        pos.flags.writeable = False
+        heading.flags.writeable = False
+        return pos, heading
+
+    def close(self):
+        """Stop the workers and release the shared-memory block."""
+        self.state = None
+        self._finalizer()
+
+    def _shard_of(self, x: float) -> int:
+        return int(np.searchsorted(self.state.bounds[1:-1], x, side="right"))
+
+    def _rebalance(self):
+        """Move strip boundaries to X quantiles of the live horde."""
+        if self.shards == 1:
+            return
+        s = self.state
+        alive = np.flatnonzero(s.alive)
+        if alive.size < self.shards:
+            return
+        xs = s.pos[alive, 0]
+        s.bounds[1:-1] = np.quantile(xs, np.linspace(0, 1, self.shards + 1)[1:-1])
+        s.owner[self._parity][alive] = np.searchsorted(s.bounds[1:-1], xs, side="right")
@@ -0,0 +1,189 @@
+"""Live-object counts and a headless soak test for entity lifetimes.
+
+``LeakTracker.sample()`` records, per sample, the number of nodes under
+``render``, watched nodes that still exist anywhere, Actors, collision
+solids, tasks, timers, store entities, Python objects of selected types and
+the process RSS. Panda3D handles are not gc-tracked, so nodes are followed
+with ``WeakNodePath``: a zombie node that was detached but is still
+referenced keeps counting until it is really freed. ``growth()`` compares the
+start of a run (after a warm-up) with its end and reports every counter
+that kept climbing.
+
+The soak mode drives a headless game through spawn/kill cycles and exits
+non-zero when anything grows:
+
+    python -m aiden.leaks --minutes 120 --zombies 40 --output soak.json
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import time
+from collections import Counter
+
+from panda3d.core import WeakNodePath
+
+# Python classes whose instances are counted in every sample
+TRACKED_TYPES = ("Zombie", "Item", "NPC", "Actor", "Timer", "ZombieAnimator")
+# Allowed growth between the start and the end of a run
+COUNT_SLACK = 2
+RSS_SLACK_KB = 8 * 1024
+WARMUP = 3
+
+
+def rss_kb() -> int:
+    """Current resident set size in KiB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def count_objects(type_names=TRACKED_TYPES) -> Counter:
+    """Live Python objects per class name (a full gc walk: sampling only)."""
+    wanted = set(type_names)
+    counts = Counter({name: 0 for name in type_names})
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in wanted:
+            counts[name] += 1
+    return counts
+
+
+class LeakTracker:
+    def __init__(self, game=None, type_names=TRACKED_TYPES):
+        self.game = game
+        self.type_names = type_names
+        self.samples = []
+        self._watched = []
+
+    def watch(self, node):
+        """Count ``node`` in ``live_nodes`` until Panda3D frees it."""
+        self._watched.append(WeakNodePath(node))
+
+    def counts(self) -> dict:
+        gc.collect()
+        out = {f"py.{k}": v for k, v in count_objects(self.type_names).items()}
+        self._watched = [w for w in self._watched if not w.wasDeleted()]
+        out["live_nodes"] = len(self._watched)
+        game = self.game
+        if game is not None:
+            out["nodes"] = game.render.findAllMatches("**").getNumPaths()
+            out["tasks"] = len(game.taskMgr.getAllTasks())
+            out["timers"] = len(game.timers)
+            out["entities"] = len(game.entities)
+            out["zombies"] = len(game.zombies)
+            out["collision_solids"] = sum(game.collision.count(layer) for layer in ("pick", "ground"))
+        out["rss_kb"] = rss_kb()
+        return out
+
+    def sample(self, label=None) -> dict:
+        counts = self.counts()
+        counts["t"] = time.monotonic()
+        if label is not None:
+            counts["label"] = label
+        self.samples.append(counts)
+        return counts
+
+    def growth(self, warmup: int = WARMUP, slack: int = COUNT_SLACK, rss_slack_kb: int = RSS_SLACK_KB) -> dict:
+        """Counters whose last sample exceeds the post-warm-up baseline.
+
+        Returns ``{name: (baseline, last)}``; empty means the footprint held
+        flat. The baseline is the smallest value after the warm-up samples,
+        so a counter that only fluctuates is not reported.
+        """
+        runs = self.samples[warmup:]
+        if len(runs) < 2:
+            return {}
+        grown = {}
+        for key, last in runs[-1].items():
+            if key in ("t", "label"):
+                continue
+            base = min(s[key] for s in runs[:-1] if key in s)
+            allowed = rss_slack_kb if key == "rss_kb" else slack
+            if last - base > allowed:
+                grown[key] = (base, last)
+        return grown
+
+    def report(self) -> dict:
+        return {"samples": self.samples, "growth": self.growth()}
+
+
+def soak_cycle(game, zombies: int, settle: float = 1.0, tracker=None):
+    """Spawn ``zombies``, let them run, kill them all and let cleanup finish.
+
+    With a ``tracker``, the spawned zombies' nodes are watched.
+    """
+    for _ in range(zombies):
+        game._spawn_zombie_at(game._random_spawn_position())
+        if tracker is not None:
+            tracker.watch(game.zombies[-1].node)
+    for _ in range(3):
+        game.taskMgr.step()
+    # spawn clips finish and zombies walk on game time
+    game.timers.advance(settle)
+    game._update_zombies(0.1)
+    for z in list(game.zombies):
+        if z.alive:
+            z.take_damage(z.max_health)
+            game._on_zombie_killed(z)
+    game.timers.advance(settle)
+    game.taskMgr.step()
+
+
+def run_soak(minutes: float = 60.0, zombies: int = 40, sample_every: int = 10, max_cycles: int = 0, game=None):
+    """Run spawn/kill cycles headless; returns the tracker."""
+    if game is None:
+        # a small software-rendered offscreen buffer: no display needed, and
+        # the camera and 2D layers exist as in a windowed run
+        from .bench_render import headless_game
+
+        game = headless_game()
+    # keep the regular spawner and the player out of the way of the cycles
+    game.zombie_spawner.cancel()
+    game.player_alive = False
+    tracker = LeakTracker(game)
+    tracker.sample("start")
+    deadline = time.monotonic() + minutes * 60.0
+    cycle = 0
+    while time.monotonic() < deadline and (max_cycles <= 0 or cycle < max_cycles):
+        soak_cycle(game, zombies, tracker=tracker)
+        cycle += 1
+        if cycle % sample_every == 0:
+            tracker.sample(f"cycle {cycle}")
+    tracker.sample(f"cycle {cycle}")
+    return tracker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless spawn/kill soak test")
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--cycles", type=int, default=0, help="stop after N cycles (0 = run for --minutes)")
+    parser.add_argument("--zombies", type=int, default=40, help="zombies spawned and killed per cycle")
+    parser.add_argument("--sample-every", type=int, default=10, help="cycles between samples")
+    parser.add_argument("--output", default=None, help="write samples and growth as JSON")
+    args = parser.parse_args(argv)
+
+    tracker = run_soak(args.minutes, args.zombies, args.sample_every, args.cycles)
+    report = tracker.report()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    first, last = tracker.samples[0], tracker.samples[-1]
+    for key in sorted(k for k in last if k not in ("t", "label")):
+        print(f"{key:24s} {first.get(key, 0):>10} -> {last[key]:>10}")
+    if report["growth"]:
+        for key, (base, end) in sorted(report["growth"].items()):
+            print(f"LEAK {key}: {base} -> {end}")
+        return 1
+    print("no growth")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import argparse
+
 try:
     # Prefer package-relative import when run as a module (python -m aiden.main)
     from aiden.game import AdventureGame
@@ -6,9 +8,90 @@ except Exception:
     from game import AdventureGame  # type: ignore
 
 
-def main():
-    game = AdventureGame()
-    game.run()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shards of the Grove")
+    parser.add_argument(
+        "--shard-workers",
+        type=int,
+        default=0,
+        help="simulate zombies on N worker processes (0 = main thread)",
+    )
+    parser.add_argument(
+        "--elder-rag",
+        action="store_true",
+        help="let the Elder answer questions from the ingested corpus",
+    )
+    parser.add_argument("--persist-dir", default=".rag", help="RAG store directory")
+    parser.add_argument("--ollama-url", default="http://localhost:11434")
+    parser.add_argument("--model", default="llama3.2")
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=0,
+        metavar="FRAMES",
+        help="sample the game loop for FRAMES frames, write the profile and exit",
+    )
+    parser.add_argument("--profile-out", default="profile", help="output path prefix")
+    parser.add_argument("--profile-interval", type=float, default=1.0, help="sampling interval in ms")
+    parser.add_argument(
+        "--world",
+        default=None,
+        metavar="DIR",
+        help="stream a chunked world (see python -m aiden.world) instead of the fixed map",
+    )
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        default=0.0,
+        help="lower zombie count, animation and AI detail to hold this frame rate (default 0 = off)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=None,
+        metavar="PATH",
+        help="log gameplay events as JSON lines to PATH (rotated by size)",
+    )
+    args = parser.parse_args(argv)
+    oracle = None
+    if args.elder_rag:
+        from aiden.elder import ElderOracle, default_pipeline_factory
+
+        oracle = ElderOracle(
+            default_pipeline_factory(args.persist_dir, args.ollama_url, args.model)
+        )
+    profiler = None
+    if args.profile > 0:
+        from aiden.profiler import FrameSampler
+
+        profiler = FrameSampler(args.profile, args.profile_interval / 1000.0)
+    governor = None
+    if args.target_fps > 0:
+        from aiden.governor import LoadGovernor
+
+        governor = LoadGovernor(args.target_fps)
+    telemetry = None
+    if args.telemetry:
+        from aiden.telemetry import Telemetry
+
+        telemetry = Telemetry(args.telemetry)
+    game = AdventureGame(
+        shard_workers=args.shard_workers,
+        elder_oracle=oracle,
+        profiler=profiler,
+        profile_out=args.profile_out,
+        world_dir=args.world,
+        governor=governor,
+        telemetry=telemetry,
+    )
+    try:
+        game.run()
+    finally:
+        if oracle is not None:
+            oracle.close()
+        if game.world_streamer is not None:
+            game.world_streamer.close()
+        if telemetry is not None:
+            telemetry.close()
 
 
 if __name__ == "__main__":
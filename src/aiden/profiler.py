@@ -0,0 +1,125 @@
+"""Low-overhead sampling profiler for the game loop.
+
+A background thread wakes every ``interval`` seconds and, while the main
+thread is inside a ``frame()`` block (the per-frame update task), records
+its Python stack from ``sys._current_frames()``. Nothing is traced, so the
+profiled code runs at full speed apart from the sampler's own GIL turns.
+The interpreter's switch interval is lowered to the sampling interval while
+sampling; otherwise a busy main thread would keep the sampler waiting for
+the GIL until the frame ended.
+
+Output, written by ``write(prefix)``:
+
+    prefix.collapsed   one ``root;caller;callee count`` line per stack, the
+                       input format of flamegraph.pl, speedscope and inferno
+    prefix.txt         per-function self and total samples with the share
+                       of frame time they represent
+
+Usage:
+    python -m aiden.main --profile 600 --profile-out profile
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+class FrameSampler:
+    def __init__(self, frames: int = 600, interval: float = 0.001):
+        self.frames = frames
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.frames_seen = 0
+        self.frame_seconds = 0.0
+        self._root = None
+        self._main_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, interval))
+        self._thread = threading.Thread(target=self._run, name="frame-sampler", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self.frames_seen >= self.frames
+
+    @contextmanager
+    def frame(self):
+        """Sample the calling function and everything it calls."""
+        start = time.perf_counter()
+        self._root = sys._getframe(2)  # the caller of the ``with`` statement
+        try:
+            yield
+        finally:
+            self._root = None
+            self.frame_seconds += time.perf_counter() - start
+            self.frames_seen += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            root = self._root
+            if root is None:
+                continue
+            frame = sys._current_frames().get(self._main_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                if frame is root:
+                    break
+                frame = frame.f_back
+            else:
+                continue  # the frame ended between the check and the snapshot
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        sys.setswitchinterval(self._switch_interval)
+
+    def function_times(self) -> Dict[str, Tuple[int, int]]:
+        """label -> (self samples, total samples)."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, n in self.stacks.items():
+            self_counts[stack[-1]] += n
+            for label in set(stack):
+                total_counts[label] += n
+        return {label: (self_counts[label], total) for label, total in total_counts.items()}
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in sorted(self.stacks.items()))
+
+    def report(self, limit: int = 40) -> str:
+        per_frame_ms = 1000.0 * self.frame_seconds / self.frames_seen if self.frames_seen else 0.0
+        lines = [
+            f"{self.frames_seen} frames, {per_frame_ms:.3f} ms/frame in the update task, "
+            f"{self.samples} samples every {self.interval * 1000:.1f} ms",
+            "",
+            f"{'self%':>7} {'total%':>7} {'self ms/frame':>14}  function",
+        ]
+        total = self.samples or 1
+        rows = sorted(self.function_times().items(), key=lambda kv: (kv[1][0], kv[1][1]), reverse=True)
+        for label, (own, incl) in rows[:limit]:
+            lines.append(
+                f"{100.0 * own / total:7.2f} {100.0 * incl / total:7.2f} {per_frame_ms * own / total:14.4f}  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix) -> Tuple[str, str]:
+        collapsed, table = f"{prefix}.collapsed", f"{prefix}.txt"
+        with open(collapsed, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(table, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        return collapsed, table
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Callable
+from typing import List, Callable, Optional
 
 
 @dataclass
@@ -8,6 +8,9 @@ class Quest:
     description: str
     is_complete: bool = False
     on_complete: Callable[[], None] = lambda: None
+    # Seconds of game time from the start to finish the quest (None = no limit)
+    time_limit: Optional[float] = None
+    on_timeout: Callable[[], None] = lambda: None
 
 
 @dataclass
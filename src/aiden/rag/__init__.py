@@ -0,0 +1,6 @@
+"""
+Retrieval-augmented generation over the project's document corpus.
+
+Ingest the corpus (see rag.md for the background):
+    python -m aiden.rag.ingest data/clean_docs.txt --persist-dir .rag
+"""
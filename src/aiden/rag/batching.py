@@ -0,0 +1,108 @@
+"""Micro-batching of per-request work (query embeddings) across requests.
+
+``await batcher.submit(item)`` queues one item; queued items run together as
+one ``fn(items)`` call in a worker thread and each caller gets its own row of
+the result. A batch is dispatched when
+
+    nothing is running              at once, so a lone request never waits
+    ``max_batch`` items are queued  size flush
+    the oldest item waited ``max_wait_ms``  deadline flush
+
+and at most ``max_concurrent`` batches run at a time; items arriving while
+the workers are busy accumulate into the next batch.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict
+
+import numpy as np
+
+# Recent queue-wait samples kept for the percentiles in stats()
+WAIT_SAMPLES = 1024
+
+
+class MicroBatcher:
+    def __init__(self, fn: Callable, max_batch: int = 32, max_wait_ms: float = 2.0, max_concurrent: int = 2):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent = max_concurrent
+        self._pending = deque()
+        self._running = 0
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((item, fut, time.perf_counter()))
+        self._schedule(loop)
+        return await fut
+
+    def _schedule(self, loop):
+        while self._pending and self._running < self.max_concurrent:
+            due = self._pending[0][2] + self.max_wait
+            if self._running and len(self._pending) < self.max_batch and time.perf_counter() < due:
+                if self._timer is None:
+                    # the loop clock is not perf_counter; schedule by time remaining
+                    self._timer = loop.call_later(due - time.perf_counter(), self._on_timer, loop)
+                return
+            self._dispatch(loop)
+
+    def _on_timer(self, loop):
+        self._timer = None
+        self._schedule(loop)
+
+    def _dispatch(self, loop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.perf_counter()
+        batch = []
+        while self._pending and len(batch) < self.max_batch:
+            item, fut, queued = self._pending.popleft()
+            if fut.cancelled():
+                continue  # the caller went away while queued
+            batch.append((item, fut))
+            self._waits.append(now - queued)
+        if not batch:
+            return
+        self._running += 1
+        self.batches += 1
+        self.items += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        work = loop.run_in_executor(None, self.fn, [item for item, _ in batch])
+        work.add_done_callback(lambda done: self._finish(loop, batch, done))
+
+    def _finish(self, loop, batch, done):
+        self._running -= 1
+        exc = done.exception()
+        if exc is None:
+            results = done.result()
+        for i, (_, fut) in enumerate(batch):
+            if fut.done():
+                continue
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(results[i])
+        self._schedule(loop)
+
+    def stats(self) -> Dict:
+        waits = np.asarray(self._waits, dtype=np.float64) * 1000.0
+        out = {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 3) if self.batches else 0.0,
+            "max_batch": self.max_batch_seen,
+            "queued": len(self._pending),
+        }
+        if waits.size:
+            p50, p95, p99 = np.percentile(waits, [50, 95, 99])
+            out.update(wait_p50_ms=round(float(p50), 3), wait_p95_ms=round(float(p95), 3),
+                       wait_p99_ms=round(float(p99), 3))
+        return out
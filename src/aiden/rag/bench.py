@@ -0,0 +1,341 @@
+"""Latency and recall benchmark for the RAG path.
+
+For every retrieval backend this ingests the corpus into a scratch directory
+and measures:
+
+    ingest      cold and warm (embedding cache primed) throughput, no-op re-run
+    retrieval   per-query latency percentiles, recall@k and MRR against the
+                known answers in QUESTIONS, for vector-only and hybrid search
+    quantization  (numpy backend) float16/int8 storage against float32: bytes
+                on disk, open-plus-first-query time, latency and recall loss
+    chat        time to first token and full-answer latency through the chat
+                pipeline against the stub model server, with the response
+                cache off and on
+
+Results are printed (or written with ``--output``) as JSON so runs can be
+diffed across configurations and commits.
+
+Usage:
+    python -m aiden.rag.bench data/clean_docs.txt --backends numpy,chroma --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .config import RagConfig, build_embedder, open_store
+from .ingest import Ingester
+from .llm import OllamaClient
+from .numpy_store import NumpyStore
+from .pipeline import ChatPipeline
+from .response_cache import ResponseCache
+from .retrieval import HybridRetriever, Retriever
+from .stub_llm import StubModelServer
+
+# (question, substring of the passage that answers it) for data/clean_docs.txt
+QUESTIONS: Tuple[Tuple[str, str], ...] = (
+    ("What did people hit the ball with before tennis rackets?", "palm of their hands"),
+    ("When were yellow tennis balls first used at Wimbledon?", "1986"),
+    ("Why did officials switch to yellow balls?", "follow on TV"),
+    ("Where does the tennis term love come from?", "oeuf"),
+    ("How many miles does a player run during a match?", "3 miles"),
+    ("Which spelling does the USTA use, racket or racquet?", "USTA consistently uses"),
+    ("Which sisters won Olympic gold medals in tennis?", "Venus and Serena"),
+    ("Who are the Aranda brothers?", "Jeff and Jordan"),
+    ("Which university did Jordan Aranda play for?", "Wisconsin-Milwaukee"),
+    ("What is the world governing body of tennis?", "International Tennis Federation"),
+    ("Why is tennis also called lawn tennis?", "grass courts"),
+    ("What was the game jeu de paume?", "jeu de paume"),
+)
+
+
+def percentiles(samples_ms: Sequence[float]) -> Dict[str, float]:
+    if not len(samples_ms):
+        return {}
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "n": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(arr.max()), 4),
+    }
+
+
+def prepare_corpus(source: Path, dest: Path, scale: int) -> Path:
+    """Write ``scale`` copies of the corpus, tagged so every chunk is distinct."""
+    if scale <= 1:
+        return source
+    paragraphs = [p for p in source.read_text(encoding="utf-8").split("\n\n") if p.strip()]
+    dest.mkdir(parents=True, exist_ok=True)
+    for i in range(scale):
+        text = "\n\n".join(f"{p.strip()} [copy {i}]" for p in paragraphs)
+        (dest / f"copy-{i:04d}.txt").write_text(text + "\n", encoding="utf-8")
+    return dest
+
+
+def _ingester(config: RagConfig, embedder, store):
+    return Ingester(
+        store,
+        embedder,
+        config.manifest_path,
+        chunk_chars=config.chunk_chars,
+        chunk_overlap=config.chunk_overlap,
+        bm25_path=config.bm25_path,
+    )
+
+
+def bench_ingest(config: RagConfig, corpus: Path) -> Dict:
+    embedder = build_embedder(config)
+    cache = getattr(embedder, "cache", None)
+    try:
+        stats = _ingester(config, embedder, open_store(config)).run([corpus])
+        cold = stats.seconds
+        chunks = stats.chunks_embedded
+        noop = _ingester(config, embedder, open_store(config)).run([corpus]).seconds
+
+        result = {
+            "chunks": chunks,
+            "cold_seconds": round(cold, 4),
+            "cold_chunks_per_s": round(chunks / cold, 1) if cold else None,
+            "noop_seconds": round(noop, 4),
+        }
+        if cache is not None:
+            # same corpus into a fresh store: every embedding should come from the cache
+            before = (cache.hits, cache.misses)
+            warm_config = replace(config, persist_dir=str(Path(config.persist_dir) / "warm"))
+            warm = _ingester(warm_config, embedder, open_store(warm_config)).run([corpus]).seconds
+            hits, misses = cache.hits - before[0], cache.misses - before[1]
+            result.update(
+                warm_seconds=round(warm, 4),
+                warm_chunks_per_s=round(chunks / warm, 1) if warm else None,
+                embedding_cache_hit_rate=round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            )
+    finally:
+        if cache is not None:
+            # the cache's SQLite connection would otherwise outlive the run
+            cache.close()
+    return result
+
+
+def bench_retrieval(retriever, questions, k: int, repeats: int) -> Dict:
+    latencies: List[float] = []
+    found = 0
+    reciprocal = 0.0
+    for question, expected in questions:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            hits = retriever.search([question], k)[0]
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        rank = next((i for i, h in enumerate(hits, 1) if expected in h.text), None)
+        if rank is not None:
+            found += 1
+            reciprocal += 1.0 / rank
+    n = len(questions)
+    return {
+        "latency": percentiles(latencies),
+        f"recall@{k}": round(found / n, 4) if n else 0.0,
+        "mrr": round(reciprocal / n, 4) if n else 0.0,
+    }
+
+
+# (vector dtype, exact re-scoring factor) compared by bench_quantization
+QUANT_MODES = (("float32", 0), ("float16", 0), ("int8", 0), ("int8", 4))
+
+
+def _vector_bytes(path: Path) -> int:
+    return sum((path / name).stat().st_size for name in ("vectors.npy", "scales.npy") if (path / name).exists())
+
+
+def bench_quantization(config: RagConfig, embedder, questions, k: int, repeats: int) -> Dict:
+    """Re-encode a copy of the float32 store per mode and compare with it."""
+    source = config.store_dir / config.collection
+    vectors = embedder([q for q, _ in questions])
+    # float32 reference: exact top-k score threshold per question, so ties
+    # between near-identical chunks do not count as recall loss
+    reference = NumpyStore(source)
+    ids = reference.ids()
+    exact = dict(zip(ids, reference.embeddings(ids)))
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    thresholds = [row[-1].score if row else np.inf for row in reference.query(vectors, k)]
+    out = {}
+    baseline_bytes = None
+    with tempfile.TemporaryDirectory(prefix="rag-quant-") as tmp:
+        for dtype, rescore in QUANT_MODES:
+            path = Path(tmp) / f"{dtype}-{rescore}"
+            shutil.copytree(source, path)
+            NumpyStore(path, dtype=dtype, rescore=rescore).flush()
+            start = time.perf_counter()
+            store = NumpyStore(path, ivf_lists=config.ivf_lists, nprobe=config.ivf_probe, dtype=dtype, rescore=rescore)
+            store.query(vectors[:1], k)
+            cold = (time.perf_counter() - start) * 1000.0
+            latencies = []
+            for _ in range(repeats):
+                for vec in vectors:
+                    t0 = time.perf_counter()
+                    store.query(vec[None, :], k)
+                    latencies.append((time.perf_counter() - t0) * 1000.0)
+            results = store.query(vectors, k)
+            size = _vector_bytes(path)
+            if baseline_bytes is None:
+                baseline_bytes = size
+            overlap = [
+                sum(float(exact[h.id] @ q) >= t - 1e-5 for h in row) / k
+                for row, q, t in zip(results, unit, thresholds)
+            ]
+            answered = sum(any(exp in h.text for h in row) for row, (_, exp) in zip(results, questions))
+            out[f"{dtype}+rescore{rescore}" if rescore else dtype] = {
+                "vector_bytes": size,
+                "size_ratio": round(baseline_bytes / size, 3) if size else None,
+                "open_and_first_query_ms": round(cold, 4),
+                "latency": percentiles(latencies),
+                "recall_vs_float32": round(float(np.mean(overlap)), 4) if overlap else None,
+                f"recall@{k}": round(answered / len(questions), 4) if questions else 0.0,
+            }
+    return out
+
+
+async def bench_chat(retriever, questions, k: int, rounds: int, token_delay: float, use_cache: bool) -> Dict:
+    stub = StubModelServer(lambda prompt: "The answer is in the context above.", token_delay)
+    srv = await stub.start("127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    llm = OllamaClient(f"http://127.0.0.1:{port}", "stub")
+    cache = ResponseCache() if use_cache else None
+    pipeline = ChatPipeline(retriever, llm, top_k=k, cache=cache)
+    first_token: List[float] = []
+    total: List[float] = []
+    try:
+        for _ in range(rounds):
+            for question, _ in questions:
+                start = time.perf_counter()
+                first = None
+                async for _ in pipeline.stream(question):
+                    if first is None:
+                        first = time.perf_counter()
+                end = time.perf_counter()
+                first_token.append(((first or end) - start) * 1000.0)
+                total.append((end - start) * 1000.0)
+    finally:
+        llm.close()
+        await stub.stop()
+    result = {
+        "time_to_first_token": percentiles(first_token),
+        "answer_latency": percentiles(total),
+        "llm_requests": stub.requests,
+    }
+    if cache is not None:
+        result["response_cache"] = cache.stats()
+    return result
+
+
+def bench_backend(base: RagConfig, corpus: Path, args) -> Dict:
+    config = replace(base, persist_dir=str(Path(base.persist_dir) / base.backend))
+    result = {"backend": config.backend, "ingest": bench_ingest(config, corpus)}
+    store = open_store(config)
+    embedder = build_embedder(config)
+    questions = QUESTIONS[: args.questions] if args.questions else QUESTIONS
+    retrievers = {
+        "vector": Retriever(store, embedder),
+        "hybrid": HybridRetriever(store, embedder, config.bm25_path),
+    }
+    result["retrieval"] = {
+        mode: bench_retrieval(r, questions, args.k, args.repeats) for mode, r in retrievers.items()
+    }
+    if config.resolved_backend() == "numpy":
+        result["quantization"] = bench_quantization(config, embedder, questions, args.k, args.repeats)
+    chat_retriever = retrievers["hybrid" if config.hybrid else "vector"]
+    result["chat"] = {
+        name: asyncio.run(bench_chat(chat_retriever, questions, args.k, args.rounds, args.token_delay, use_cache))
+        for name, use_cache in (("no_cache", False), ("response_cache", True))
+    }
+    cache = getattr(embedder, "cache", None)
+    if cache is not None:
+        result["query_embedding_cache"] = cache.stats()
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run(args) -> Dict:
+    corpus = Path(args.corpus)
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "corpus": str(corpus),
+            "scale": args.scale,
+            "embedder": args.embedder,
+            "k": args.k,
+            "repeats": args.repeats,
+            "rounds": args.rounds,
+            "token_delay": args.token_delay,
+            "embedding_cache_size": args.cache_size,
+        },
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="rag-bench-") as tmp:
+        corpus = prepare_corpus(corpus, Path(tmp) / "corpus", args.scale)
+        for backend in args.backends.split(","):
+            config = RagConfig(
+                persist_dir=str(Path(tmp) / "store"),
+                backend=backend,
+                embedder=args.embedder,
+                embedding_cache_size=args.cache_size,
+                ivf_lists=args.ivf_lists,
+            )
+            if backend == "chroma":
+                try:
+                    import chromadb  # noqa: F401
+                except ImportError:
+                    results["runs"].append({"backend": backend, "skipped": "chromadb is not installed"})
+                    continue
+            results["runs"].append(bench_backend(config, corpus, args))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RAG ingestion, retrieval and chat latency")
+    parser.add_argument("corpus", nargs="?", default="data/clean_docs.txt")
+    parser.add_argument("--backends", default="numpy,chroma", help="comma-separated: numpy, chroma")
+    parser.add_argument("--embedder", default="hashing-384")
+    parser.add_argument("--cache-size", type=int, default=RagConfig.embedding_cache_size)
+    parser.add_argument("--ivf-lists", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=1, help="corpus copies to ingest")
+    parser.add_argument("--k", type=int, default=RagConfig.top_k)
+    parser.add_argument("--questions", type=int, default=0, help="limit the question set (0 = all)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed searches per question")
+    parser.add_argument("--rounds", type=int, default=2, help="passes over the questions in the chat phase")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="stub model seconds per token")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Prebuilt BM25 inverted index over the ingested chunks.
+
+Built by ingestion whenever the corpus changes and saved as one ``.npz``:
+
+    terms      sorted vocabulary (looked up with ``searchsorted``)
+    indptr     CSR offsets of each term's postings
+    docs       chunk row of every posting
+    weights    full BM25 weight of every posting (idf and length norm applied)
+    ids        chunk ids, row-aligned
+    text/text_offsets, sources   chunk texts and their source files
+    tokens     estimated token count of every chunk, for prompt packing
+
+Because the weights are final, a query is a sum over the postings of its terms
+followed by a partial sort; nothing is tokenised or normalised at query time
+beyond the query itself.
+"""
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .embeddings import tokenize
+from .numpy_store import top_k
+from .prompt import count_tokens
+from .store import Hit
+
+K1 = 1.2
+B = 0.75
+
+
+class BM25Index:
+    def __init__(self, terms, indptr, docs, weights, ids, text, text_offsets, sources, source_names, tokens):
+        self.terms = terms
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+        self.ids = ids
+        self._text = text
+        self._text_offsets = text_offsets
+        self._sources = sources
+        self._source_names = source_names
+        self._tokens = tokens
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, chunks: Iterable[Tuple[str, str, str]], k1: float = K1, b: float = B) -> "BM25Index":
+        """Index ``(chunk_id, text, source)`` triples."""
+        ids, texts, sources, counts = [], [], [], []
+        source_rows = {}
+        for cid, text, source in chunks:
+            ids.append(cid)
+            texts.append(text)
+            sources.append(source_rows.setdefault(source, len(source_rows)))
+            counts.append(Counter(tokenize(text)))
+        n = len(ids)
+        doc_len = np.array([sum(c.values()) for c in counts], dtype=np.float32)
+        avgdl = float(doc_len.mean()) if n else 0.0
+
+        postings = {}
+        for row, c in enumerate(counts):
+            for term, tf in c.items():
+                postings.setdefault(term, []).append((row, tf))
+        terms = sorted(postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[t]) for t in terms], out=indptr[1:])
+        docs = np.empty(indptr[-1], dtype=np.int32)
+        tfs = np.empty(indptr[-1], dtype=np.float32)
+        for i, t in enumerate(terms):
+            rows, freqs = zip(*postings[t])
+            docs[indptr[i]:indptr[i + 1]] = rows
+            tfs[indptr[i]:indptr[i + 1]] = freqs
+        df = np.diff(indptr).astype(np.float32)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        norm = k1 * (1.0 - b + b * doc_len[docs] / (avgdl or 1.0))
+        weights = (np.repeat(idf, np.diff(indptr)) * tfs * (k1 + 1.0) / (tfs + norm)).astype(np.float32)
+
+        encoded = [t.encode("utf-8") for t in texts]
+        text_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=text_offsets[1:])
+        return cls(
+            np.array(terms, dtype=np.str_),
+            indptr,
+            docs,
+            weights,
+            np.array(ids, dtype=np.str_),
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            text_offsets,
+            np.array(sources, dtype=np.int32),
+            np.array(list(source_rows), dtype=np.str_),
+            np.array([count_tokens(t) for t in texts], dtype=np.int32),
+        )
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            terms=self.terms,
+            indptr=self.indptr,
+            docs=self.docs,
+            weights=self.weights,
+            ids=self.ids,
+            text=self._text,
+            text_offsets=self._text_offsets,
+            sources=self._sources,
+            source_names=self._source_names,
+            tokens=self._tokens,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "BM25Index":
+        with np.load(path) as z:
+            return cls(
+                z["terms"], z["indptr"], z["docs"], z["weights"], z["ids"],
+                z["text"], z["text_offsets"], z["sources"], z["source_names"], z["tokens"],
+            )
+
+    def text(self, row: int) -> str:
+        return self._text[self._text_offsets[row]:self._text_offsets[row + 1]].tobytes().decode("utf-8")
+
+    def metadata(self, row: int):
+        return {"source": str(self._source_names[self._sources[row]]), "tokens": int(self._tokens[row])}
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        terms = np.unique(tokenize(query))
+        if not len(terms) or not len(self.terms):
+            return scores
+        pos = np.searchsorted(self.terms, terms)
+        found = pos < len(self.terms)
+        pos, terms = pos[found], terms[found]
+        for p in pos[self.terms[pos] == terms]:
+            lo, hi = self.indptr[p], self.indptr[p + 1]
+            # a term occurs once per chunk in its postings, so no np.add.at needed
+            scores[self.docs[lo:hi]] += self.weights[lo:hi]
+        return scores
+
+    def search(self, queries: Sequence[str], k: int = 4) -> List[List[Hit]]:
+        out = []
+        for query in queries:
+            scores = self.scores(query)
+            rows = top_k(scores[None, :], k)[0] if len(scores) else []
+            out.append(
+                [Hit(str(self.ids[r]), self.text(r), float(scores[r]), self.metadata(r)) for r in rows if scores[r] > 0]
+            )
+        return out
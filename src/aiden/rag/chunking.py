@@ -0,0 +1,74 @@
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+# Files picked up when a directory is ingested
+TEXT_SUFFIXES = (".txt", ".md")
+
+
+@dataclass
+class Chunk:
+    id: str
+    text: str
+    source: str
+    ordinal: int
+
+
+def chunk_id(text: str) -> str:
+    """Content hash used as the chunk's identity in the store and manifest."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def iter_paragraphs(path: Path) -> Iterator[str]:
+    """Yield blank-line separated paragraphs, reading the file line by line."""
+    buf = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                buf.append(line)
+            elif buf:
+                yield "\n".join(buf)
+                buf = []
+    if buf:
+        yield "\n".join(buf)
+
+
+def split_long(text: str, max_chars: int, overlap: int) -> Iterator[str]:
+    """Split text longer than ``max_chars`` on word boundaries with overlap."""
+    if len(text) <= max_chars:
+        yield text
+        return
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        if end < len(text):
+            cut = text.rfind(" ", start + overlap + 1, end)
+            if cut > start:
+                end = cut
+        yield text[start:end].strip()
+        if end >= len(text):
+            return
+        start = max(start + 1, end - overlap)
+
+
+def iter_chunks(path: Path, max_chars: int = 800, overlap: int = 100) -> Iterator[Chunk]:
+    """Stream the chunks of one document."""
+    ordinal = 0
+    for para in iter_paragraphs(path):
+        for piece in split_long(para, max_chars, overlap):
+            if piece:
+                yield Chunk(chunk_id(piece), piece, str(path), ordinal)
+                ordinal += 1
+
+
+def iter_documents(paths) -> Iterator[Path]:
+    """Expand files and directories into the documents to ingest."""
+    for p in map(Path, paths):
+        if p.is_dir():
+            for f in sorted(p.rglob("*")):
+                if f.is_file() and f.suffix in TEXT_SUFFIXES:
+                    yield f
+        elif p.is_file():
+            yield p
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+from .embed_cache import CachedEmbedder, EmbeddingCache
+from .embeddings import get_embedder
+from .numpy_store import NumpyStore
+from .store import ChromaStore
+
+
+@dataclass
+class RagConfig:
+    persist_dir: str = ".rag"
+    # "chroma", "numpy" or "auto" (Chroma when installed, else NumPy). The
+    # NumPy store starts much faster; Chroma's HNSW index scales further.
+    backend: str = "auto"
+    collection: str = "docs"
+    embedder: str = "default"
+    chunk_chars: int = 800
+    chunk_overlap: int = 100
+    top_k: int = 4
+    # Persistent embedding cache under persist_dir; 0 disables it
+    embedding_cache_size: int = 100_000
+    # NumPy backend: coarse clusters (0 = exact search) and lists probed per query
+    ivf_lists: int = 0
+    ivf_probe: int = 8
+    # NumPy backend: stored vector type (float32, float16, int8) and, for the
+    # quantized types, candidates per hit re-scored exactly (0 = off)
+    vector_dtype: str = "float32"
+    rescore: int = 0
+    # Chat answer cache: entries (0 = off), lifetime and cosine match threshold
+    response_cache_size: int = 1024
+    response_cache_ttl: float = 3600.0
+    response_cache_similarity: float = 0.92
+    # Estimated token budgets for the packed prompt and the generated answer
+    max_prompt_tokens: int = 1536
+    max_answer_tokens: int = 256
+    # Query embeddings batched across concurrent chat requests
+    embed_batch_size: int = 32
+    embed_batch_wait_ms: float = 2.0
+    # Fuse vector hits with the BM25 index built at ingest time
+    hybrid: bool = True
+
+    def resolved_backend(self) -> str:
+        if self.backend != "auto":
+            return self.backend
+        try:
+            import chromadb  # noqa: F401
+        except ImportError:
+            return "numpy"
+        return "chroma"
+
+    @property
+    def store_dir(self) -> Path:
+        return Path(self.persist_dir) / self.resolved_backend()
+
+    @property
+    def manifest_path(self) -> Path:
+        # one manifest per backend: each store holds its own copy of the corpus
+        return self.store_dir / "manifest.json"
+
+    @property
+    def bm25_path(self) -> Path:
+        return self.store_dir / "bm25.npz"
+
+
+def open_store(config: RagConfig):
+    """Open the vector store described by the config."""
+    backend = config.resolved_backend()
+    if backend == "chroma":
+        return ChromaStore(config.store_dir, config.collection)
+    if backend == "numpy":
+        return NumpyStore(
+            config.store_dir / config.collection,
+            ivf_lists=config.ivf_lists,
+            nprobe=config.ivf_probe,
+            dtype=config.vector_dtype,
+            rescore=config.rescore,
+        )
+    raise ValueError(f"unknown retrieval backend: {backend}")
+
+
+def build_embedder(config: RagConfig):
+    """The configured embedder, behind the on-disk cache when enabled."""
+    embedder = get_embedder(config.embedder)
+    if config.embedding_cache_size <= 0:
+        return embedder
+    cache = EmbeddingCache(
+        Path(config.persist_dir) / "embeddings", embedder.dim, capacity=config.embedding_cache_size
+    )
+    return CachedEmbedder(embedder, cache)
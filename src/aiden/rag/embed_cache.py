@@ -0,0 +1,244 @@
+"""Persistent embedding cache shared between processes.
+
+Vectors live in a fixed-size ``.npy`` matrix opened as a memory map; an SQLite
+index (WAL mode, so readers never block) maps ``(model, sha256(text))`` to a
+row. When the matrix is full the least recently used rows are reused. Written
+rows are synced to disk every ``WRITE_BATCH`` rows and on ``flush()``.
+
+Each row also has a generation number, written to a second memory-mapped array
+and to the index. A reader only trusts a row whose generation still matches
+after copying it, so a concurrent eviction in another process reads as a miss
+rather than returning someone else's vector.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Lookups buffered (LRU timestamps, hit counters) before writing to the index
+TOUCH_BATCH = 256
+# Rows written before the vector and generation maps are synced to disk
+WRITE_BATCH = 4096
+# Keys per ``IN (...)`` query, well under SQLite's bound-parameter limit
+QUERY_CHUNK = 500
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entries (
+        model TEXT NOT NULL, key TEXT NOT NULL, slot INTEGER NOT NULL,
+        gen INTEGER NOT NULL, last_used REAL NOT NULL,
+        PRIMARY KEY (model, key))""",
+    "CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)",
+    "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('next_slot', 0), ('gen', 0)",
+)
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, path, dim: int, capacity: int = 100_000):
+        self.path = Path(path)
+        self.dim = dim
+        self.capacity = capacity
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            self.path / f"index-{dim}.sqlite", timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            for stmt in _SCHEMA:
+                self._db.execute(stmt)
+            vec_file = self.path / f"vectors-{dim}.npy"
+            gen_file = self.path / f"generations-{dim}.npy"
+            if not vec_file.exists():
+                np.lib.format.open_memmap(vec_file, mode="w+", dtype=np.float32, shape=(capacity, dim)).flush()
+                np.lib.format.open_memmap(gen_file, mode="w+", dtype=np.int64, shape=(capacity,)).flush()
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._vectors = np.load(vec_file, mmap_mode="r+")
+        self._gens = np.load(gen_file, mmap_mode="r+")
+        # the file decides the capacity if it was created by another process
+        self.capacity = self._vectors.shape[0]
+        self._touched: Dict[tuple, float] = {}
+        self._pending = {"hits": 0, "misses": 0}
+        # rows written to the memory maps since they were last synced
+        self._unsynced = 0
+        self.hits = 0
+        self.misses = 0
+        # one connection shared by the embedding worker threads
+        self._lock = threading.RLock()
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever keys are present."""
+        with self._lock:
+            found = {}
+            uniq = list(dict.fromkeys(keys))
+            for key, slot, gen in self._lookup(model, uniq, "key, slot, gen"):
+                vec = np.array(self._vectors[slot])
+                if self._gens[slot] == gen:
+                    found[key] = vec
+            now = time.time()
+            for key in found:
+                self._touched[(model, key)] = now
+            self.hits += len(found)
+            self.misses += len(uniq) - len(found)
+            self._pending["hits"] += len(found)
+            self._pending["misses"] += len(uniq) - len(found)
+            if len(self._touched) + self._pending["misses"] >= TOUCH_BATCH:
+                self.flush()
+            return found
+
+    def put_many(self, model: str, keys: Sequence[str], vectors):
+        """Store vectors, evicting least recently used rows when full."""
+        with self._lock:
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if len(keys) == 0:
+                return
+            if len(keys) > self.capacity:
+                keys, vectors = keys[-self.capacity:], vectors[-self.capacity:]
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_touches()
+                existing = {k for (k,) in self._lookup(model, list(dict.fromkeys(keys)), "key")}
+                todo = list({k: v for k, v in zip(keys, vectors) if k not in existing}.items())
+                slots = self._allocate(len(todo))
+                gen = self._counter("gen") + 1
+                now = time.time()
+                rows = []
+                for (key, vec), slot in zip(todo, slots):
+                    self._gens[slot] = -1
+                    self._vectors[slot] = vec
+                    self._gens[slot] = gen
+                    rows.append((model, key, slot, gen, now))
+                # other processes see the rows through the shared mapping
+                # right away; syncing to disk is for durability only
+                self._unsynced += len(rows)
+                if self._unsynced >= WRITE_BATCH:
+                    self._sync_maps()
+                db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+                db.execute("UPDATE counters SET value = ? WHERE name = 'gen'", (gen,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _lookup(self, model: str, keys: Sequence[str], columns: str) -> List[tuple]:
+        """Index rows for ``keys``, queried ``QUERY_CHUNK`` keys at a time."""
+        rows = []
+        for start in range(0, len(keys), QUERY_CHUNK):
+            part = keys[start:start + QUERY_CHUNK]
+            marks = ",".join("?" * len(part))
+            rows += self._db.execute(
+                f"SELECT {columns} FROM entries WHERE model = ? AND key IN ({marks})", [model, *part]
+            ).fetchall()
+        return rows
+
+    def _sync_maps(self):
+        self._vectors.flush()
+        self._gens.flush()
+        self._unsynced = 0
+
+    def _allocate(self, n: int) -> List[int]:
+        """Hand out ``n`` free rows, evicting LRU entries if needed."""
+        nxt = self._counter("next_slot")
+        fresh = list(range(nxt, min(self.capacity, nxt + n)))
+        if fresh:
+            self._db.execute("UPDATE counters SET value = ? WHERE name = 'next_slot'", (nxt + len(fresh),))
+        need = n - len(fresh)
+        if need <= 0:
+            return fresh
+        victims = self._db.execute(
+            "SELECT rowid, slot FROM entries ORDER BY last_used LIMIT ?", (need,)
+        ).fetchall()
+        self._db.executemany("DELETE FROM entries WHERE rowid = ?", [(r,) for r, _ in victims])
+        return fresh + [slot for _, slot in victims]
+
+    def _counter(self, name: str) -> int:
+        return self._db.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+    def _write_touches(self):
+        for name, n in self._pending.items():
+            if n:
+                self._db.execute("UPDATE counters SET value = value + ? WHERE name = ?", (n, name))
+                self._pending[name] = 0
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET last_used = ? WHERE model = ? AND key = ?",
+                [(t, model, key) for (model, key), t in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def flush(self):
+        """Persist buffered LRU timestamps, hit counters and written vectors."""
+        with self._lock:
+            if self._unsynced:
+                self._sync_maps()
+            if self._touched or any(self._pending.values()):
+                self._db.execute("BEGIN IMMEDIATE")
+                self._write_touches()
+                self._db.execute("COMMIT")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Hit statistics for this process and for all users of the cache."""
+        with self._lock:
+            self.flush()
+            hits, misses = self._counter("hits"), self._counter("misses")
+            local = self.hits + self.misses
+            total = hits + misses
+            return {
+                "entries": len(self),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / local if local else 0.0,
+                "shared_hits": hits,
+                "shared_misses": misses,
+                "shared_hit_rate": hits / total if total else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+
+class CachedEmbedder:
+    """Wrap an embedder so each unique text is embedded once per model."""
+
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.name = embedder.name
+        self.dim = embedder.dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        keys = [text_key(t) for t in texts]
+        found = self.cache.get_many(self.name, keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vecs = np.asarray(self.embedder(list(missing.values())), dtype=np.float32)
+            self.cache.put_many(self.name, list(missing), vecs)
+            found.update(zip(missing, vecs))
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            out[row] = found[key]
+        return out
@@ -0,0 +1,66 @@
+"""Text embedders used by ingestion and retrieval.
+
+An embedder is any callable ``embedder(texts) -> np.ndarray`` of shape
+``(len(texts), embedder.dim)`` with a ``name`` attribute identifying the model;
+stored vectors are only comparable between identical names.
+"""
+import re
+import zlib
+from typing import Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class HashingEmbedder:
+    """Dependency-free bag-of-words embedder using the hashing trick.
+
+    Fast and deterministic; meant for tests, benchmarks and offline use rather
+    than semantic quality.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = tokenize(text)
+            # unigrams plus bigrams so word order carries a little signal
+            for tok in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(tok.encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+class ChromaDefaultEmbedder:
+    """Chroma's bundled sentence embedding model (all-MiniLM-L6-v2, ONNX)."""
+
+    name = "all-MiniLM-L6-v2"
+    dim = 384
+
+    def __init__(self):
+        from chromadb.utils import embedding_functions
+
+        self._fn = embedding_functions.DefaultEmbeddingFunction()
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        return np.asarray(self._fn(list(texts)), dtype=np.float32)
+
+
+def get_embedder(name: str = "default"):
+    """Build an embedder by name: ``default`` or ``hashing[-DIM]``."""
+    if name == "default":
+        return ChromaDefaultEmbedder()
+    if name.startswith("hashing"):
+        _, _, dim = name.partition("-")
+        return HashingEmbedder(int(dim) if dim else 256)
+    raise ValueError(f"unknown embedder: {name}")
@@ -0,0 +1,43 @@
+"""Minimal HTTP/1.1 framing over asyncio streams (client and server side)."""
+import asyncio
+from typing import AsyncIterator, Dict
+
+
+async def read_headers(reader: asyncio.StreamReader):
+    """Read a status/request line and headers; return (first line, headers)."""
+    first = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return first, headers
+
+
+async def iter_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> AsyncIterator[bytes]:
+    """Yield a response body as it arrives (chunked, sized or until EOF)."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                await reader.readline()
+                return
+            data = await reader.readexactly(size)
+            await reader.readline()
+            yield data
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            data = await reader.read(min(remaining, 65536))
+            if not data:
+                raise ConnectionError("connection closed mid-body")
+            remaining -= len(data)
+            yield data
+    else:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            yield data
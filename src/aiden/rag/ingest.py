@@ -0,0 +1,244 @@
+"""Incremental ingestion of the document corpus into a vector store.
+
+Documents are streamed paragraph by paragraph and chunked; each chunk is
+identified by the hash of its text. A manifest next to the store records every
+ingested file (size, mtime and content hash) and chunk, so a re-run skips
+unchanged files without reading them and only embeds chunks it has never seen.
+Chunks whose files changed or disappeared are deleted from the store.
+Whenever the corpus changed, the BM25 index used for hybrid retrieval is
+rebuilt from the current chunks (no embedding involved).
+
+Usage:
+    python -m aiden.rag.ingest data/clean_docs.txt --persist-dir .rag
+"""
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .bm25 import BM25Index
+from .chunking import iter_chunks, iter_documents
+from .config import RagConfig, build_embedder, open_store
+from .manifest import Manifest, file_sha256
+from .prompt import count_tokens
+
+
+@dataclass
+class IngestStats:
+    files_seen: int = 0
+    files_skipped: int = 0
+    chunks_seen: int = 0
+    chunks_embedded: int = 0
+    chunks_deleted: int = 0
+    seconds: float = 0.0
+
+
+class Ingester:
+    def __init__(
+        self,
+        store,
+        embedder,
+        manifest_path,
+        batch_size: int = 64,
+        workers: int = 4,
+        chunk_chars: int = 800,
+        chunk_overlap: int = 100,
+        checkpoint_every: int = 32,
+        bm25_path=None,
+    ):
+        self.store = store
+        self.embedder = embedder
+        self.manifest_path = Path(manifest_path)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.chunk_chars = chunk_chars
+        self.chunk_overlap = chunk_overlap
+        # Batches between manifest checkpoints, so a crash loses little work
+        self.checkpoint_every = checkpoint_every
+        self.bm25_path = Path(bm25_path) if bm25_path else None
+        self.manifest = Manifest.load(self.manifest_path)
+
+    def run(self, paths) -> IngestStats:
+        """Bring the store in line with the documents under ``paths``.
+
+        ``paths`` is the whole corpus: files ingested earlier but no longer
+        found under ``paths`` are removed from the store.
+        """
+        start = time.perf_counter()
+        stats = IngestStats()
+        m = self.manifest
+        if m.embedder and m.embedder != self.embedder.name:
+            # vectors from another model are not comparable; start over
+            self.store.delete(list(m.chunks))
+            m = self.manifest = Manifest()
+        m.embedder = self.embedder.name
+
+        self._inflight = deque()
+        self._submitted = 0
+        self._completed = 0
+        # (last batch index the file depends on, path, entry) awaiting commit
+        self._open_files = deque()
+        seen_files = set()
+        queued = set()
+        batch = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for doc in iter_documents(paths):
+                key = str(doc)
+                seen_files.add(key)
+                stats.files_seen += 1
+                st = doc.stat()
+                if m.file_unchanged(doc, st):
+                    stats.files_skipped += 1
+                    continue
+                sha = file_sha256(doc)
+                entry = m.files.get(key)
+                if entry and entry["sha256"] == sha:
+                    # touched but identical
+                    entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                    stats.files_skipped += 1
+                    continue
+
+                ids = []
+                for chunk in iter_chunks(doc, self.chunk_chars, self.chunk_overlap):
+                    ids.append(chunk.id)
+                    stats.chunks_seen += 1
+                    if chunk.id in m.chunks or chunk.id in queued:
+                        continue
+                    queued.add(chunk.id)
+                    batch.append(chunk)
+                    if len(batch) >= self.batch_size:
+                        self._submit(pool, batch, stats)
+                        batch = []
+                entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha, "chunks": ids}
+                depends_on = self._submitted if batch else self._submitted - 1
+                self._open_files.append((depends_on, key, entry))
+                self._commit_files()
+            if batch:
+                self._submit(pool, batch, stats)
+            while self._inflight:
+                self._complete_oldest(stats)
+
+        # Drop files that left the corpus and chunks nobody references
+        removed = [k for k in m.files if k not in seen_files]
+        for key in removed:
+            del m.files[key]
+        referenced = set()
+        for entry in m.files.values():
+            referenced.update(entry["chunks"])
+        stale = [cid for cid in m.chunks if cid not in referenced]
+        if stale:
+            self.store.delete(stale)
+            for cid in stale:
+                del m.chunks[cid]
+        stats.chunks_deleted = len(stale)
+
+        self.store.flush()
+        m.save(self.manifest_path)
+        changed = stats.files_seen > stats.files_skipped or removed or stale
+        if self.bm25_path is not None and (changed or not self.bm25_path.exists()):
+            self.build_bm25()
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def build_bm25(self):
+        """Rebuild the BM25 index from the files recorded in the manifest."""
+
+        def chunks():
+            seen = set()
+            for key in self.manifest.files:
+                for chunk in iter_chunks(Path(key), self.chunk_chars, self.chunk_overlap):
+                    if chunk.id not in seen:
+                        seen.add(chunk.id)
+                        yield chunk.id, chunk.text, chunk.source
+
+        BM25Index.build(chunks()).save(self.bm25_path)
+
+    def _submit(self, pool, batch, stats):
+        # Bound memory: never hold more than a couple of batches per worker
+        while len(self._inflight) >= 2 * self.workers:
+            self._complete_oldest(stats)
+        texts = [c.text for c in batch]
+        self._inflight.append((batch, pool.submit(self.embedder, texts)))
+        self._submitted += 1
+
+    def _complete_oldest(self, stats):
+        batch, fut = self._inflight.popleft()
+        vectors = fut.result()
+        metadatas = [self._metadata(c) for c in batch]
+        self.store.upsert([c.id for c in batch], vectors, [c.text for c in batch], metadatas)
+        for c, meta in zip(batch, metadatas):
+            self.manifest.chunks[c.id] = {"source": c.source, "tokens": meta["tokens"]}
+        stats.chunks_embedded += len(batch)
+        self._completed += 1
+        self._commit_files()
+        if self._completed % self.checkpoint_every == 0:
+            # the manifest may only claim chunks the store has persisted;
+            # appends only, the final flush builds the index
+            self.store.flush(checkpoint=True)
+            self.manifest.save(self.manifest_path)
+
+    def _metadata(self, chunk):
+        # token counts ride along so prompt packing never re-tokenises
+        return {"source": chunk.source, "ordinal": chunk.ordinal, "tokens": count_tokens(chunk.text)}
+
+    def _commit_files(self):
+        """Record files whose chunks have all been written to the store."""
+        while self._open_files and self._open_files[0][0] < self._completed:
+            _, key, entry = self._open_files.popleft()
+            self.manifest.files[key] = entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest documents into the RAG store")
+    parser.add_argument("paths", nargs="+", help="files or directories to ingest")
+    parser.add_argument("--persist-dir", default=RagConfig.persist_dir)
+    parser.add_argument("--backend", default=RagConfig.backend, choices=["auto", "chroma", "numpy"])
+    parser.add_argument("--ivf-lists", type=int, default=RagConfig.ivf_lists)
+    parser.add_argument("--dtype", default=RagConfig.vector_dtype, choices=["float32", "float16", "int8"])
+    parser.add_argument("--rescore", type=int, default=RagConfig.rescore, help="exact re-scoring factor")
+    parser.add_argument("--collection", default=RagConfig.collection)
+    parser.add_argument("--embedder", default=RagConfig.embedder)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--cache-size", type=int, default=RagConfig.embedding_cache_size, help="embedding cache rows (0 = off)"
+    )
+    args = parser.parse_args(argv)
+
+    config = RagConfig(
+        persist_dir=args.persist_dir,
+        backend=args.backend,
+        ivf_lists=args.ivf_lists,
+        vector_dtype=args.dtype,
+        rescore=args.rescore,
+        collection=args.collection,
+        embedder=args.embedder,
+        embedding_cache_size=args.cache_size,
+    )
+    embedder = build_embedder(config)
+    ingester = Ingester(
+        open_store(config),
+        embedder,
+        config.manifest_path,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        chunk_chars=config.chunk_chars,
+        chunk_overlap=config.chunk_overlap,
+        bm25_path=config.bm25_path,
+    )
+    stats = ingester.run(args.paths)
+    print(
+        f"{stats.files_seen} files ({stats.files_skipped} unchanged), "
+        f"{stats.chunks_embedded} chunks embedded, {stats.chunks_deleted} removed "
+        f"in {stats.seconds:.2f}s"
+    )
+    if hasattr(embedder, "cache"):
+        print(f"embedding cache: {embedder.cache.stats()}")
+        embedder.cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Async client for an Ollama-compatible ``/api/generate`` endpoint.
+
+Talks HTTP/1.1 directly over asyncio streams so a generation never ties up a
+thread: tokens are yielded as the model produces them. Connections are kept
+alive and reused, at most ``max_concurrency`` generations run at once, and
+identical prompts in flight share one generation: late callers first replay
+the tokens produced so far, then follow the live stream.
+"""
+import asyncio
+import json
+from collections import deque
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from .httpio import iter_body, read_headers
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host; keeps at most ``size`` idle."""
+
+    def __init__(self, host: str, port: int, size: int = 8):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle = deque()
+        self.opened = 0
+
+    async def acquire(self):
+        """Return ``(reader, writer, reused)``."""
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, reader, writer, reusable: bool):
+        if reusable and len(self._idle) < self.size and not reader.at_eof():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class _Flight:
+    """One generation shared by every caller that asked for the same prompt."""
+
+    def __init__(self):
+        self.tokens = []
+        self.done = False
+        self.error = None
+        self.listeners = 0
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        i = 0
+        while True:
+            if i < len(self.tokens):
+                yield self.tokens[i]
+                i += 1
+            elif self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await self._changed.wait()
+
+
+class OllamaClient:
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        model: str = "llama3.2",
+        max_connections: int = 8,
+        max_concurrency: int = 4,
+        coalesce: bool = True,
+    ):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.model = model
+        self.pool = ConnectionPool(self.host, self.port, max_connections)
+        self.coalesce = coalesce
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._flights: Dict[tuple, _Flight] = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    async def stream(self, prompt: str, options: Optional[Dict] = None) -> AsyncIterator[str]:
+        """Yield response tokens for ``prompt`` as they are generated."""
+        if not self.coalesce:
+            async with self._slots:
+                async for token in self._generate(prompt, options):
+                    yield token
+            return
+        key = (prompt, json.dumps(options or {}, sort_keys=True))
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.ensure_future(self._run(key, flight, prompt, options))
+        else:
+            self.coalesced += 1
+        flight.listeners += 1
+        try:
+            async for token in flight.follow():
+                yield token
+        finally:
+            flight.listeners -= 1
+            if flight.listeners == 0 and not flight.done:
+                # everyone went away; stop paying for the generation
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    async def generate(self, prompt: str, options: Optional[Dict] = None) -> str:
+        return "".join([tok async for tok in self.stream(prompt, options)])
+
+    def close(self):
+        self.pool.close()
+
+    async def _run(self, key, flight: _Flight, prompt, options):
+        try:
+            async with self._slots:
+                async for token in self._generate(prompt, options):
+                    flight.tokens.append(token)
+                    flight.notify()
+        except asyncio.CancelledError:
+            flight.error = LLMError("generation cancelled")
+            raise
+        except Exception as exc:
+            flight.error = exc
+        finally:
+            flight.done = True
+            flight.notify()
+            self._forget(key, flight)
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _generate(self, prompt: str, options: Optional[Dict]) -> AsyncIterator[str]:
+        body = json.dumps(
+            {"model": self.model, "prompt": prompt, "stream": True, "options": options or {}}
+        ).encode("utf-8")
+        request = (
+            f"POST /api/generate HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1") + body
+        self.requests += 1
+        for _ in range(2):
+            try:
+                reader, writer, reused = await self.pool.acquire()
+            except OSError as exc:
+                # refused, unreachable or unresolvable: the model server is down
+                raise LLMError(f"cannot reach model server at {self.host}:{self.port}: {exc}") from exc
+            writer.write(request)
+            try:
+                await writer.drain()
+                status, headers = await read_headers(reader)
+            except OSError:
+                status, headers = "", {}
+            if status or not reused:
+                break
+            # the server dropped an idle keep-alive connection; retry on a fresh one
+            writer.close()
+        reusable = False
+        try:
+            if not status:
+                raise LLMError("model server closed the connection")
+            if status.split(" ")[1:2] != ["200"]:
+                detail = b""
+                if "content-length" in headers:
+                    detail = b"".join([d async for d in iter_body(reader, headers)])
+                raise LLMError(f"model server replied {status!r}: {detail.decode('utf-8', 'replace')}")
+            buf = b""
+            finished = False
+            async for data in iter_body(reader, headers):
+                buf += data
+                *lines, buf = buf.split(b"\n")
+                for line in lines:
+                    if not line.strip() or finished:
+                        continue
+                    msg = json.loads(line)
+                    if msg.get("error"):
+                        raise LLMError(msg["error"])
+                    if msg.get("response"):
+                        yield msg["response"]
+                    finished = bool(msg.get("done"))
+            # only a fully read, framed body leaves the connection usable
+            reusable = (
+                headers.get("connection", "").lower() != "close"
+                and ("content-length" in headers or "transfer-encoding" in headers)
+            )
+        finally:
+            self.pool.release(reader, writer, reusable)
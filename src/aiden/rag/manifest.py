@@ -0,0 +1,93 @@
+"""Content-hash manifest recording what has already been ingested."""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class Manifest:
+    embedder: str = ""
+    # path -> {"size", "mtime_ns", "sha256", "chunks": [ids]}
+    files: Dict[str, Dict] = field(default_factory=dict)
+    # chunk id -> {"source": path}
+    chunks: Dict[str, Dict] = field(default_factory=dict)
+    corpus_version: str = ""
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if data.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls(
+            embedder=data.get("embedder", ""),
+            files=data.get("files", {}),
+            chunks=data.get("chunks", {}),
+            corpus_version=data.get("corpus_version", ""),
+        )
+
+    def save(self, path: Path):
+        """Write atomically so a crash never leaves a truncated manifest."""
+        self.corpus_version = self.compute_version()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "embedder": self.embedder,
+                    "corpus_version": self.corpus_version,
+                    "files": self.files,
+                    "chunks": self.chunks,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, path)
+
+    def compute_version(self) -> str:
+        """Hash of the ingested chunk set; changes whenever the corpus does."""
+        h = hashlib.sha256(self.embedder.encode("utf-8"))
+        for cid in sorted(self.chunks):
+            h.update(cid.encode("ascii"))
+        return h.hexdigest()[:16]
+
+    def file_unchanged(self, path: Path, stat) -> bool:
+        entry = self.files.get(str(path))
+        return bool(entry) and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+
+class CorpusVersion:
+    """Callable returning the manifest's corpus version, re-read on change."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._mtime = None
+        self._version = ""
+
+    def __call__(self) -> str:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return ""
+        if mtime != self._mtime:
+            self._version = Manifest.load(self.path).corpus_version
+            self._mtime = mtime
+        return self._version
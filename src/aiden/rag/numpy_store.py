@@ -0,0 +1,474 @@
+"""Local vector store on plain NumPy files.
+
+Layout of the store directory:
+
+    vectors.npy   matrix of L2-normalised embeddings, opened as a mmap; float32,
+                  float16 or int8 (see ``dtype``)
+    scales.npy    per-row scale of int8 vectors (row ~= int8 row * scale)
+    vectors.f32.npy  float32 copy kept for exact re-scoring when ``rescore`` is
+                  set on a quantized store; only candidate rows are ever read
+    docs.json     ids, texts and metadata, row-aligned with vectors.npy
+    docs.tail.jsonl  rows appended by checkpoint flushes since docs.json was
+                  last written, one ``[id, text, metadata]`` per line
+    ivf.npz       optional coarse clustering: centroids plus rows grouped by list
+
+Opening a store only maps the matrix and parses docs.json, so start-up is far
+cheaper than bringing up a Chroma client. Search is a blocked matrix product
+with ``argpartition`` for the top-k; with IVF enabled only the rows of the
+``nprobe`` closest lists are scored.
+
+Quantized matrices are scored directly, block by block, so memory use and
+pages read at start-up shrink 2x (float16) or 4x (int8). With ``rescore=N``
+the top ``N * k`` candidates are re-scored against the float32 copy.
+
+Writes are buffered in memory and reach disk on ``flush()``; changing
+``dtype`` on an existing store re-encodes it at the next flush. A
+``flush(checkpoint=True)`` appends new rows to the files in place when it
+can and never clusters; rows the IVF does not cover yet are scored exactly
+until the next full flush rebuilds it.
+"""
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .store import Hit
+
+# Rows scored per matrix product; bounds temporary memory during search
+BLOCK_ROWS = 65536
+# Quantized rows widened to float32 at a time; small enough to stay in cache
+QUANT_BLOCK_ROWS = 512
+KMEANS_ITERATIONS = 12
+# Training rows per list (capped); more rarely improves the clustering
+KMEANS_ROWS_PER_LIST = 64
+KMEANS_SAMPLE = 100_000
+DTYPES = ("float32", "float16", "int8")
+# float16 -> float32 through a lookup table beats numpy's scalar cast loop
+_F16_TABLE = np.arange(65536, dtype=np.uint32).astype(np.uint16).view(np.float16).astype(np.float32)
+
+
+def normalize(mat: np.ndarray) -> np.ndarray:
+    mat = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    return np.divide(mat, norms, out=np.zeros_like(mat), where=norms > 0)
+
+
+def kmeans(data: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on (a sample of) the rows; returns unit centroids."""
+    rng = np.random.default_rng(seed)
+    sample = min(KMEANS_SAMPLE, KMEANS_ROWS_PER_LIST * n_lists)
+    if len(data) > sample:
+        data = data[np.sort(rng.choice(len(data), sample, replace=False))]
+    data = np.asarray(data, dtype=np.float32)
+    n_lists = min(n_lists, len(data))
+    centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        counts = np.bincount(assign, minlength=n_lists)
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        # reduceat over rows grouped by list is much faster than np.add.at
+        sums[~empty] = np.add.reduceat(data[order], starts[~empty], axis=0)
+        # re-seed empty lists with random rows
+        sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+def quantize(mat: np.ndarray, dtype: str):
+    """Encode unit vectors as ``dtype``; returns (matrix, per-row scales or None)."""
+    if dtype == "float32":
+        return np.asarray(mat, dtype=np.float32), None
+    if dtype == "float16":
+        return np.asarray(mat, dtype=np.float16), None
+    if dtype == "int8":
+        scales = np.abs(mat).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(mat / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    raise ValueError(f"unknown vector dtype: {dtype}")
+
+
+def top_k(scores: np.ndarray, k: int):
+    """Indices of the k largest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class NumpyStore:
+    def __init__(self, path, ivf_lists: int = 0, nprobe: int = 8, dtype: str = "float32", rescore: int = 0):
+        if dtype not in DTYPES:
+            raise ValueError(f"unknown vector dtype: {dtype}")
+        self.path = Path(path)
+        self.ivf_lists = ivf_lists
+        self.nprobe = nprobe
+        self.dtype = dtype
+        # candidates per hit re-scored exactly; only used when quantized
+        self.rescore = rescore if dtype != "float32" else 0
+        self._ids: List[str] = []
+        self._docs: List[str] = []
+        self._metas: List[Dict] = []
+        self._vectors = None
+        self._scales = None
+        self._exact = None
+        self._ivf = None
+        # rows of docs.tail.jsonl, folded into docs.json by a full flush
+        self._tail_rows = 0
+        self._load()
+        self._row_of = {cid: i for i, cid in enumerate(self._ids)}
+        self._dead = set()
+        self._new: Dict[str, tuple] = {}
+
+    # --- persistence ---
+    def _load(self):
+        docs_file = self.path / "docs.json"
+        if not docs_file.exists():
+            return
+        with open(docs_file, encoding="utf-8") as f:
+            data = json.load(f)
+        self._ids, self._docs, self._metas = data["ids"], data["documents"], data["metadatas"]
+        tail_file = self.path / "docs.tail.jsonl"
+        if tail_file.exists():
+            good = 0
+            with open(tail_file, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError
+                        cid, doc, meta = json.loads(line)
+                    except ValueError:
+                        break  # torn last line of an interrupted checkpoint
+                    good += len(line)
+                    self._ids.append(cid)
+                    self._docs.append(doc)
+                    self._metas.append(meta)
+                    self._tail_rows += 1
+            if good != tail_file.stat().st_size:
+                os.truncate(tail_file, good)
+        if self._ids:
+            self._map_vectors()
+        ivf_file = self.path / "ivf.npz"
+        if self.ivf_lists and ivf_file.exists():
+            with np.load(ivf_file) as z:
+                ivf = (z["centroids"], z["order"], z["offsets"])
+            if ivf[2][-1] <= len(self._ids):
+                self._ivf = ivf
+
+    def _map_vectors(self):
+        # an interrupted checkpoint may have appended rows docs never got
+        n = len(self._ids)
+        self._vectors = np.load(self.path / "vectors.npy", mmap_mode="r")[:n]
+        self._scales = None
+        self._exact = None
+        if self._vectors.dtype == np.int8:
+            self._scales = np.load(self.path / "scales.npy")[:n]
+        exact_file = self.path / "vectors.f32.npy"
+        if exact_file.exists():
+            # also lets a dtype change re-encode from full precision
+            self._exact = np.load(exact_file, mmap_mode="r")[:n]
+
+    def _needs_encoding(self) -> bool:
+        if self._vectors is None:
+            return False
+        wants_exact = bool(self.rescore) and not (self.path / "vectors.f32.npy").exists()
+        return self._vectors.dtype != np.dtype(self.dtype) or wants_exact
+
+    def _float_rows(self, rows) -> np.ndarray:
+        """Rows as float32, from the exact copy when there is one."""
+        if self._exact is not None:
+            return np.asarray(self._exact[rows], dtype=np.float32)
+        out = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self._scales is not None:
+            out *= self._scales[rows, None]
+        return out
+
+    def _save_array(self, name: str, arr: np.ndarray):
+        tmp = self.path / (name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, self.path / name)
+
+    def _append_array(self, name: str, arr: np.ndarray, rows: int) -> bool:
+        """Write ``arr`` after the first ``rows`` rows of a saved array, in
+        place; False (and nothing written) when the file cannot take it."""
+        fmt = np.lib.format
+        with open(self.path / name, "r+b") as f:
+            version = fmt.read_magic(f)
+            if version == (1, 0):
+                read, write = fmt.read_array_header_1_0, fmt.write_array_header_1_0
+            elif version == (2, 0):
+                read, write = fmt.read_array_header_2_0, fmt.write_array_header_2_0
+            else:
+                return False
+            shape, fortran_order, dtype = read(f)
+            if fortran_order or dtype != arr.dtype or shape[1:] != arr.shape[1:] or shape[0] < rows:
+                return False
+            offset = f.tell()
+            # numpy pads headers so the row count can grow without moving the data
+            header = io.BytesIO()
+            write(header, {"descr": fmt.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows + len(arr),) + shape[1:]})
+            if header.tell() != offset:
+                return False
+            f.seek(offset + rows * arr[:1].nbytes)
+            f.write(np.ascontiguousarray(arr).tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(header.getvalue())
+        return True
+
+    def _can_append(self) -> bool:
+        return (
+            self._vectors is not None
+            and not self._dead
+            and not self._needs_encoding()
+            # an exact copy left from a re-scoring store is dropped by a rewrite
+            and (self._exact is not None) == bool(self.rescore)
+        )
+
+    def flush(self, checkpoint: bool = False):
+        """Write buffered writes and deletes to the on-disk files.
+
+        A ``checkpoint`` flush appends new rows in place when nothing was
+        deleted and leaves the IVF as it is; a full flush also folds
+        docs.tail.jsonl into docs.json and (re)builds a stale IVF.
+        """
+        if self._new and self._can_append():
+            self._append()
+        elif self._new or self._dead or self._needs_encoding():
+            self._rewrite()
+        if checkpoint:
+            return
+        n = len(self._ids)
+        ivf_file = self.path / "ivf.npz"
+        if self.ivf_lists and n >= self.ivf_lists:
+            if self._ivf is None or self._ivf[2][-1] != n or len(self._ivf[0]) != self.ivf_lists:
+                self._ivf = self._build_ivf(self._float_rows(slice(None)))
+                tmp = self.path / "ivf.tmp.npz"
+                np.savez(tmp, centroids=self._ivf[0], order=self._ivf[1], offsets=self._ivf[2])
+                os.replace(tmp, ivf_file)
+        elif self.ivf_lists:
+            self._ivf = None
+            if ivf_file.exists():
+                ivf_file.unlink()
+        if self._tail_rows:
+            self._save_docs()
+
+    def _append(self):
+        """Add the buffered rows to the end of the files."""
+        vectors = np.stack([v for v, _, _ in self._new.values()])
+        rows = len(self._ids)
+        # only the new rows are encoded; stored rows keep their bytes
+        encoded, scales = quantize(vectors, self.dtype)
+        self._vectors = self._scales = self._exact = None
+        parts = [("vectors.npy", encoded), ("scales.npy", scales), ("vectors.f32.npy", vectors if self.rescore else None)]
+        for name, arr in parts:
+            if arr is not None and not self._append_array(name, arr, rows):
+                # files appended so far hold rows docs do not list; a rewrite drops them
+                self._map_vectors()
+                self._rewrite()
+                return
+        # docs last: rows it does not list yet are ignored when the store opens
+        with open(self.path / "docs.tail.jsonl", "a", encoding="utf-8") as f:
+            for cid, (_, doc, meta) in self._new.items():
+                f.write(json.dumps([cid, doc, meta], separators=(",", ":")) + "\n")
+        for cid, (_, doc, meta) in self._new.items():
+            self._row_of[cid] = len(self._ids)
+            self._ids.append(cid)
+            self._docs.append(doc)
+            self._metas.append(meta)
+        self._tail_rows += len(self._new)
+        self._new = {}
+        self._map_vectors()
+
+    def _rewrite(self):
+        """Compact buffered writes and deletes into freshly written files."""
+        keep = [i for i in range(len(self._ids)) if i not in self._dead]
+        ids = [self._ids[i] for i in keep] + list(self._new)
+        docs = [self._docs[i] for i in keep] + [d for _, d, _ in self._new.values()]
+        metas = [self._metas[i] for i in keep] + [m for _, _, m in self._new.values()]
+        parts = []
+        if self._vectors is not None and keep:
+            parts.append(self._float_rows(keep))
+        if self._new:
+            parts.append(np.stack([v for v, _, _ in self._new.values()]))
+        vectors = np.concatenate(parts) if parts else None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # release the old mappings before replacing the files
+        self._vectors = self._scales = self._exact = None
+        # row numbers change, so the clustering no longer applies
+        self._ivf = None
+        ivf_file = self.path / "ivf.npz"
+        if ivf_file.exists():
+            ivf_file.unlink()
+        if vectors is not None:
+            encoded, scales = quantize(vectors, self.dtype)
+            self._save_array("vectors.npy", encoded)
+            for name, arr in (("scales.npy", scales), ("vectors.f32.npy", vectors if self.rescore else None)):
+                if arr is not None:
+                    self._save_array(name, arr)
+                elif (self.path / name).exists():
+                    (self.path / name).unlink()
+        self._ids, self._docs, self._metas = ids, docs, metas
+        self._save_docs()
+
+        self._row_of = {cid: i for i, cid in enumerate(ids)}
+        self._dead = set()
+        self._new = {}
+        if ids:
+            self._map_vectors()
+
+    def _save_docs(self):
+        tmp = self.path / "docs.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"ids": self._ids, "documents": self._docs, "metadatas": self._metas}, f, separators=(",", ":"))
+        os.replace(tmp, self.path / "docs.json")
+        tail_file = self.path / "docs.tail.jsonl"
+        if tail_file.exists():
+            tail_file.unlink()
+        self._tail_rows = 0
+
+    def _build_ivf(self, vectors: np.ndarray):
+        centroids = kmeans(vectors, self.ivf_lists)
+        assign = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), BLOCK_ROWS):
+            block = vectors[start:start + BLOCK_ROWS]
+            assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=len(centroids)), out=offsets[1:])
+        return centroids, order, offsets
+
+    # --- store interface ---
+    def ids(self) -> List[str]:
+        """Ids on disk as of the last flush, in row order."""
+        return list(self._ids)
+
+    def embeddings(self, ids: Sequence[str]) -> np.ndarray:
+        """Unit vectors of ``ids`` as of the last flush, as float32 (from the
+        exact copy when there is one)."""
+        return self._float_rows([self._row_of[cid] for cid in ids])
+
+    def upsert(self, ids: Sequence[str], embeddings, documents: Sequence[str], metadatas: Sequence[Dict]):
+        vectors = normalize(embeddings)
+        for cid, vec, doc, meta in zip(ids, vectors, documents, metadatas):
+            row = self._row_of.get(cid)
+            if row is not None:
+                self._dead.add(row)
+            self._new[cid] = (vec, doc, dict(meta))
+
+    def delete(self, ids: Sequence[str]):
+        for cid in ids:
+            self._new.pop(cid, None)
+            row = self._row_of.get(cid)
+            if row is not None:
+                self._dead.add(row)
+
+    def count(self) -> int:
+        return len(self._ids) - len(self._dead) + len(self._new)
+
+    def query(self, embeddings, k: int) -> List[List[Hit]]:
+        queries = normalize(np.atleast_2d(embeddings))
+        n = len(self._ids)
+        rescore = bool(self.rescore) and self._exact is not None
+        fetch = k * self.rescore if rescore else k
+        if self._vectors is None or n == 0:
+            rows = np.empty((len(queries), 0), dtype=np.int64)
+            scores = np.empty((len(queries), 0), dtype=np.float32)
+        elif self._ivf is not None:
+            rows, scores = self._search_ivf(queries, fetch)
+        else:
+            rows, scores = self._search_exact(queries, fetch)
+        if rescore and rows.size:
+            scores = self._rescore(queries, rows, scores)
+        if self._new:
+            # buffered writes are scored directly and merged in
+            new_ids = list(self._new)
+            new_mat = np.stack([v for v, _, _ in self._new.values()])
+            new_scores = queries @ new_mat.T
+            new_top = top_k(new_scores, k)
+        out = []
+        for i in range(len(queries)):
+            hits = [
+                Hit(self._ids[row], self._docs[row], float(score), self._metas[row])
+                for row, score in zip(rows[i], scores[i])
+                if row not in self._dead and np.isfinite(score)
+            ]
+            if self._new:
+                for j in new_top[i]:
+                    _, doc, meta = self._new[new_ids[j]]
+                    hits.append(Hit(new_ids[j], doc, float(new_scores[i, j]), meta))
+            hits.sort(key=lambda h: h.score, reverse=True)
+            out.append(hits[:k])
+        return out
+
+    def _scores(self, queries: np.ndarray, rows) -> np.ndarray:
+        """Scores of stored rows (a slice or index array), straight from the
+        stored encoding: quantized blocks are widened one block at a time."""
+        stored = self._vectors[rows]
+        if stored.dtype == np.float32:
+            return queries @ np.asarray(stored).T
+        scores = np.empty((len(queries), len(stored)), dtype=np.float32)
+        buf = np.empty((min(QUANT_BLOCK_ROWS, len(stored)), stored.shape[1]), dtype=np.float32)
+        for start in range(0, len(stored), QUANT_BLOCK_ROWS):
+            part = stored[start:start + QUANT_BLOCK_ROWS]
+            block = buf[:len(part)]
+            if part.dtype == np.float16:
+                np.take(_F16_TABLE, part.view(np.uint16), out=block)
+            else:
+                block[...] = part
+            scores[:, start:start + len(part)] = queries @ block.T
+        if self._scales is not None:
+            scores *= self._scales[rows]
+        return scores
+
+    def _rescore(self, queries, rows, scores):
+        exact = np.einsum("qd,qkd->qk", queries, np.asarray(self._exact[rows], dtype=np.float32))
+        # keep the -inf padding of ragged IVF results
+        return np.where(np.isfinite(scores), exact, scores).astype(np.float32)
+
+    def _search_exact(self, queries, k):
+        # over-fetch by the number of tombstones so deleted rows cannot crowd out hits
+        want = k + len(self._dead)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self._ids), BLOCK_ROWS):
+            scores = self._scores(queries, slice(start, start + BLOCK_ROWS))
+            idx = top_k(scores, want)
+            best_rows = np.concatenate([best_rows, idx + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, idx, axis=1)], axis=1)
+            keep = top_k(best_scores, want)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        return best_rows, best_scores
+
+    def _search_ivf(self, queries, k):
+        centroids, order, offsets = self._ivf
+        probes = top_k(queries @ centroids.T, self.nprobe)
+        want = k + len(self._dead)
+        all_rows, all_scores = [], []
+        # rows appended since the clustering are always scored
+        unlisted = np.arange(offsets[-1], len(self._ids), dtype=np.int64)
+        for q, lists in zip(queries, probes):
+            rows = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in lists] + [unlisted])
+            rows.sort()  # sequential access into the mapped matrix
+            scores = self._scores(q[None, :], rows)[0]
+            idx = top_k(scores[None, :], want)[0]
+            all_rows.append(rows[idx])
+            all_scores.append(scores[idx])
+        width = max((len(r) for r in all_rows), default=0)
+        # pad ragged results; -inf entries are dropped in query()
+        rows = np.zeros((len(queries), width), dtype=np.int64)
+        scores = np.full((len(queries), width), -np.inf, dtype=np.float32)
+        for i, (r, s) in enumerate(zip(all_rows, all_scores)):
+            rows[i, :len(r)] = r
+            scores[i, :len(s)] = s
+        return rows, scores
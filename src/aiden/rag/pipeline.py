@@ -0,0 +1,75 @@
+import asyncio
+from typing import AsyncIterator, List
+
+from .prompt import PromptBuilder
+from .store import Hit
+
+
+class ChatPipeline:
+    """Retrieve context for a question and stream the model's answer.
+
+    With a ``ResponseCache`` repeated questions skip generation entirely:
+    exact repeats skip even the query embedding, near-duplicates are matched
+    by that embedding before retrieval. ``corpus_version`` is a callable whose
+    value change invalidates the cache. Prompts are packed by ``prompt_builder``
+    within its token budget. With ``embed_batcher`` (a ``MicroBatcher`` over
+    ``retriever.embed``) concurrent requests share embedding calls.
+    """
+
+    def __init__(
+        self,
+        retriever,
+        llm,
+        top_k: int = 4,
+        cache=None,
+        corpus_version=None,
+        prompt_builder=None,
+        embed_batcher=None,
+    ):
+        self.retriever = retriever
+        self.llm = llm
+        self.top_k = top_k
+        self.cache = cache
+        self.corpus_version = corpus_version
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.embed_batcher = embed_batcher
+
+    async def embed(self, question: str):
+        if self.embed_batcher is not None:
+            return await self.embed_batcher.submit(question)
+        # embedding and search are CPU work; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(None, self.retriever.embed, [question])
+        return vectors[0]
+
+    async def retrieve(self, vector, question: str) -> List[Hit]:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, self.retriever.search_vectors, [vector], self.top_k, [question]
+        )
+        return results[0] if results else []
+
+    async def stream(self, question: str) -> AsyncIterator[str]:
+        cache = self.cache
+        if cache is not None:
+            if self.corpus_version is not None:
+                cache.set_corpus_version(self.corpus_version())
+            answer = cache.get(question)
+            if answer is not None:
+                yield answer
+                return
+        vector = await self.embed(question)
+        if cache is not None:
+            answer = cache.get(question, vector)
+            if answer is not None:
+                yield answer
+                return
+        hits = await self.retrieve(vector, question)
+        prompt = self.prompt_builder.build(question, hits)
+        tokens = []
+        async for token in self.llm.stream(prompt.text, prompt.options):
+            tokens.append(token)
+            yield token
+        # only complete answers are cached; an abandoned stream never gets here
+        if cache is not None:
+            cache.put(question, "".join(tokens), vector)
@@ -0,0 +1,101 @@
+"""Prompt assembly under a token budget.
+
+Retrieved chunks are packed most relevant first, duplicates dropped, until
+the prompt budget is used up, and the answer length is capped with the
+model's ``num_predict`` option; prompt size and generation time are then
+bounded whatever retrieval returns.
+
+Token counts are estimates (see ``count_tokens``) and are stored in chunk
+metadata at ingest time, so packing a prompt does not re-tokenise chunks.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from .store import Hit
+
+PROMPT_TEMPLATE = """Context:
+{context}
+
+Question: {question}
+Answer based only on the context above."""
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+# Subword tokenizers split long words; roughly one token per 4 characters
+CHARS_PER_TOKEN = 4
+# Memoised counts for chunks whose metadata carries none (e.g. old stores)
+TOKEN_MEMO_SIZE = 4096
+
+
+def count_tokens(text: str) -> int:
+    """Conservative estimate of the model's token count for ``text``."""
+    n = 0
+    for piece in _PIECE_RE.findall(text):
+        n += (len(piece) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return n
+
+
+@dataclass
+class Prompt:
+    text: str
+    tokens: int
+    hits: List[Hit] = field(default_factory=list)
+    dropped: int = 0
+    options: Dict = field(default_factory=dict)
+
+
+class PromptBuilder:
+    def __init__(self, max_prompt_tokens: int = 1536, max_answer_tokens: int = 256, template: str = PROMPT_TEMPLATE):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.max_answer_tokens = max_answer_tokens
+        self.template = template
+        self._overhead = count_tokens(template.format(context="", question=""))
+        self._memo: Dict[str, int] = {}
+
+    def chunk_tokens(self, hit: Hit) -> int:
+        tokens = (hit.metadata or {}).get("tokens")
+        if tokens is not None:
+            return int(tokens)
+        tokens = self._memo.get(hit.id)
+        if tokens is None:
+            if len(self._memo) >= TOKEN_MEMO_SIZE:
+                self._memo.clear()
+            tokens = self._memo[hit.id] = count_tokens(hit.text)
+        return tokens
+
+    def build(self, question: str, hits: Sequence[Hit]) -> Prompt:
+        budget = self.max_prompt_tokens - self._overhead - count_tokens(question)
+        chosen, used, dropped = [], 0, 0
+        seen = set()
+        for hit in sorted(hits, key=lambda h: h.score, reverse=True):
+            key = " ".join(hit.text.split()).lower()
+            if hit.id in seen or key in seen:
+                dropped += 1
+                continue
+            seen.update((hit.id, key))
+            # one newline joins each chunk to the next
+            cost = self.chunk_tokens(hit) + 1
+            if used + cost > budget:
+                # a smaller, less relevant chunk may still fit
+                dropped += 1
+                continue
+            chosen.append(hit)
+            used += cost
+        if not chosen and hits and budget > 0:
+            # nothing fits whole: keep the head of the best chunk
+            best = max(hits, key=lambda h: h.score)
+            chosen = [Hit(best.id, _truncate(best.text, budget), best.score, best.metadata)]
+            used = count_tokens(chosen[0].text)
+            dropped = len(hits) - 1
+        text = self.template.format(context="\n".join(h.text for h in chosen), question=question)
+        options = {"num_predict": self.max_answer_tokens} if self.max_answer_tokens > 0 else {}
+        return Prompt(text, self._overhead + count_tokens(question) + used, chosen, dropped, options)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    used = 0
+    for m in _PIECE_RE.finditer(text):
+        used += (len(m.group()) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        if used > max_tokens:
+            return text[: m.start()].rstrip()
+    return text
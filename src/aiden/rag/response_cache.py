@@ -0,0 +1,136 @@
+"""Answer cache in front of retrieval and generation.
+
+Lookups try an exact match on the normalised question first, then the most
+similar cached question by embedding (cosine similarity above a threshold).
+Entries expire after ``ttl`` seconds, the least recently used entry is evicted
+when the cache is full, and everything is dropped when the ingested corpus
+version changes.
+"""
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    return _SPACE_RE.sub(" ", text.strip().lower()).rstrip("?!. ")
+
+
+@dataclass
+class _Entry:
+    answer: str
+    created: float
+    slot: int
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        similarity: float = 0.92,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # row per slot; unused rows stay zero so they never pass the threshold
+        self._vectors = None
+        self._slot_keys = [None] * max_entries
+        self._free = list(range(max_entries - 1, -1, -1))
+        self.corpus_version = None
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def set_corpus_version(self, version):
+        """Drop every answer when the corpus they were built from changes."""
+        if version != self.corpus_version:
+            self.clear()
+            self.corpus_version = version
+
+    def clear(self):
+        self._entries.clear()
+        self._slot_keys = [None] * self.max_entries
+        self._free = list(range(self.max_entries - 1, -1, -1))
+        if self._vectors is not None:
+            self._vectors[:] = 0.0
+
+    def get(self, question: str, vector=None) -> Optional[str]:
+        """Cached answer for the question, or ``None``.
+
+        Without ``vector`` only the exact lookup runs, which is the cheap check
+        to make before paying for a query embedding.
+        """
+        key = normalize_question(question)
+        entry = self._live(key)
+        if entry is not None:
+            self.exact_hits += 1
+            return entry.answer
+        if vector is None:
+            return None
+        if self._vectors is not None and self._entries:
+            q = np.asarray(vector, dtype=np.float32)
+            q = q / (np.linalg.norm(q) or 1.0)
+            scores = self._vectors @ q
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity:
+                entry = self._live(self._slot_keys[best])
+                if entry is not None:
+                    self.semantic_hits += 1
+                    return entry.answer
+        self.misses += 1
+        return None
+
+    def put(self, question: str, answer: str, vector=None):
+        key = normalize_question(question)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._release(key, old)
+        while len(self._entries) >= self.max_entries:
+            self._release(*self._entries.popitem(last=False))
+        slot = self._free.pop()
+        self._slot_keys[slot] = key
+        if vector is not None:
+            v = np.asarray(vector, dtype=np.float32)
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, v.shape[-1]), dtype=np.float32)
+            self._vectors[slot] = v / (np.linalg.norm(v) or 1.0)
+        self._entries[key] = _Entry(answer, self._clock(), slot)
+
+    def _live(self, key) -> Optional[_Entry]:
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None:
+            return None
+        if self._clock() - entry.created > self.ttl:
+            del self._entries[key]
+            self._release(key, entry)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _release(self, key, entry: _Entry):
+        self._slot_keys[entry.slot] = None
+        if self._vectors is not None:
+            self._vectors[entry.slot] = 0.0
+        self._free.append(entry.slot)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .bm25 import BM25Index
+from .store import Hit
+
+# Rank offset in reciprocal rank fusion; 60 is the usual choice
+RRF_K = 60
+
+
+class Retriever:
+    """Embed queries and look them up in a vector store."""
+
+    def __init__(self, store, embedder):
+        self.store = store
+        self.embedder = embedder
+
+    def embed(self, queries: Sequence[str]):
+        return self.embedder(list(queries))
+
+    def search_vectors(self, vectors, k: int = 4, queries: Optional[Sequence[str]] = None) -> List[List[Hit]]:
+        return self.store.query(vectors, k)
+
+    def search(self, queries: Sequence[str], k: int = 4) -> List[List[Hit]]:
+        if not queries:
+            return []
+        return self.search_vectors(self.embed(queries), k, queries)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hit]], k: int, rrf_k: int = RRF_K) -> List[Hit]:
+    """Merge ranked hit lists; a hit scores ``sum(1 / (rrf_k + rank))``."""
+    fused = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, 1):
+            score = 1.0 / (rrf_k + rank)
+            if hit.id in fused:
+                fused[hit.id].score += score
+            else:
+                fused[hit.id] = Hit(hit.id, hit.text, score, hit.metadata)
+    return sorted(fused.values(), key=lambda h: h.score, reverse=True)[:k]
+
+
+class HybridRetriever(Retriever):
+    """Vector search fused with the prebuilt BM25 index.
+
+    Each side contributes its top ``depth`` hits (``2 * k`` by default). The
+    index is reloaded when ingestion replaces the file; without one, results
+    are plain vector hits.
+    """
+
+    def __init__(self, store, embedder, bm25_path, depth: Optional[int] = None, rrf_k: int = RRF_K):
+        super().__init__(store, embedder)
+        self.bm25_path = Path(bm25_path)
+        self.depth = depth
+        self.rrf_k = rrf_k
+        self._index = None
+        self._mtime = None
+
+    @property
+    def index(self) -> Optional[BM25Index]:
+        try:
+            mtime = os.stat(self.bm25_path).st_mtime_ns
+        except FileNotFoundError:
+            self._index = self._mtime = None
+            return None
+        if mtime != self._mtime:
+            self._index = BM25Index.load(self.bm25_path)
+            self._mtime = mtime
+        return self._index
+
+    def search_vectors(self, vectors, k: int = 4, queries: Optional[Sequence[str]] = None) -> List[List[Hit]]:
+        index = self.index
+        if index is None or queries is None:
+            return self.store.query(vectors, k)
+        depth = self.depth or 2 * k
+        dense = self.store.query(vectors, depth)
+        sparse = index.search(queries, depth)
+        return [reciprocal_rank_fusion([d, s], k, self.rrf_k) for d, s in zip(dense, sparse)]
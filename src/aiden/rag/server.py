@@ -0,0 +1,215 @@
+"""Streaming chat backend for templates/index.html.
+
+Runs on a single asyncio event loop, so an open chat stream costs a coroutine
+rather than a worker thread (a WSGI app such as Flask would hold one thread
+per streaming response). ``POST /chat`` answers with Server-Sent Events:
+
+    data: {"token": "..."}      one per generated token
+    event: done                 end of the answer
+    event: error                generation failed
+
+Send ``{"message": ..., "stream": false}`` for a single JSON reply instead;
+a failed generation then answers 500 with ``{"error": ...}``.
+``GET /metrics`` returns embedding batch and cache statistics as JSON.
+
+Usage:
+    python -m aiden.rag.server --persist-dir .rag --model llama3.2
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from .batching import MicroBatcher
+from .config import RagConfig, build_embedder, open_store
+from .httpio import read_headers
+from .llm import OllamaClient
+from .manifest import CorpusVersion
+from .pipeline import ChatPipeline
+from .prompt import PromptBuilder
+from .response_cache import ResponseCache
+from .retrieval import HybridRetriever, Retriever
+
+DEFAULT_TEMPLATE = Path(__file__).resolve().parents[3] / "templates" / "index.html"
+MAX_BODY = 64 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def sse(data, event=None) -> bytes:
+    head = f"event: {event}\n" if event else ""
+    return (head + "data: " + json.dumps(data) + "\n\n").encode("utf-8")
+
+
+class ChatServer:
+    def __init__(self, pipeline, template_path=DEFAULT_TEMPLATE):
+        self.pipeline = pipeline
+        self.template_path = Path(template_path)
+        self.active_streams = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 5000):
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line, headers = await read_headers(reader)
+            method, path, _ = (line.split(" ") + ["", ""])[:3]
+            path = path.split("?", 1)[0]
+            if path in ("/", "/index.html"):
+                if method != "GET":
+                    await self._reply(writer, 405, b"", "text/plain")
+                    return
+                page = self.template_path.read_bytes()
+                await self._reply(writer, 200, page, "text/html; charset=utf-8")
+            elif path == "/metrics" and method == "GET":
+                await self._json(writer, 200, self.metrics())
+            elif path == "/chat":
+                if method != "POST":
+                    await self._reply(writer, 405, b"", "text/plain")
+                    return
+                await self._chat(reader, writer, headers)
+            else:
+                await self._reply(writer, 404, b"not found", "text/plain")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def metrics(self):
+        """Counters for load testing: open streams, batching and cache stats."""
+        out = {"active_streams": self.active_streams}
+        for name, attr in (("embed_batcher", "embed_batcher"), ("response_cache", "cache")):
+            component = getattr(self.pipeline, attr, None)
+            if component is not None:
+                out[name] = component.stats()
+        return out
+
+    async def _chat(self, reader, writer, headers):
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._json(writer, 400, {"error": "bad content-length"})
+            return
+        if length > MAX_BODY:
+            await self._json(writer, 413, {"error": "request too large"})
+            return
+        try:
+            request = json.loads(await reader.readexactly(length) or b"{}")
+            message = str(request.get("message", "")).strip()
+        except (ValueError, AttributeError):
+            message = ""
+            request = {}
+        if not message:
+            await self._json(writer, 400, {"error": "missing message"})
+            return
+
+        if not request.get("stream", True):
+            try:
+                tokens = [t async for t in self.pipeline.stream(message)]
+            except Exception as exc:
+                # the pipeline or model failed; the client is still waiting
+                await self._json(writer, 500, {"error": str(exc)})
+                return
+            await self._json(writer, 200, {"response": "".join(tokens)})
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nX-Accel-Buffering: no\r\nConnection: close\r\n\r\n"
+        )
+        self.active_streams += 1
+        stream = self.pipeline.stream(message)
+        try:
+            while True:
+                try:
+                    token = await anext(stream)
+                except StopAsyncIteration:
+                    writer.write(sse({}, event="done"))
+                    break
+                except Exception as exc:
+                    # generation failed, not the client: tell it so
+                    writer.write(sse({"error": str(exc)}, event="error"))
+                    break
+                writer.write(sse({"token": token}))
+                # backpressure from slow clients; raises if the client left
+                await writer.drain()
+        finally:
+            self.active_streams -= 1
+            await stream.aclose()
+        await writer.drain()
+
+    async def _json(self, writer, status, payload):
+        await self._reply(writer, status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    async def _reply(self, writer, status, body: bytes, content_type: str):
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+
+def build_pipeline(config: RagConfig, llm) -> ChatPipeline:
+    if config.hybrid:
+        retriever = HybridRetriever(open_store(config), build_embedder(config), config.bm25_path)
+    else:
+        retriever = Retriever(open_store(config), build_embedder(config))
+    cache = None
+    if config.response_cache_size > 0:
+        cache = ResponseCache(
+            config.response_cache_size, config.response_cache_ttl, config.response_cache_similarity
+        )
+    return ChatPipeline(
+        retriever,
+        llm,
+        top_k=config.top_k,
+        cache=cache,
+        corpus_version=CorpusVersion(config.manifest_path),
+        prompt_builder=PromptBuilder(config.max_prompt_tokens, config.max_answer_tokens),
+        embed_batcher=MicroBatcher(retriever.embed, config.embed_batch_size, config.embed_batch_wait_ms),
+    )
+
+
+async def serve(server: ChatServer, host: str, port: int):
+    srv = await server.start(host, port)
+    addrs = ", ".join(str(s.getsockname()) for s in srv.sockets)
+    print(f"chat server listening on {addrs}")
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming RAG chat server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--persist-dir", default=RagConfig.persist_dir)
+    parser.add_argument("--backend", default=RagConfig.backend, choices=["auto", "chroma", "numpy"])
+    parser.add_argument("--embedder", default=RagConfig.embedder)
+    parser.add_argument("--ollama-url", default="http://localhost:11434")
+    parser.add_argument("--model", default="llama3.2")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="generations run at once")
+    parser.add_argument("--template", default=str(DEFAULT_TEMPLATE))
+    args = parser.parse_args(argv)
+
+    config = RagConfig(persist_dir=args.persist_dir, backend=args.backend, embedder=args.embedder)
+    pipeline = build_pipeline(config, OllamaClient(args.ollama_url, args.model, max_concurrency=args.max_concurrency))
+    try:
+        asyncio.run(serve(ChatServer(pipeline, args.template), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
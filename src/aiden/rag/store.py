@@ -0,0 +1,58 @@
+"""Vector stores holding the embedded corpus.
+
+Every store exposes the same small interface used by ingestion and retrieval:
+``upsert``, ``delete``, ``flush``, ``query`` and ``count``.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+@dataclass
+class Hit:
+    id: str
+    text: str
+    score: float
+    metadata: Dict = field(default_factory=dict)
+
+
+class ChromaStore:
+    """Persistent ChromaDB collection using cosine distance."""
+
+    def __init__(self, persist_dir: str, collection: str = "docs"):
+        import chromadb
+
+        self._client = chromadb.PersistentClient(path=str(persist_dir))
+        self._col = self._client.get_or_create_collection(
+            collection, metadata={"hnsw:space": "cosine"}, embedding_function=None
+        )
+
+    def upsert(self, ids: Sequence[str], embeddings, documents: Sequence[str], metadatas: Sequence[Dict]):
+        self._col.upsert(
+            ids=list(ids),
+            embeddings=np.asarray(embeddings, dtype=np.float32).tolist(),
+            documents=list(documents),
+            metadatas=list(metadatas),
+        )
+
+    def delete(self, ids: Sequence[str]):
+        if ids:
+            self._col.delete(ids=list(ids))
+
+    def flush(self, checkpoint: bool = False):
+        """Chroma persists every write itself."""
+
+    def count(self) -> int:
+        return self._col.count()
+
+    def query(self, embeddings, k: int) -> List[List[Hit]]:
+        res = self._col.query(
+            query_embeddings=np.asarray(embeddings, dtype=np.float32).tolist(),
+            n_results=k,
+            include=["documents", "metadatas", "distances"],
+        )
+        out = []
+        for ids, docs, metas, dists in zip(res["ids"], res["documents"], res["metadatas"], res["distances"]):
+            out.append([Hit(i, d, 1.0 - dist, m or {}) for i, d, m, dist in zip(ids, docs, metas, dists)])
+        return out
@@ -0,0 +1,148 @@
+"""Stand-in for an Ollama server, for tests and benchmarks.
+
+Speaks just enough of ``POST /api/generate`` (chunked NDJSON streaming or a
+single JSON reply) with HTTP/1.1 keep-alive, and counts requests, connections
+and concurrent generations so callers can check pooling and coalescing.
+
+Usage:
+    python -m aiden.rag.stub_llm --port 11434 --token-delay 0.02
+"""
+import argparse
+import asyncio
+import json
+
+from .httpio import read_headers
+
+DEFAULT_REPLY = "The Elder has no real model behind him, but he answers all the same."
+
+
+def split_tokens(text: str):
+    """Split text into word tokens that join back to the original."""
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + [words[-1]]
+
+
+class StubModelServer:
+    def __init__(self, reply=DEFAULT_REPLY, token_delay: float = 0.0):
+        # ``reply`` is a string or a callable taking the prompt
+        self.reply = reply
+        self.token_delay = token_delay
+        self.requests = 0
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self.prompts = []
+        self._server = None
+        self._handlers = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 11434):
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def stop(self):
+        """Stop listening and drop open keep-alive connections."""
+        if self._server is not None:
+            self._server.close()
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    def answer(self, prompt: str) -> str:
+        return self.reply(prompt) if callable(self.reply) else self.reply
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while True:
+                line, headers = await read_headers(reader)
+                if not line:
+                    return
+                body = await reader.readexactly(int(headers.get("content-length", "0") or 0))
+                if not line.startswith("POST /api/generate"):
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    await writer.drain()
+                    continue
+                await self._generate(writer, json.loads(body or b"{}"))
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _generate(self, writer, request):
+        prompt = request.get("prompt", "")
+        self.requests += 1
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            try:
+                tokens = split_tokens(self.answer(prompt))
+            except Exception as exc:
+                payload = json.dumps({"error": str(exc)}).encode()
+                writer.write(
+                    b"HTTP/1.1 500 Internal Server Error\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                return
+            limit = (request.get("options") or {}).get("num_predict")
+            if limit is not None and limit >= 0:
+                tokens = tokens[:limit]
+            if not request.get("stream", True):
+                for _ in tokens:
+                    await asyncio.sleep(self.token_delay)
+                payload = json.dumps({"response": "".join(tokens), "done": True}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                return
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n"
+            )
+            for tok in tokens:
+                await asyncio.sleep(self.token_delay)
+                self._chunk(writer, {"response": tok, "done": False})
+                await writer.drain()
+            self._chunk(writer, {"response": "", "done": True})
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            self.active -= 1
+
+    @staticmethod
+    def _chunk(writer, msg):
+        data = json.dumps(msg).encode() + b"\n"
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+async def serve(server: StubModelServer, host: str, port: int):
+    srv = await server.start(host, port)
+    print(f"stub model server listening on {host}:{srv.sockets[0].getsockname()[1]}")
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub Ollama-compatible model server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds per generated token")
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(StubModelServer(args.reply, args.token_delay), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""One-command performance report from benchmark output and telemetry logs.
+
+Inputs (any combination):
+
+    --bench       ``python -m aiden.bench_render`` JSON
+    --baseline    an earlier bench_render JSON to compare against
+    --telemetry   a ``--telemetry`` event log (rotated files are read too)
+    --baseline-telemetry  an earlier session's event log
+
+Writes ``summary.md`` and ``summary.json`` into ``--out`` plus, when
+matplotlib is installed, these plots (seaborn styles them when present):
+
+    bench_frame_times.png   frame-time distribution per zombie count (and baseline)
+    bench_percentiles.png   p50/p95/p99 per zombie count against the baseline
+    session_frame_times.png per-tick p50/p95/max frame time over the session
+    session_load.png        live zombies against the tick's p95 frame time
+    session_rates.png       spawns, kills and player deaths per minute
+
+Metrics more than ``--threshold`` percent slower than the baseline are
+flagged; ``--fail-on-regression`` turns them into exit status 1.
+
+    python -m aiden.report --bench render.json --baseline base.json --telemetry logs/events.jsonl --out report
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .telemetry import read_events
+
+THRESHOLD = 10.0  # percent slower than baseline counted as a regression
+COMPARED = ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+RATE_BUCKET = 60.0  # game seconds per bar in the rates plot
+RATE_EVENTS = ("spawn", "kill", "player_death")
+
+
+def load_bench(path) -> Dict:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("meta", {}).get("benchmark") != "render":
+        raise ValueError(f"{path}: not a bench_render result")
+    return data
+
+
+# --- benchmarks ---
+def bench_summary(bench: Dict) -> List[Dict]:
+    rows = []
+    for run in bench["runs"]:
+        rows.append({
+            "zombies": run["zombies"],
+            **{k: run["frame"].get(k) for k in COMPARED + ("max_ms",)},
+            "fps_mean": run.get("fps_mean"),
+            "draw_calls": run["draw_calls"]["mean"],
+            "nodes": run["scene"]["nodes"],
+        })
+    return rows
+
+
+def _by_zombies(bench: Dict) -> Dict[int, Dict]:
+    return {r["zombies"]: r for r in bench_summary(bench)}
+
+
+def compare(current: Dict[int, Dict], baseline: Dict[int, Dict], threshold: float = THRESHOLD,
+            metrics=COMPARED, key: str = "zombies") -> List[Dict]:
+    """Per matching row and metric: baseline, current, change in percent.
+
+    ``current`` and ``baseline`` map a row key (zombie count) to its metrics.
+    """
+    out = []
+    for k in sorted(current.keys() & baseline.keys()):
+        for metric in metrics:
+            base, cur = baseline[k].get(metric), current[k].get(metric)
+            if not base or cur is None:
+                continue
+            delta = (cur - base) / base * 100.0
+            out.append({
+                key: k,
+                "metric": metric,
+                "baseline": base,
+                "current": cur,
+                "delta_pct": round(delta, 2),
+                "regression": delta > threshold,
+            })
+    return out
+
+
+# --- telemetry ---
+def session_summary(events: List[Dict]) -> Dict:
+    counts = Counter(e["ev"] for e in events)
+    times = [e["gt"] for e in events if "gt" in e]
+    minutes = (max(times) - min(times)) / 60.0 if len(times) > 1 else 0.0
+    ticks = [e for e in events if e["ev"] == "tick"]
+    summary = {
+        "events": dict(counts),
+        "game_minutes": round(minutes, 2),
+        "per_minute": {ev: round(counts[ev] / minutes, 2) if minutes else None for ev in RATE_EVENTS},
+        "ticks": len(ticks),
+    }
+    if ticks:
+        p95 = np.array([t["frame_p95_ms"] for t in ticks if t.get("frames")], dtype=np.float64)
+        if p95.size:
+            summary["tick_frame_p95_ms"] = {
+                "median": round(float(np.median(p95)), 2),
+                "p95": round(float(np.percentile(p95, 95)), 2),
+                "worst": round(float(max(t["frame_max_ms"] for t in ticks)), 2),
+            }
+        zombies = [t["zombies"] for t in ticks]
+        summary["zombies"] = {"mean": round(float(np.mean(zombies)), 1), "max": int(max(zombies))}
+        quality = Counter(t.get("quality") for t in ticks)
+        summary["quality_ticks"] = dict(quality)
+    return summary
+
+
+def session_metrics(summary: Dict) -> Dict:
+    """The session numbers compared against a baseline session."""
+    frame = summary.get("tick_frame_p95_ms", {})
+    return {"tick_p95_median_ms": frame.get("median"), "tick_p95_p95_ms": frame.get("p95")}
+
+
+# --- plots ---
+def _pyplot():
+    """``matplotlib.pyplot`` on the Agg backend, or None; styles with seaborn if present."""
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    try:
+        import seaborn as sns
+
+        sns.set_theme(style="whitegrid")
+    except ImportError:
+        pass
+    return plt
+
+
+def plot_bench(plt, bench: Dict, baseline: Optional[Dict], out: Path) -> List[str]:
+    written = []
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    for run in bench["runs"]:
+        ax.hist(run["frame_ms"], bins=50, histtype="step", label=f"{run['zombies']} zombies")
+    for run in (baseline or {}).get("runs", []):
+        ax.hist(run["frame_ms"], bins=50, histtype="step", linestyle="--", label=f"{run['zombies']} (baseline)")
+    ax.set_xlabel("frame time (ms)")
+    ax.set_ylabel("frames")
+    ax.set_title("Frame-time distribution")
+    ax.legend()
+    written.append(_save(plt, fig, out / "bench_frame_times.png"))
+
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    for label, data, style in (("current", bench, "-"), ("baseline", baseline, "--")):
+        if data is None:
+            continue
+        rows = sorted(bench_summary(data), key=lambda r: r["zombies"])
+        xs = [r["zombies"] for r in rows]
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            ax.plot(xs, [r[metric] for r in rows], style, marker="o", label=f"{metric[:-3]} {label}")
+    ax.set_xlabel("zombies")
+    ax.set_ylabel("frame time (ms)")
+    ax.set_title("Frame-time percentiles by load")
+    ax.legend()
+    written.append(_save(plt, fig, out / "bench_percentiles.png"))
+    return written
+
+
+def plot_session(plt, events: List[Dict], out: Path) -> List[str]:
+    ticks = [e for e in events if e["ev"] == "tick" and e.get("frames")]
+    written = []
+    if ticks:
+        gt = [t["gt"] for t in ticks]
+        fig, ax = plt.subplots(figsize=(9, 4.5))
+        for field, label in (("frame_p50_ms", "p50"), ("frame_p95_ms", "p95"), ("frame_max_ms", "max")):
+            ax.plot(gt, [t[field] for t in ticks], label=label, linewidth=1)
+        ax.set_xlabel("game time (s)")
+        ax.set_ylabel("frame time (ms)")
+        ax.set_title("Frame time per tick")
+        ax.legend()
+        written.append(_save(plt, fig, out / "session_frame_times.png"))
+
+        fig, ax = plt.subplots(figsize=(6, 4.5))
+        zombies = np.array([t["zombies"] for t in ticks], dtype=np.float64)
+        p95 = np.array([t["frame_p95_ms"] for t in ticks], dtype=np.float64)
+        ax.scatter(zombies, p95, s=8, alpha=0.6)
+        if np.ptp(zombies) > 0:
+            slope, intercept = np.polyfit(zombies, p95, 1)
+            xs = np.array([zombies.min(), zombies.max()])
+            ax.plot(xs, slope * xs + intercept, color="black", linewidth=1,
+                    label=f"{slope:.3f} ms per zombie")
+            ax.legend()
+        ax.set_xlabel("live zombies")
+        ax.set_ylabel("tick p95 frame time (ms)")
+        ax.set_title("Load against frame time")
+        written.append(_save(plt, fig, out / "session_load.png"))
+
+    timed = [e for e in events if e["ev"] in RATE_EVENTS and "gt" in e]
+    if timed:
+        end = max(e["gt"] for e in timed)
+        edges = np.arange(0.0, end + RATE_BUCKET, RATE_BUCKET)
+        fig, ax = plt.subplots(figsize=(9, 4.5))
+        width = RATE_BUCKET / (len(RATE_EVENTS) + 1)
+        for i, ev in enumerate(RATE_EVENTS):
+            counts, _ = np.histogram([e["gt"] for e in timed if e["ev"] == ev], bins=edges)
+            ax.bar(edges[:-1] + i * width, counts * (60.0 / RATE_BUCKET), width=width, align="edge", label=ev)
+        ax.set_xlabel("game time (s)")
+        ax.set_ylabel("per minute")
+        ax.set_title("Spawn, kill and death rates")
+        ax.legend()
+        written.append(_save(plt, fig, out / "session_rates.png"))
+    return written
+
+
+def _save(plt, fig, path: Path) -> str:
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path.name
+
+
+# --- report ---
+def build_report(out_dir, bench=None, baseline=None, events=None, baseline_events=None,
+                 threshold: float = THRESHOLD, plots: bool = True) -> Dict:
+    """Summarize, compare and plot whatever inputs are given; returns the summary."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    report = {"threshold_pct": threshold, "plots": [], "regressions": []}
+    if bench is not None:
+        report["bench"] = {"meta": bench["meta"], "runs": bench_summary(bench)}
+        if baseline is not None:
+            report["bench"]["baseline_meta"] = baseline["meta"]
+            report["bench"]["comparison"] = compare(_by_zombies(bench), _by_zombies(baseline), threshold)
+            report["regressions"] += [c for c in report["bench"]["comparison"] if c["regression"]]
+    if events is not None:
+        report["session"] = session_summary(events)
+        if baseline_events is not None:
+            base = session_summary(baseline_events)
+            report["session"]["baseline"] = base
+            report["session"]["comparison"] = compare(
+                {"session": session_metrics(report["session"])},
+                {"session": session_metrics(base)},
+                threshold,
+                metrics=("tick_p95_median_ms", "tick_p95_p95_ms"),
+                key="run",
+            )
+            report["regressions"] += [c for c in report["session"]["comparison"] if c["regression"]]
+
+    plt = _pyplot() if plots else None
+    if plt is not None:
+        if bench is not None:
+            report["plots"] += plot_bench(plt, bench, baseline, out)
+        if events:
+            report["plots"] += plot_session(plt, events, out)
+    elif plots:
+        report["note"] = "matplotlib is not installed: no plots"
+
+    (out / "summary.json").write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    (out / "summary.md").write_text(render_markdown(report), encoding="utf-8")
+    return report
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    return f"{v:.3f}" if isinstance(v, float) else str(v)
+
+
+def render_markdown(report: Dict) -> str:
+    lines = ["# Performance report", ""]
+    bench = report.get("bench")
+    if bench:
+        meta = bench["meta"]
+        lines += [
+            f"## Render benchmark ({meta.get('commit') or 'unknown commit'}, {meta.get('timestamp', '')})",
+            "",
+            "| zombies | mean ms | p50 ms | p95 ms | p99 ms | max ms | fps | draw calls | nodes |",
+            "|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+        ]
+        for r in bench["runs"]:
+            lines.append("| " + " | ".join(_fmt(r[k]) for k in (
+                "zombies", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "fps_mean", "draw_calls", "nodes")) + " |")
+        lines.append("")
+        if "comparison" in bench:
+            base = bench["baseline_meta"]
+            lines += [f"Against baseline {base.get('commit') or 'unknown commit'} ({base.get('timestamp', '')}):", ""]
+            lines += _comparison_table(bench["comparison"], "zombies")
+    session = report.get("session")
+    if session:
+        lines += ["## Session", "", f"- game time: {session['game_minutes']} min, {session['ticks']} ticks"]
+        for ev, rate in session["per_minute"].items():
+            lines.append(f"- {ev}: {session['events'].get(ev, 0)} ({_fmt(rate)} per minute)")
+        if "tick_frame_p95_ms" in session:
+            f = session["tick_frame_p95_ms"]
+            lines.append(f"- tick p95 frame time: median {f['median']} ms, p95 {f['p95']} ms, worst frame {f['worst']} ms")
+        if "zombies" in session:
+            lines.append(f"- live zombies: mean {session['zombies']['mean']}, max {session['zombies']['max']}")
+        if session.get("quality_ticks"):
+            lines.append("- ticks per quality level: " + ", ".join(f"{k} {v}" for k, v in session["quality_ticks"].items()))
+        lines.append("")
+        if "comparison" in session:
+            lines += ["Against the baseline session:", ""]
+            lines += _comparison_table(session["comparison"], "run")
+    if report["regressions"]:
+        lines += [f"**{len(report['regressions'])} metric(s) regressed by more than {report['threshold_pct']}%.**", ""]
+    if report["plots"]:
+        lines += ["## Plots", ""] + [f"![{p}]({p})" for p in report["plots"]] + [""]
+    if report.get("note"):
+        lines += [report["note"], ""]
+    return "\n".join(lines)
+
+
+def _comparison_table(rows: List[Dict], key: str) -> List[str]:
+    lines = [f"| {key} | metric | baseline | current | change |", "|---|---|---:|---:|---:|"]
+    for c in rows:
+        flag = " regression" if c["regression"] else ""
+        lines.append(f"| {c[key]} | {c['metric']} | {_fmt(c['baseline'])} | {_fmt(c['current'])} | {c['delta_pct']:+.1f}%{flag} |")
+    return lines + [""]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plot and summarize benchmark and telemetry results")
+    parser.add_argument("--bench", help="bench_render JSON")
+    parser.add_argument("--baseline", help="bench_render JSON to compare against")
+    parser.add_argument("--telemetry", help="telemetry event log")
+    parser.add_argument("--baseline-telemetry", help="telemetry event log to compare against")
+    parser.add_argument("--out", default="report", help="output directory")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="percent slower that counts as a regression")
+    parser.add_argument("--no-plots", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.bench and not args.telemetry:
+        parser.error("give --bench and/or --telemetry")
+
+    report = build_report(
+        args.out,
+        bench=load_bench(args.bench) if args.bench else None,
+        baseline=load_bench(args.baseline) if args.baseline else None,
+        events=list(read_events(args.telemetry)) if args.telemetry else None,
+        baseline_events=list(read_events(args.baseline_telemetry)) if args.baseline_telemetry else None,
+        threshold=args.threshold,
+        plots=not args.no_plots,
+    )
+    print((Path(args.out) / "summary.md").read_text(encoding="utf-8"))
+    return 1 if args.fail_on_regression and report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,16 +10,25 @@ from panda3d.core import (
 from .utils import make_colored_triangle
 
 
-def _attach_flat_ground_plane(root: NodePath):
-    """Attach an invisible collision plane at z=0 for grounding fallback (mask bit 2)."""
-    cnode = CollisionNode("ground-plane")
+def _attach_flat_ground_plane(root: NodePath, collision=None):
+    """Attach an invisible collision plane at z=0 for grounding fallback (mask bit 2).
+
+    With a ``CollisionLayers`` the plane goes on its ground layer instead of
+    under ``root``, so the grounding ray never walks the environment model.
+    """
     plane = CollisionPlane(Plane(Vec3(0, 0, 1), Point3(0, 0, 0)))
+    if collision is not None:
+        from .collision import GROUND
+
+        collision.add_solid(GROUND, plane, node_name="ground-plane")
+        return
+    cnode = CollisionNode("ground-plane")
     cnode.addSolid(plane)
     cnode.setIntoCollideMask(BitMask32.bit(2))
     root.attachNewNode(cnode)
 
 
-def load_environment(loader) -> NodePath:
+def load_environment(loader, collision=None) -> NodePath:
     """Load the world; try Panda3D's sample environment or a fallback."""
     try:
         env = loader.loadModel("models/environment")
@@ -27,7 +36,7 @@ def load_environment(loader) -> NodePath:
         env.setScale(0.25)
         env.setPos(-8, 42, 0)
         # Add a flat ground collision plane as a fallback surface
-        _attach_flat_ground_plane(env)
+        _attach_flat_ground_plane(env, collision)
         return env
     except Exception:
         # Fallback: just a flat node with triangles as landmarks
@@ -38,5 +47,5 @@ def load_environment(loader) -> NodePath:
             tri.setPos((i % 5) * 3, 10 + i * 2, 0)
             tri.reparentTo(root)
         # Ground plane for fallback as well
-        _attach_flat_ground_plane(root)
+        _attach_flat_ground_plane(root, collision)
         return root
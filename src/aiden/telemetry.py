@@ -0,0 +1,165 @@
+"""Structured gameplay event log written off the frame loop.
+
+``Telemetry.emit(kind, **fields)`` only timestamps the event and puts a
+tuple on a ``queue.SimpleQueue``; it never formats, locks a file or waits.
+A background writer drains the queue in batches, serializes each event as
+one compact JSON line and appends the batch with a single write. Files
+rotate by size like ``logging.handlers.RotatingFileHandler``
+(``events.jsonl`` -> ``events.jsonl.1`` -> ... ``events.jsonl.<keep>``).
+
+Each line is ``{"t": <unix time>, "ev": <kind>, ...fields}``; the game adds
+``gt`` (game time) to everything it emits. Read a log back with
+``read_events(path)``.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+ROTATE_BYTES = 8 * 1024 * 1024
+KEEP = 5
+BATCH = 4096
+FLUSH_INTERVAL = 0.5  # seconds the writer waits for more events before writing
+
+_STOP = object()
+
+
+class Telemetry:
+    def __init__(
+        self,
+        path,
+        rotate_bytes: int = ROTATE_BYTES,
+        keep: int = KEEP,
+        batch: int = BATCH,
+        flush_interval: float = FLUSH_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rotate_bytes = rotate_bytes
+        self.keep = keep
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        # counters; written by the writer thread except ``emitted``
+        self.emitted = 0
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+        # events that will never reach the file (unserializable or lost to an I/O error)
+        self.dropped = 0
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, kind: str, **fields):
+        """Queue one event; safe from any thread, never blocks."""
+        if self._closed:
+            return
+        self.emitted += 1
+        self._queue.put((self._clock(), kind, fields))
+
+    def close(self, timeout: float = 5.0):
+        """Write everything queued so far and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "emitted": self.emitted,
+            "written": self.written,
+            "pending": self.emitted - self.written - self.dropped,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
+
+    # --- writer thread ---
+    def _run(self):
+        q = self._queue
+        stopping = False
+        while not stopping:
+            try:
+                item = q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            events = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                events.append(item)
+                if len(events) >= self.batch:
+                    break
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            if events:
+                self._write(events)
+        self._file.close()
+
+    def _write(self, events):
+        lines = []
+        for t, kind, fields in events:
+            record = {"t": round(t, 6), "ev": kind}
+            record.update(fields)
+            try:
+                lines.append(json.dumps(record, separators=(",", ":"), default=str))
+            except (TypeError, ValueError):
+                self.errors += 1
+                self.dropped += 1
+        data = ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+        try:
+            if self._size and self._size + len(data) > self.rotate_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+        except (OSError, ValueError):
+            # ValueError: the file was left closed by a failed rotation
+            self.errors += 1
+            self.dropped += len(lines)
+            return
+        self.written += len(lines)
+        self.batches += 1
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.keep - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.keep > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = open(self.path, "ab")
+        self._size = 0
+        self.rotations += 1
+
+
+def read_events(path) -> Iterator[dict]:
+    """Events of a log and its rotated files, oldest first."""
+    path = Path(path)
+    rotated = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    for p in rotated + ([path] if path.exists() else []):
+        with open(p, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,115 @@
+"""Game-time timers on a binary heap.
+
+``TimerScheduler`` keeps its own simulation clock, advanced once per frame by
+the frame's ``dt`` times ``time_scale`` (nothing while paused). Timers sit in
+a heap ordered by due time, so a tick only looks at the earliest deadline:
+timers that are not due cost nothing per frame however many are waiting.
+Cancelled timers are dropped lazily when they reach the top of the heap.
+A repeating timer fires at most once per ``advance``: after a long frame the
+intervals it missed are skipped, not replayed back to back.
+"""
+import heapq
+import itertools
+from typing import Callable, Optional
+
+
+class Timer:
+    __slots__ = ("due", "callback", "args", "interval", "name", "cancelled")
+
+    def __init__(self, due: float, callback: Callable, args, interval: Optional[float], name: str):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.name = name
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+
+class TimerScheduler:
+    def __init__(self, time_scale: float = 1.0):
+        self.now = 0.0
+        self.time_scale = time_scale
+        self.paused = False
+        self._heap = []
+        self._seq = itertools.count()
+        self.fired = 0
+
+    def call_later(self, delay: float, callback: Callable, *args, name: str = "") -> Timer:
+        """Run ``callback(*args)`` after ``delay`` seconds of game time."""
+        return self._push(Timer(self.now + max(0.0, delay), callback, args, None, name))
+
+    def call_every(self, interval: float, callback: Callable, *args, name: str = "", first: Optional[float] = None) -> Timer:
+        """Run ``callback(*args)`` every ``interval`` seconds until cancelled.
+
+        The first call comes after ``first`` seconds (default ``interval``).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        delay = interval if first is None else max(0.0, first)
+        return self._push(Timer(self.now + delay, callback, args, interval, name))
+
+    def _push(self, timer: Timer) -> Timer:
+        heapq.heappush(self._heap, (timer.due, next(self._seq), timer))
+        return timer
+
+    def advance(self, dt: float) -> float:
+        """Move game time forward and run every timer that came due.
+
+        Returns the scaled game-time step (0 while paused) so callers can
+        drive movement with the same clock.
+        """
+        if self.paused:
+            return 0.0
+        step = dt * self.time_scale
+        self.now += step
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                # reschedule before the call so the callback may cancel it;
+                # next due time after now, on the timer's original phase
+                missed = (self.now - timer.due) // timer.interval
+                timer.due += (missed + 1) * timer.interval
+                self._push(timer)
+            else:
+                timer.cancelled = True
+            self.fired += 1
+            timer.callback(*timer.args)
+        return step
+
+    def next_due(self) -> Optional[float]:
+        """Game time of the earliest live timer, or ``None``."""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return sum(1 for _, _, t in self._heap if not t.cancelled)
+
+
+class Cooldown:
+    """Rate limit measured on a scheduler's game clock."""
+
+    def __init__(self, timers: TimerScheduler, duration: float):
+        self.timers = timers
+        self.duration = duration
+        self.ready_at = float("-inf")
+
+    def ready(self) -> bool:
+        return self.timers.now >= self.ready_at
+
+    def trigger(self) -> bool:
+        """Start the cooldown if it has elapsed; False while still cooling down."""
+        if not self.ready():
+            return False
+        self.ready_at = self.timers.now + self.duration
+        return True
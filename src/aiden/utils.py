@@ -25,3 +25,30 @@ def make_colored_triangle(name: str = "tri", color=(1, 0, 0, 1)) -> NodePath:
     node = GeomNode(name)
     node.addGeom(geom)
     return NodePath(node)
+
+
+def make_ground_quad(name: str, x0: float, y0: float, size: float, z: float = 0.0,
+                     color=(0.3, 0.45, 0.25, 1)) -> NodePath:
+    """Create a flat square of ground from (x0, y0) to (x0 + size, y0 + size)."""
+    format = GeomVertexFormat.getV3c4()
+    vdata = GeomVertexData(name, format, Geom.UHStatic)
+
+    vwriter = GeomVertexWriter(vdata, "vertex")
+    cwriter = GeomVertexWriter(vdata, "color")
+
+    # counter-clockwise seen from above, so the face points up
+    verts = [(x0, y0, z), (x0 + size, y0, z), (x0 + size, y0 + size, z), (x0, y0 + size, z)]
+    for v in verts:
+        vwriter.addData3(*v)
+        cwriter.addData4(*color)
+
+    tris = GeomTriangles(Geom.UHStatic)
+    tris.addVertices(0, 1, 2)
+    tris.addVertices(0, 2, 3)
+
+    geom = Geom(vdata)
+    geom.addPrimitive(tris)
+
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return NodePath(node)
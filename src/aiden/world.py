@@ -0,0 +1,334 @@
+"""Chunked world format and a streamer that keeps only nearby chunks loaded.
+
+A world directory holds ``world.json`` and one JSON file per chunk::
+
+    world.json          {"chunk_size": 32.0, "chunks": [[cx, cy], ...]}
+    chunk_<cx>_<cy>.json
+        {"ground_z": 0.0, "ground_color": [r, g, b, a],
+         "models": [{"path": "models/misc/rgbCube", "pos": [x, y, z],
+                     "hpr": [h, p, r], "scale": [sx, sy, sz], "color": [r, g, b, a]}],
+         "items": [{"id": "shard1", "name": "Shard 1", "description": "...",
+                    "model": "models/misc/rgbCube", "pos": [x, y, z],
+                    "scale": 0.7, "color": [r, g, b, a]}],
+         "spawn_zones": [{"pos": [x, y], "radius": 6.0}]}
+
+Chunk (cx, cy) covers ``[cx * size, (cx + 1) * size)`` on x and likewise on
+y; all positions are world coordinates.
+
+``ChunkStreamer`` reads chunk files and loads their models on a background
+thread into detached NodePaths, together with a ground quad covering the
+chunk at ``ground_z``. The main thread only attaches finished chunks
+(a few per frame), registers their ground and items, and drops chunks that
+fell out of range. Chunks load within ``load_radius`` of the player and unload
+only beyond the larger ``unload_radius``, so walking along a border does not
+load and unload the same chunk every frame.
+
+Generate a sample world with:
+    python -m aiden.world out/world --chunks 8 --seed 1
+"""
+import argparse
+import json
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from panda3d.core import CollisionPolygon, NodePath, Point3
+
+from .collision import GROUND
+from .utils import make_ground_quad
+
+WORLD_FILE = "world.json"
+CHUNK_SIZE = 32.0
+LOAD_RADIUS = 48.0
+UNLOAD_RADIUS = 72.0
+# Chunks attached per frame; attaching is cheap but not free
+ATTACH_PER_FRAME = 2
+# Ground colour of chunks whose file does not set one
+GROUND_COLOR = (0.3, 0.45, 0.25, 1)
+
+
+def chunk_file(cx: int, cy: int) -> str:
+    return f"chunk_{cx}_{cy}.json"
+
+
+class WorldIndex:
+    """``world.json``: chunk size and which chunks exist."""
+
+    def __init__(self, path, chunk_size: float, chunks):
+        self.path = Path(path)
+        self.chunk_size = float(chunk_size)
+        self.chunks = {tuple(c) for c in chunks}
+
+    @classmethod
+    def load(cls, path) -> "WorldIndex":
+        path = Path(path)
+        data = json.loads((path / WORLD_FILE).read_text(encoding="utf-8"))
+        return cls(path, data.get("chunk_size", CHUNK_SIZE), data.get("chunks", []))
+
+    def chunk_of(self, x: float, y: float):
+        return (math.floor(x / self.chunk_size), math.floor(y / self.chunk_size))
+
+    def distance(self, key, x: float, y: float) -> float:
+        """Distance from (x, y) to the nearest point of chunk ``key``."""
+        s = self.chunk_size
+        x0, y0 = key[0] * s, key[1] * s
+        dx = max(x0 - x, 0.0, x - (x0 + s))
+        dy = max(y0 - y, 0.0, y - (y0 + s))
+        return math.hypot(dx, dy)
+
+    def near(self, x: float, y: float, radius: float):
+        """Existing chunks whose area comes within ``radius`` of (x, y)."""
+        reach = int(math.ceil(radius / self.chunk_size))
+        cx, cy = self.chunk_of(x, y)
+        out = []
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                if (i, j) in self.chunks and self.distance((i, j), x, y) <= radius:
+                    out.append((i, j))
+        return out
+
+
+def _apply_transform(np: NodePath, spec: dict):
+    np.setPos(*spec.get("pos", (0, 0, 0)))
+    if "hpr" in spec:
+        np.setHpr(*spec["hpr"])
+    scale = spec.get("scale")
+    if isinstance(scale, (int, float)):
+        np.setScale(scale)
+    elif scale:
+        np.setScale(*scale)
+    if "color" in spec:
+        np.setColorScale(*spec["color"])
+
+
+class Chunk:
+    """One chunk: built off-thread, attached and detached on the main thread."""
+
+    def __init__(self, key, data: dict, root: NodePath, item_models):
+        self.key = key
+        self.ground_z = data.get("ground_z")
+        self.spawn_zones = [dict(z) for z in data.get("spawn_zones", [])]
+        self.root = root
+        # (spec, detached model) until attached; then (spec, game object)
+        self.items = item_models
+        self.attached = False
+
+
+def build_chunk(index: WorldIndex, key, load_model) -> Chunk:
+    """Read a chunk file and load its models under a detached root.
+
+    Runs on the loader thread: nothing here may touch the live scene graph.
+    """
+    data = json.loads((index.path / chunk_file(*key)).read_text(encoding="utf-8"))
+    root = NodePath(f"chunk-{key[0]}-{key[1]}")
+    if data.get("ground_z") is not None:
+        s = index.chunk_size
+        ground = make_ground_quad(f"ground-{key[0]}-{key[1]}", key[0] * s, key[1] * s, s, data["ground_z"],
+                                  data.get("ground_color", GROUND_COLOR))
+        ground.reparentTo(root)
+    for spec in data.get("models", []):
+        model = load_model(spec["path"])
+        _apply_transform(model, spec)
+        model.reparentTo(root)
+    items = []
+    for spec in data.get("items", []):
+        model = load_model(spec.get("model", "models/misc/rgbCube"))
+        _apply_transform(model, spec)
+        items.append((spec, model))
+    return Chunk(key, data, root, items)
+
+
+class ChunkStreamer:
+    def __init__(
+        self,
+        index: WorldIndex,
+        parent: NodePath,
+        load_model,
+        collision=None,
+        on_item_load=None,
+        on_item_unload=None,
+        load_radius: float = LOAD_RADIUS,
+        unload_radius: float = UNLOAD_RADIUS,
+        attach_per_frame: int = ATTACH_PER_FRAME,
+    ):
+        """Stream ``index``'s chunks under ``parent`` around the player.
+
+        ``load_model(path)`` returns a NodePath and is called on the loader
+        thread. ``on_item_load(spec, model)`` turns a chunk item into a game
+        object (or returns ``None``); ``on_item_unload(obj)`` removes it again.
+        """
+        if unload_radius < load_radius:
+            raise ValueError("unload_radius must not be smaller than load_radius")
+        self.index = index
+        self.parent = parent
+        self.load_model = load_model
+        self.collision = collision
+        self.on_item_load = on_item_load
+        self.on_item_unload = on_item_unload
+        self.load_radius = load_radius
+        self.unload_radius = unload_radius
+        self.attach_per_frame = attach_per_frame
+        # items picked up by the player are not brought back on reload
+        self.collected = set()
+        self.loaded = {}
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-loader")
+        self.loads = 0
+        self.unloads = 0
+
+    def update(self, x: float, y: float, wait: bool = False):
+        """Queue loads and unloads for a player at (x, y); attach finished chunks.
+
+        With ``wait`` every queued chunk is finished and attached before
+        returning, e.g. at start-up so the player does not appear in a void.
+        """
+        for key in self.index.near(x, y, self.load_radius):
+            if key not in self.loaded and key not in self._pending:
+                self._pending[key] = self._executor.submit(build_chunk, self.index, key, self.load_model)
+        for key in [k for k in self.loaded if self.index.distance(k, x, y) > self.unload_radius]:
+            self._unload(self.loaded.pop(key))
+        for key in [k for k in self._pending if self.index.distance(k, x, y) > self.unload_radius]:
+            # drop the result; a running build cannot be interrupted
+            self._pending.pop(key).cancel()
+
+        budget = len(self._pending) if wait else self.attach_per_frame
+        for key, future in list(self._pending.items()):
+            if budget <= 0:
+                break
+            if not wait and not future.done():
+                continue
+            del self._pending[key]
+            chunk = future.result()
+            self._attach(chunk)
+            self.loaded[key] = chunk
+            budget -= 1
+
+    def _attach(self, chunk: Chunk):
+        chunk.root.reparentTo(self.parent)
+        if self.collision is not None and chunk.ground_z is not None:
+            self.collision.add_solid(
+                GROUND, self._ground_quad(chunk), owner=chunk.root, node_name=f"ground-{chunk.key}", moving=False
+            )
+        items = []
+        for spec, model in chunk.items:
+            if spec.get("id") in self.collected:
+                continue
+            model.setTag("item_id", str(spec.get("id", "")))
+            obj = self.on_item_load(spec, model) if self.on_item_load else None
+            if obj is None:
+                model.reparentTo(chunk.root)
+            items.append((spec, obj))
+        chunk.items = items
+        chunk.attached = True
+        self.loads += 1
+
+    def _ground_quad(self, chunk: Chunk):
+        # counter-clockwise seen from above, so the face points up
+        s = self.index.chunk_size
+        x0, y0, z = chunk.key[0] * s, chunk.key[1] * s, chunk.ground_z
+        return CollisionPolygon(Point3(x0, y0, z), Point3(x0 + s, y0, z), Point3(x0 + s, y0 + s, z), Point3(x0, y0 + s, z))
+
+    def _unload(self, chunk: Chunk):
+        for spec, obj in chunk.items:
+            if obj is not None and spec.get("id") not in self.collected and self.on_item_unload:
+                self.on_item_unload(obj)
+        if self.collision is not None:
+            self.collision.remove(chunk.root)
+        chunk.root.removeNode()
+        chunk.attached = False
+        self.unloads += 1
+
+    def spawn_zones(self, x: float = 0.0, y: float = 0.0, min_distance: float = 0.0):
+        """Spawn zones of every loaded chunk lying entirely ``min_distance``
+        or more away from (x, y)."""
+        return [
+            zone for chunk in self.loaded.values() for zone in chunk.spawn_zones
+            # zone points scatter over a square of half-width ``radius``
+            if math.dist(zone["pos"], (x, y)) - math.sqrt(2.0) * zone.get("radius", 0.0) >= min_distance
+        ]
+
+    def stats(self):
+        return {
+            "loaded": len(self.loaded),
+            "pending": len(self._pending),
+            "loads": self.loads,
+            "unloads": self.unloads,
+        }
+
+    def close(self):
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+
+# --- world generator ---
+SHARD_POSITIONS = [(-8, 25, 0.2), (10, 35, 0.2), (6, 18, 0.2)]
+PROP_MODELS = ["models/misc/rgbCube", "models/misc/sphere"]
+
+
+def generate_world(out_dir, chunks: int = 8, chunk_size: float = CHUNK_SIZE, seed: int = 0, props: int = 6,
+                   safe_point=(0.0, -20.0), safe_radius: float = 20.0):
+    """Write a ``chunks`` x ``chunks`` world centred on the origin.
+
+    Every chunk gets flat ground with a colour, ``props`` scattered rocks and
+    bushes and a zombie spawn zone; the three quest shards keep their usual
+    positions. No spawn zone is placed within ``safe_radius`` of
+    ``safe_point`` (the player spawn).
+    """
+    rng = random.Random(seed)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    half = chunks // 2
+    keys = [(cx, cy) for cx in range(-half, chunks - half) for cy in range(-half, chunks - half)]
+    shards = {}
+    for i, pos in enumerate(SHARD_POSITIONS, 1):
+        key = (math.floor(pos[0] / chunk_size), math.floor(pos[1] / chunk_size))
+        shards.setdefault(key, []).append({
+            "id": f"shard{i}",
+            "name": f"Shard {i}",
+            "description": "A glowing fragment of the grove",
+            "model": "models/misc/rgbCube",
+            "pos": list(pos),
+            "scale": 0.7,
+            "color": [0.6 + 0.1 * i, 0.8 - 0.1 * i, 1.0, 1],
+        })
+    for cx, cy in keys:
+        x0, y0 = cx * chunk_size, cy * chunk_size
+        models = []
+        for _ in range(props):
+            s = rng.uniform(0.4, 1.6)
+            models.append({
+                "path": rng.choice(PROP_MODELS),
+                "pos": [round(x0 + rng.uniform(0, chunk_size), 2), round(y0 + rng.uniform(0, chunk_size), 2), 0.0],
+                "hpr": [round(rng.uniform(0, 360), 1), 0, 0],
+                "scale": [round(s, 2), round(s, 2), round(s * rng.uniform(0.6, 1.4), 2)],
+                "color": [0.35, round(rng.uniform(0.4, 0.7), 2), 0.3, 1],
+            })
+        centre = (x0 + chunk_size / 2, y0 + chunk_size / 2)
+        zones = []
+        if math.dist(centre, safe_point) > safe_radius:
+            zones.append({"pos": [centre[0], centre[1]], "radius": round(chunk_size / 4, 2)})
+        data = {"ground_z": 0.0, "ground_color": list(GROUND_COLOR), "models": models,
+                "items": shards.get((cx, cy), []), "spawn_zones": zones}
+        (out / chunk_file(cx, cy)).write_text(json.dumps(data, indent=1), encoding="utf-8")
+    index = {"chunk_size": chunk_size, "chunks": [list(k) for k in keys]}
+    (out / WORLD_FILE).write_text(json.dumps(index), encoding="utf-8")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a chunked world for --world")
+    parser.add_argument("out_dir")
+    parser.add_argument("--chunks", type=int, default=8, help="chunks per side")
+    parser.add_argument("--chunk-size", type=float, default=CHUNK_SIZE)
+    parser.add_argument("--props", type=int, default=6, help="props per chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    out = generate_world(args.out_dir, args.chunks, args.chunk_size, args.seed, args.props)
+    print(f"wrote {args.chunks * args.chunks} chunks to {out}")
+
+
+if __name__ == "__main__":
+    main()
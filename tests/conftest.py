@@ -1,4 +1,5 @@
 import sys
+import weakref
 from types import ModuleType
 from pathlib import Path
 
@@ -39,6 +40,12 @@ def _install_fakes():
 
             return P(self._pos)
 
+        def setScale(self, *args):
+            self._scale = args
+
+        def setHpr(self, *args):
+            self._hpr = args
+
         def setZ(self, z):
             x, y, _ = self._pos
             self._pos = (x, y, z)
@@ -51,6 +58,7 @@ def _install_fakes():
 
         def attachNewNode(self, node):
             child = FakeNodePath(node)
+            child._parent = self
             self._children.append(child)
             return child
 
@@ -69,6 +77,36 @@ def _install_fakes():
         def getKey(self):
             return id(self)
 
+        def setPythonTag(self, k, v):
+            self._python_tags = getattr(self, "_python_tags", {})
+            self._python_tags[k] = v
+
+        def getPythonTag(self, k):
+            return getattr(self, "_python_tags", {}).get(k)
+
+        def hasPythonTag(self, k):
+            return k in getattr(self, "_python_tags", {})
+
+        def getTransform(self, other=None):
+            return ("transform", self._pos)
+
+        def setTransform(self, t):
+            self._transform = t
+
+        def getNumChildren(self):
+            return len(self._children)
+
+        def detachNode(self):
+            if self._parent is not None and self in self._parent._children:
+                self._parent._children.remove(self)
+            self._parent = None
+
+        def removeNode(self):
+            self._removed = True
+            if self._parent is not None and self in self._parent._children:
+                self._parent._children.remove(self)
+            self._node = None
+
         def findNetTag(self, tag):
             # simplification: return self if tag present
             class NP:
@@ -88,6 +126,17 @@ def _install_fakes():
 
     core.NodePath = FakeNodePath
 
+    class WeakNodePath:
+        # a removed node, or one nobody references any more, counts as freed
+        def __init__(self, np):
+            self._ref = weakref.ref(np)
+
+        def wasDeleted(self):
+            np = self._ref()
+            return np is None or getattr(np, "_removed", False)
+
+    core.WeakNodePath = WeakNodePath
+
     class CollisionNode:
         def __init__(self, name):
             self.name = name
@@ -169,6 +218,30 @@ def _install_fakes():
 
     core.CollisionSphere = CollisionSphere
 
+    class CollisionPolygon:
+        def __init__(self, *points):
+            self.points = points
+
+    core.CollisionPolygon = CollisionPolygon
+
+    class CollisionHandlerQueue:
+        pass
+
+    core.CollisionHandlerQueue = CollisionHandlerQueue
+
+    class CollisionTraverser:
+        def __init__(self, name=""):
+            self.colliders = []
+            self.traversed = []
+
+        def addCollider(self, np, handler):
+            self.colliders.append((np, handler))
+
+        def traverse(self, root):
+            self.traversed.append(root)
+
+    core.CollisionTraverser = CollisionTraverser
+
     # Minimal Geom/Vertex stubs used by utils.make_colored_triangle
     class Geom:
         UHStatic = 0
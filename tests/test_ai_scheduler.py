@@ -0,0 +1,129 @@
+import numpy as np
+
+from aiden.ai_scheduler import AIScheduler
+from aiden.ecs import EntityStore, seek
+
+
+class Ent:
+    def __init__(self, name, near=False):
+        self.name = name
+        self.near = near
+
+
+class StepClock:
+    """Fake clock that advances a fixed amount each time it is read."""
+
+    def __init__(self, step):
+        self.t = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.t += self.step
+        return self.t
+
+
+def test_budget_caps_updates_and_carries_dt_over():
+    # each clock read costs 1 ms, budget 3 ms -> a few updates per frame
+    sched = AIScheduler(budget_ms=3.0, clock=StepClock(0.001))
+    ents = [Ent(f"e{i}") for i in range(10)]
+    seen = {}
+
+    def update(e, dt):
+        seen.setdefault(e.name, []).append(dt)
+
+    sched.begin_frame()
+    n1 = sched.step(ents, 0.1, update)
+    assert 0 < n1 < len(ents)
+    assert sched.last_deferred == len(ents) - n1
+
+    # run frames until everybody was updated once
+    frames = 1
+    while len(seen) < len(ents):
+        sched.begin_frame()
+        sched.step(ents, 0.1, update)
+        frames += 1
+    # the last entity waited several frames and gets all of that time
+    last = ents[-1].name
+    assert abs(seen[last][0] - 0.1 * frames) < 1e-9
+
+
+def test_priority_entities_go_first():
+    sched = AIScheduler(budget_ms=0.0, min_updates=1, clock=StepClock(0.001))
+    ents = [Ent("far1"), Ent("far2"), Ent("near", near=True)]
+    order = []
+    sched.begin_frame()
+    sched.step(ents, 0.016, lambda e, dt: order.append(e.name), priority=lambda e: e.near)
+    assert order == ["near"]
+
+
+def test_total_dt_is_conserved_with_unbounded_budget():
+    sched = AIScheduler(budget_ms=1e9)
+    ents = [Ent("a"), Ent("b")]
+    total = {"a": 0.0, "b": 0.0}
+    for _ in range(5):
+        sched.begin_frame()
+        sched.step(ents, 0.02, lambda e, dt: total.__setitem__(e.name, total[e.name] + dt))
+    assert abs(total["a"] - 0.1) < 1e-9
+    assert abs(total["b"] - 0.1) < 1e-9
+
+
+def test_priority_checks_per_step_are_bounded_and_kept():
+    sched = AIScheduler(budget_ms=1e9, classify_per_step=4)
+    ents = [Ent(f"e{i}") for i in range(20)]
+    checked = []
+
+    def priority(e):
+        checked.append(e.name)
+        return e.near
+
+    order = []
+    sched.step(ents, 0.016, lambda e, dt: order.append(e.name), priority=priority)
+    assert len(checked) == 4
+    ents[10].near = True
+    for _ in range(3):  # the cursor reaches e10 on the third step
+        order.clear()
+        sched.step(ents, 0.016, lambda e, dt: order.append(e.name), priority=priority)
+    assert len(checked) == 16
+    assert order[0] == "e10" and order.count("e10") == 1
+    # still first on later steps without being re-checked
+    order.clear()
+    sched.step(ents, 0.016, lambda e, dt: order.append(e.name))
+    assert order[0] == "e10"
+
+
+def test_tracked_entity_only_owes_time_since_it_joined():
+    sched = AIScheduler(budget_ms=1e9)
+    old = Ent("old")
+    seen = {}
+    sched.step([old], 0.5, lambda e, dt: None)
+    new = Ent("new")
+    sched.track(new)
+    sched.step([old, new], 0.1, lambda e, dt: seen.__setitem__(e.name, dt))
+    assert abs(seen["new"] - 0.1) < 1e-9 and abs(seen["old"] - 0.1) < 1e-9
+
+
+def test_budget_bounds_node_sync_not_movement():
+    # the game's split: seek moves every entity, the scheduler syncs a few
+    store = EntityStore()
+    eids = store.create_many(
+        10, transform={"x": np.arange(10, 20, dtype="f4")}, motion={"speed": 1.0}, health={"alive": True}
+    )
+    ents = [Ent(int(e)) for e in eids]
+    synced = {}
+
+    def sync(e, dt):
+        synced[e.name] = float(store.get(e.name, "transform")["x"])
+
+    sched = AIScheduler(budget_ms=3.0, clock=StepClock(0.001))
+    for frame in range(1, 4):
+        sched.begin_frame()
+        seek(store, 0.0, 0.0, 1.0)
+        assert 0 < sched.step(ents, 1.0, sync) < len(ents)
+        # every entity moved this frame, whether or not it was synced
+        xs = [float(store.get(int(e), "transform")["x"]) for e in eids]
+        assert xs == [10.0 + i - frame for i in range(10)]
+    # a zombie synced late lands where it is now, whatever it missed
+    while len(synced) < len(ents):
+        sched.begin_frame()
+        sched.step(ents, 0.0, sync)
+    assert synced[ents[-1].name] == float(store.get(ents[-1].name, "transform")["x"])
@@ -0,0 +1,107 @@
+from aiden.animation import ATTACK, DIE, IDLE, SPAWN, WALK, ZombieAnimator
+
+
+class CountingActor:
+    def __init__(self, durations=None):
+        self.calls = []
+        self.durations = durations or {}
+        self.effects = {}
+
+    def loop(self, anim):
+        self.calls.append(("loop", anim))
+
+    def play(self, anim):
+        self.calls.append(("play", anim))
+
+    def stop(self, anim=None):
+        self.calls.append(("stop", anim))
+
+    def getDuration(self, anim):
+        return self.durations.get(anim, 1.0)
+
+    def getCurrentAnim(self):
+        raise AssertionError("the animator must not query the actor")
+
+    def enableBlend(self):
+        self.calls.append(("blend", None))
+
+    def setControlEffect(self, anim, w):
+        self.effects[anim] = w
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_repeated_requests_touch_the_actor_once():
+    actor = CountingActor()
+    anim = ZombieAnimator(actor, IDLE, clock=Clock())
+    for _ in range(100):
+        anim.request(WALK)
+    for _ in range(100):
+        anim.request(IDLE)
+    assert actor.calls == [("loop", WALK), ("loop", IDLE)]
+    assert anim.transitions == 2
+
+
+def test_one_shots_defer_locomotion_and_return_to_it():
+    actor = CountingActor({SPAWN: 2.0, ATTACK: 0.5})
+    clock = Clock()
+    anim = ZombieAnimator(actor, IDLE, clock=clock)
+    assert anim.request(SPAWN)
+    clock.t = 1.0
+    assert not anim.request(WALK)  # remembered until spawn ends
+    assert anim.busy and anim.state == SPAWN
+    clock.t = 2.0
+    anim.update()
+    assert anim.state == WALK
+    anim.request(ATTACK)
+    clock.t = 2.6
+    anim.request(WALK)
+    assert actor.calls == [("play", SPAWN), ("loop", WALK), ("play", ATTACK), ("loop", WALK)]
+
+
+def test_die_is_final():
+    actor = CountingActor()
+    anim = ZombieAnimator(actor, WALK, clock=Clock())
+    assert anim.request(DIE)
+    assert not anim.request(WALK)
+    assert not anim.request(SPAWN)
+    assert actor.calls == [("play", DIE)]
+
+
+def test_cross_fade_weights():
+    actor = CountingActor()
+    clock = Clock()
+    anim = ZombieAnimator(actor, IDLE, blend_time=0.2, clock=clock)
+    anim.request(WALK)
+    assert actor.effects[WALK] == 0.0
+    clock.t = 0.1
+    anim.update()
+    assert abs(actor.effects[WALK] - 0.5) < 1e-9 and abs(actor.effects[IDLE] - 0.5) < 1e-9
+    clock.t = 0.3
+    anim.update()
+    assert actor.effects == {IDLE: 0.0, WALK: 1.0}
+    assert actor.calls[-1] == ("stop", IDLE)
+    # settled: no more actor calls
+    n = len(actor.calls)
+    anim.update()
+    anim.request(WALK)
+    assert len(actor.calls) == n
+
+
+def test_frozen_animator_tracks_state_and_resumes_it():
+    actor = CountingActor()
+    anim = ZombieAnimator(actor, IDLE, clock=Clock())
+    anim.set_animated(False)
+    anim.request(WALK)
+    anim.request(IDLE)
+    anim.request(WALK)
+    assert actor.calls == [("stop", None)]
+    assert anim.state == WALK
+    anim.set_animated(True)
+    assert actor.calls[-1] == ("loop", WALK)
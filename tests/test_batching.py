@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+from aiden.rag.batching import MicroBatcher
+
+
+class SlowDouble:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.calls.append(list(items))
+        time.sleep(self.delay)
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [i * 2 for i in items]
+
+
+def test_lone_request_is_not_delayed():
+    fn = SlowDouble(delay=0.0)
+    batcher = MicroBatcher(fn, max_wait_ms=500)
+
+    async def main():
+        start = time.perf_counter()
+        assert await batcher.submit(3) == 6
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 0.2
+    assert batcher.stats()["batches"] == 1
+
+
+def test_concurrent_requests_share_batches():
+    fn = SlowDouble()
+    batcher = MicroBatcher(fn, max_batch=8, max_wait_ms=5, max_concurrent=2)
+
+    async def main():
+        return await asyncio.gather(*[batcher.submit(i) for i in range(20)])
+
+    assert asyncio.run(main()) == [i * 2 for i in range(20)]
+    stats = batcher.stats()
+    assert stats["items"] == 20
+    assert stats["batches"] < 20
+    assert max(len(c) for c in fn.calls) <= 8
+    assert stats["max_batch"] > 1
+    assert "wait_p95_ms" in stats
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    batcher = MicroBatcher(SlowDouble(delay=0.0), max_concurrent=1)
+
+    async def main():
+        first = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0)
+        rest = asyncio.gather(batcher.submit("bad"), batcher.submit(2), return_exceptions=True)
+        return await first, await rest
+
+    first, rest = asyncio.run(main())
+    assert first == 2
+    assert all(isinstance(r, ValueError) for r in rest)
@@ -0,0 +1,23 @@
+import math
+
+from aiden.bench_render import PATH_PERIOD, camera_path, summarize
+
+
+def test_camera_path_is_a_closed_loop_facing_forward():
+    start = camera_path(0.0)
+    end = camera_path(PATH_PERIOD)
+    assert all(math.isclose(a, b, abs_tol=1e-6) for a, b in zip(start, end))
+    # the heading points from one sample toward the next
+    x0, y0, h = camera_path(1.0)
+    x1, y1, _ = camera_path(1.01)
+    assert math.isclose(math.degrees(math.atan2(-(x1 - x0), y1 - y0)), h, abs_tol=0.5)
+
+
+def test_summarize_reports_distribution_draws_and_scene():
+    result = summarize(10, [2.0, 4.0, 6.0], [5, 7], {"nodes": 3})
+    assert result["zombies"] == 10
+    assert result["frame"]["n"] == 3 and result["frame"]["mean_ms"] == 4.0
+    assert result["fps_mean"] == 250.0
+    assert result["draw_calls"] == {"mean": 6.0, "max": 7}
+    assert result["scene"] == {"nodes": 3}
+    assert result["frame_ms"] == [2.0, 4.0, 6.0]
@@ -0,0 +1,52 @@
+from aiden.rag.bm25 import BM25Index
+from aiden.rag.embeddings import HashingEmbedder
+from aiden.rag.ingest import Ingester
+from aiden.rag.numpy_store import NumpyStore
+from aiden.rag.retrieval import HybridRetriever, reciprocal_rank_fusion
+from aiden.rag.store import Hit
+
+DOCS = [
+    ("a", "Yellow tennis balls were first used at Wimbledon in 1986.", "docs.txt"),
+    ("b", "The word love possibly derives from the French l'oeuf, meaning egg.", "docs.txt"),
+    ("c", "Venus and Serena Williams won Olympic gold in Sydney.", "other.txt"),
+    ("d", "A player runs about three miles during a tennis match.", "other.txt"),
+]
+
+
+def test_exact_terms_rank_first_and_index_round_trips(tmp_path):
+    index = BM25Index.build(DOCS)
+    hits = index.search(["when was wimbledon yellow"], k=2)[0]
+    assert hits[0].id == "a"
+    assert hits[0].metadata["source"] == "docs.txt"
+    assert index.search(["cricket"], k=3) == [[]]
+
+    path = tmp_path / "bm25.npz"
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert loaded.search(["french egg"], k=1)[0][0].text == DOCS[1][1]
+    assert [h.id for h in loaded.search(["tennis"], k=4)[0]] == [h.id for h in index.search(["tennis"], k=4)[0]]
+
+
+def test_rrf_rewards_agreement():
+    dense = [Hit("x", "", 0.9), Hit("y", "", 0.8), Hit("z", "", 0.7)]
+    sparse = [Hit("z", "", 5.0), Hit("w", "", 4.0)]
+    fused = reciprocal_rank_fusion([dense, sparse], k=2)
+    assert [h.id for h in fused] == ["z", "x"]
+
+
+def test_ingest_builds_index_used_by_hybrid_retriever(tmp_path):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("\n\n".join(text for _, text, _ in DOCS), encoding="utf-8")
+    store = NumpyStore(tmp_path / "store")
+    embedder = HashingEmbedder(64)
+    bm25 = tmp_path / "bm25.npz"
+    Ingester(store, embedder, tmp_path / "manifest.json", bm25_path=bm25).run([corpus])
+    assert len(BM25Index.load(bm25)) == 4
+
+    retriever = HybridRetriever(store, embedder, bm25)
+    hits = retriever.search(["Olympic gold sisters"], k=2)[0]
+    assert "Olympic" in hits[0].text
+
+    corpus.write_text(DOCS[0][1], encoding="utf-8")
+    Ingester(store, embedder, tmp_path / "manifest.json", bm25_path=bm25).run([corpus])
+    assert len(retriever.index) == 1
@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+from aiden.rag.llm import OllamaClient
+from aiden.rag.pipeline import ChatPipeline
+from aiden.rag.server import ChatServer
+from aiden.rag.store import Hit
+
+
+class FakePipeline:
+    def __init__(self):
+        self.questions = []
+
+    async def stream(self, question):
+        self.questions.append(question)
+        if question == "fail":
+            raise RuntimeError("model unavailable")
+        if question == "refused":
+            raise ConnectionRefusedError("connect call failed")
+        for tok in ["Yellow ", "since ", "1986."]:
+            await asyncio.sleep(0)
+            yield tok
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return head.decode(), body.decode()
+
+
+def _run(coro_fn, tmp_path, pipeline=None):
+    page = tmp_path / "index.html"
+    page.write_text("<html>chat</html>")
+    pipeline = pipeline or FakePipeline()
+
+    async def main():
+        server = ChatServer(pipeline, page)
+        srv = await server.start("127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            return await coro_fn(port)
+        finally:
+            srv.close()
+
+    return asyncio.run(main()), pipeline
+
+
+def test_chat_streams_tokens_as_sse(tmp_path):
+    (head, body), pipeline = _run(lambda port: _request(port, "POST", "/chat", {"message": "why yellow?"}), tmp_path)
+    assert "text/event-stream" in head
+    events = [e for e in body.split("\n\n") if e]
+    tokens = [json.loads(e[len("data: "):])["token"] for e in events if e.startswith("data: ")]
+    assert "".join(tokens) == "Yellow since 1986."
+    assert events[-1].startswith("event: done")
+    assert pipeline.questions == ["why yellow?"]
+
+
+def test_concurrent_sessions_and_json_fallback(tmp_path):
+    async def many(port):
+        streams = [_request(port, "POST", "/chat", {"message": f"q{i}"}) for i in range(50)]
+        plain = _request(port, "POST", "/chat", {"message": "q", "stream": False})
+        return await asyncio.gather(*streams, plain)
+
+    results, pipeline = _run(many, tmp_path)
+    assert len(pipeline.questions) == 51
+    assert all("event: done" in body for _, body in results[:-1])
+    assert json.loads(results[-1][1]) == {"response": "Yellow since 1986."}
+
+
+def test_index_and_errors(tmp_path):
+    async def calls(port):
+        return await asyncio.gather(
+            _request(port, "GET", "/"),
+            _request(port, "POST", "/chat", {"message": "  "}),
+            _request(port, "GET", "/nope"),
+            _request(port, "GET", "/metrics"),
+        )
+
+    (index, empty, missing, metrics), _ = _run(calls, tmp_path)
+    assert json.loads(metrics[1]) == {"active_streams": 0}
+    assert index[1] == "<html>chat</html>"
+    assert " 400 " in empty[0]
+    assert " 404 " in missing[0]
+
+
+async def _raw(port, request: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return head.decode(), body.decode()
+
+
+def test_bad_content_length_and_failed_json_generation(tmp_path):
+    async def calls(port):
+        return await asyncio.gather(
+            _raw(port, b"POST /chat HTTP/1.1\r\nHost: x\r\nContent-Length: lots\r\n\r\n"),
+            _raw(port, b"POST /chat HTTP/1.1\r\nHost: x\r\nContent-Length: -5\r\n\r\n"),
+            _request(port, "POST", "/chat", {"message": "fail", "stream": False}),
+            _request(port, "POST", "/chat", {"message": "fail"}),
+        )
+
+    (garbled, negative, failed, streamed), _ = _run(calls, tmp_path)
+    assert " 400 " in garbled[0] and json.loads(garbled[1]) == {"error": "bad content-length"}
+    assert " 400 " in negative[0]
+    assert " 500 " in failed[0] and json.loads(failed[1]) == {"error": "model unavailable"}
+    assert "event: error" in streamed[1]
+
+
+class OneHitRetriever:
+    def embed(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def search_vectors(self, vectors, k, queries=None):
+        return [[Hit("1", "Yellow balls since 1986.", 1.0)] for _ in vectors]
+
+
+def test_model_server_down_is_reported_not_dropped(tmp_path):
+    import socket
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        dead = s.getsockname()[1]  # nothing listens here once closed
+    pipeline = ChatPipeline(OneHitRetriever(), OllamaClient(f"http://127.0.0.1:{dead}"))
+
+    async def calls(port):
+        return await asyncio.gather(
+            _request(port, "POST", "/chat", {"message": "why yellow?", "stream": False}),
+            _request(port, "POST", "/chat", {"message": "why yellow?"}),
+        )
+
+    (plain, streamed), _ = _run(calls, tmp_path, pipeline)
+    assert " 500 " in plain[0]
+    assert "cannot reach model server" in json.loads(plain[1])["error"]
+    assert " 200 " in streamed[0]
+    events = [e for e in streamed[1].split("\n\n") if e]
+    assert events[-1].startswith("event: error")
+    assert "cannot reach model server" in events[-1]
+
+
+def test_upstream_connection_errors_are_not_mistaken_for_the_client_leaving(tmp_path):
+    async def calls(port):
+        return await asyncio.gather(
+            _request(port, "POST", "/chat", {"message": "refused", "stream": False}),
+            _request(port, "POST", "/chat", {"message": "refused"}),
+        )
+
+    (plain, streamed), _ = _run(calls, tmp_path)
+    assert " 500 " in plain[0] and json.loads(plain[1]) == {"error": "connect call failed"}
+    assert "event: error" in streamed[1]
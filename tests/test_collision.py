@@ -0,0 +1,64 @@
+from panda3d.core import CollisionNode, CollisionRay, CollisionSphere, CollisionPlane, NodePath
+
+from aiden.actors import Item, Zombie
+from aiden.collision import CollisionLayers, GROUND, PICK
+from aiden.scenes import _attach_flat_ground_plane
+
+
+def test_solids_go_on_their_own_layer_root():
+    render = NodePath()
+    layers = CollisionLayers(render)
+    zombie = Zombie(NodePath(), "z1", collision=layers)
+    shard = Item(NodePath(), "Shard 1", collision=layers)
+    _attach_flat_ground_plane(NodePath(), layers)
+
+    assert layers.count(PICK) == 2
+    assert layers.count(GROUND) == 1
+    # nothing collidable is left under the actors themselves
+    assert zombie.node._children == []
+    assert shard.node._children == []
+    assert layers.mask(PICK) == 1 << 1 and layers.mask(GROUND) == 1 << 2
+
+
+def test_traverse_syncs_owners_and_walks_only_that_layer():
+    render = NodePath()
+    layers = CollisionLayers(render)
+    ray = NodePath(CollisionNode("ray"))
+    ray.node().addSolid(CollisionRay())
+    layers.add_collider(PICK, ray)
+    assert ray.node()._from == layers.mask(PICK)
+
+    walker = NodePath()
+    still = NodePath()
+    moving = layers.add_solid(PICK, CollisionSphere(0, 0, 0, 1), owner=walker)
+    static = layers.add_solid(PICK, CollisionSphere(0, 0, 0, 1), owner=still, moving=False)
+    walker.setPos(3, 4, 0)
+    still.setPos(1, 1, 0)
+
+    layers.traverse(PICK)
+    trav = layers.layer(PICK).traverser
+    assert trav.traversed == [layers.root(PICK)]
+    assert layers.layer(GROUND).traverser.traversed == []
+    assert moving._transform == ("transform", (3, 4, 0))
+    assert static._transform == ("transform", (1, 1, 0))
+
+    # only moving owners are re-synced on later traversals
+    walker.setPos(5, 5, 0)
+    still.setPos(9, 9, 0)
+    layers.traverse(PICK)
+    assert moving._transform == ("transform", (5, 5, 0))
+    assert static._transform == ("transform", (1, 1, 0))
+
+    assert layers.owner_of(moving) is walker
+    assert layers.owner_of(walker) is walker
+
+
+def test_remove_drops_an_owners_solids():
+    layers = CollisionLayers(NodePath())
+    owner = NodePath()
+    layers.add_solid(PICK, CollisionSphere(0, 0, 0, 1), owner=owner)
+    layers.add_solid(PICK, CollisionSphere(0, 0, 0, 1), owner=owner, moving=False)
+    layers.add_solid(GROUND, CollisionPlane(None))
+    layers.remove(owner)
+    assert layers.count(PICK) == 0
+    assert layers.count(GROUND) == 1
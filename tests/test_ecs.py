@@ -0,0 +1,114 @@
+import weakref
+
+import numpy as np
+from panda3d.core import NodePath
+
+from aiden.actors import Item, Zombie
+from aiden.ecs import EntityStore, follow_slots, seek
+
+
+def test_archetypes_stay_dense_across_destroy_and_moves():
+    store = EntityStore(capacity=2)
+    a = store.create(transform=(1, 2, 0, 0), motion={"speed": 3.0})
+    b = store.create(transform=(4, 5, 0, 0), motion={"speed": 1.0})
+    c = store.create(transform=(7, 8, 0, 0))
+    assert len(store.archetypes) == 2
+
+    store.destroy(a)  # b is moved into a's row
+    assert not store.alive(a) and len(store) == 2
+    assert store.get(b, "transform")["x"] == 4 and store.get(b, "motion")["speed"] == 1.0
+
+    store.add(c, "health", {"hp": 10, "max_hp": 10, "alive": True})
+    assert store.components(c) == ("health", "transform")
+    assert store.get(c, "transform")["y"] == 8 and store.get(c, "health")["hp"] == 10
+    store.remove(c, "health")
+    assert store.components(c) == ("transform",) and store.get(c, "transform")["x"] == 7
+
+    # ids are reused and records are views into the columns
+    d = store.create(transform=None)
+    assert d == a
+    store.get(d, "transform")["z"] = 5.0
+    ids, cols = next(store.query("transform", "motion"))
+    assert list(ids) == [b]
+    assert store.count("transform") == 3
+
+
+def test_seek_system_over_100k_entities():
+    store = EntityStore()
+    n = 100_000
+    rng = np.random.default_rng(0)
+    eids = store.create_many(
+        n,
+        transform={"x": rng.uniform(-500, 500, n), "y": rng.uniform(-500, 500, n)},
+        motion={"speed": 4.0},
+        health={"hp": 100, "max_hp": 100, "alive": True},
+    )
+    store.get(int(eids[0]), "transform")["x"] = 0.5
+    store.get(int(eids[0]), "transform")["y"] = 0.0
+    store.get(int(eids[1]), "health")["alive"] = False
+    before = store.get(int(eids[1]), "transform")["x"]
+    xs0 = np.array([float(store.get(int(e), "transform")["x"]) for e in eids[2:7]])
+    ys0 = np.array([float(store.get(int(e), "transform")["y"]) for e in eids[2:7]])
+
+    contacts = seek(store, 0.0, 0.0, 0.5)
+    assert int(eids[0]) in contacts
+    assert store.get(int(eids[1]), "transform")["x"] == before  # the dead stay put
+    # everyone else closed in by speed * dt in the same pass
+    xs = np.array([float(store.get(int(e), "transform")["x"]) for e in eids[2:7]])
+    ys = np.array([float(store.get(int(e), "transform")["y"]) for e in eids[2:7]])
+    assert np.allclose(np.hypot(xs0, ys0) - np.hypot(xs, ys), 2.0, atol=1e-3)
+    # well under 100 bytes per entity
+    assert store.nbytes() / n < 100
+
+
+def test_seek_leaves_held_entities_in_place():
+    store = EntityStore()
+    eids = store.create_many(
+        3,
+        transform={"x": [0.5, 10.0, 20.0]},
+        motion={"speed": 4.0},
+        health={"alive": True},
+    )
+    contacts = seek(store, 0.0, 0.0, 1.0, held=[int(eids[0]), int(eids[2])])
+    assert len(contacts) == 0  # a held entity is not touching anything yet
+    xs = [float(store.get(int(e), "transform")["x"]) for e in eids]
+    assert xs == [0.5, 6.0, 20.0]
+
+
+def test_follow_slots_copies_horde_transforms_in_bulk():
+    store = EntityStore()
+    eids = store.create_many(
+        3,
+        transform={"x": 1.0, "y": 1.0, "z": 0.5},
+        health={"alive": True},
+        horde={"slot": [4, 0, 2]},
+    )
+    plain = store.create(transform={"x": 9.0})  # not in the horde
+    pos = np.arange(10, dtype=np.float64).reshape(5, 2)
+    heading = np.array([0.0, 10.0, 20.0, 30.0, 40.0], dtype=np.float32)
+    contacts = follow_slots(store, pos, heading, touching=[0, 4], held=[int(eids[0])])
+    assert contacts.tolist() == [int(eids[1])]
+    rows = [store.get(int(e), "transform").item() for e in eids]
+    assert rows == [(1.0, 1.0, 0.5, 0.0), (0.0, 1.0, 0.5, 0.0), (4.0, 5.0, 0.5, 20.0)]
+    assert store.get(plain, "transform")["x"] == 9.0
+
+
+def test_actors_are_slot_handles_into_the_store():
+    store = EntityStore()
+    z = Zombie(NodePath(), "z1", store=store)
+    assert not hasattr(z, "__dict__")
+    assert weakref.ref(z)() is z
+    assert z.health == 100 and z.alive and z.speed == 4.0
+    z.take_damage(40)
+    assert store.get(z.entity, "health")["hp"] == 60
+    z.set_pos(1, 2, 3)
+    assert z.position == (1.0, 2.0, 3.0)
+    z.set_walking(True)
+    assert store.get(z.entity, "animation")["state"] == 1
+
+    item = Item(NodePath(), "coin", store=store)
+    assert store.components(item.entity) == ("collectible", "collider", "transform")
+    z.take_damage(100)
+    assert not z.alive
+    z.destroy()
+    assert not z.alive and len(store) == 1
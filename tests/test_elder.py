@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from aiden.elder import ElderOracle
+
+
+class FakePipeline:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.questions = []
+
+    async def stream(self, question):
+        self.questions.append(question)
+        if "fail" in question:
+            raise RuntimeError("model offline")
+        for tok in ["Yellow ", "since ", "1986."]:
+            await asyncio.sleep(self.delay)
+            yield tok
+
+
+def _drain(oracle, rid, timeout=2.0):
+    events = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        events += [e for e in oracle.poll() if e[0] == rid]
+        if events and events[-1][1] != "token":
+            return events
+        time.sleep(0.001)
+    raise AssertionError(f"no answer in time: {events}")
+
+
+def test_answers_stream_through_poll_and_common_questions_are_precomputed():
+    pipeline = FakePipeline()
+    oracle = ElderOracle(lambda: pipeline, common_questions=["Why are balls yellow?"])
+    try:
+        rid = oracle.ask("When did balls turn yellow?")
+        events = _drain(oracle, rid)
+        assert "".join(e[2] for e in events if e[1] == "token") == "Yellow since 1986."
+        assert events[-1][1] == "done"
+        assert oracle.cached("why are BALLS yellow") == "Yellow since 1986."
+        assert oracle.cached("who won wimbledon") is None
+    finally:
+        oracle.close()
+
+
+def test_poll_never_blocks_and_errors_are_reported():
+    oracle = ElderOracle(lambda: FakePipeline(delay=0.2), common_questions=())
+    try:
+        rid = oracle.ask("slow question")
+        start = time.perf_counter()
+        assert oracle.poll() == []
+        assert time.perf_counter() - start < 0.01
+        oracle.cancel(rid)
+
+        rid = oracle.ask("please fail")
+        events = _drain(oracle, rid)
+        assert events == [(rid, "error", "model offline")]
+    finally:
+        oracle.close()
+
+
+def test_failed_start_up_is_retried_by_the_next_question():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("store not ready")
+        return FakePipeline()
+
+    oracle = ElderOracle(factory, common_questions=())
+    try:
+        rid = oracle.ask("first")
+        assert _drain(oracle, rid) == [(rid, "error", "store not ready")]
+        rid = oracle.ask("second")
+        assert _drain(oracle, rid)[-1] == (rid, "done", None)
+        assert len(calls) == 2
+    finally:
+        oracle.close()
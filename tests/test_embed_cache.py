@@ -0,0 +1,70 @@
+import numpy as np
+
+from aiden.rag import embed_cache
+from aiden.rag.embed_cache import CachedEmbedder, EmbeddingCache, text_key
+from aiden.rag.embeddings import HashingEmbedder
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dim=8)
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return super().__call__(texts)
+
+
+def test_each_unique_text_is_embedded_once(tmp_path):
+    inner = CountingEmbedder()
+    emb = CachedEmbedder(inner, EmbeddingCache(tmp_path, dim=8, capacity=16))
+    first = emb(["a b", "c d", "a b"])
+    assert inner.calls == [["a b", "c d"]]
+    second = emb(["c d", "a b"])
+    assert len(inner.calls) == 1
+    assert np.allclose(second[0], first[1])
+    stats = emb.cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction_reuses_oldest_rows(tmp_path):
+    cache = EmbeddingCache(tmp_path, dim=2, capacity=2)
+    cache.put_many("m", ["k1", "k2"], [[1, 0], [0, 1]])
+    cache.get_many("m", ["k1"])  # k1 becomes most recently used
+    cache.flush()
+    cache.put_many("m", ["k3"], [[1, 1]])
+    got = cache.get_many("m", ["k1", "k2", "k3"])
+    assert sorted(got) == ["k1", "k3"]
+    assert len(cache) == 2
+
+
+def test_cache_is_shared_between_instances_and_models_are_separate(tmp_path):
+    a = EmbeddingCache(tmp_path, dim=2, capacity=4)
+    b = EmbeddingCache(tmp_path, dim=2, capacity=4)
+    key = text_key("hello")
+    a.put_many("model-a", [key], [[0.5, 0.5]])
+    assert np.allclose(b.get_many("model-a", [key])[key], [0.5, 0.5])
+    assert b.get_many("model-b", [key]) == {}
+    a.close()
+    b.close()
+
+
+def test_large_puts_are_chunked_and_synced_per_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(embed_cache, "WRITE_BATCH", 1000)
+    cache = EmbeddingCache(tmp_path, dim=2, capacity=4000)
+    syncs = []
+    sync = cache._sync_maps
+    monkeypatch.setattr(cache, "_sync_maps", lambda: (syncs.append(cache._unsynced), sync()))
+    keys = [f"k{i}" for i in range(1200)]
+    cache.put_many("m", keys, np.ones((1200, 2)))
+    # more keys than one IN (...) query takes; the known ones are skipped
+    cache.put_many("m", keys[600:] + ["new"], np.zeros((601, 2)))
+    assert len(cache) == 1201
+    assert np.allclose(cache.get_many("m", ["k1100"])["k1100"], [1, 1])
+    for i in range(10):
+        cache.put_many("m", [f"small{i}"], [[0, 1]])
+    assert syncs == [1200]
+    cache.close()
+    assert syncs == [1200, 11]
@@ -0,0 +1,60 @@
+import pytest
+
+from aiden.governor import LEVELS, LoadGovernor
+
+
+def feed(gov, frame_ms, frames):
+    changes = []
+    for _ in range(frames):
+        level = gov.record(frame_ms)
+        if level is not None:
+            changes.append(level.name)
+    return changes
+
+
+def test_sustained_overload_steps_down_one_level_per_window():
+    gov = LoadGovernor(target_fps=50, window=10)  # 20 ms budget
+    assert feed(gov, 30.0, 9) == []  # window not full yet
+    assert feed(gov, 30.0, 1) == ["medium"]
+    assert feed(gov, 30.0, 25) == ["low", "minimal"]
+    assert feed(gov, 30.0, 20) == []  # nothing below minimal
+    assert gov.level is LEVELS[-1]
+
+
+def test_dead_band_holds_and_headroom_steps_back_up():
+    seen = []
+    gov = LoadGovernor(target_fps=50, window=10, on_change=seen.append)
+    feed(gov, 30.0, 10)
+    # between 0.7 and 1.0 of the budget: no change however long it lasts
+    assert feed(gov, 17.0, 100) == []
+    assert feed(gov, 10.0, 10) == ["high"]
+    assert [level.name for level in seen] == ["medium", "high"]
+    assert gov.stats()["changes"] == 2
+
+
+def test_percentile_ignores_rare_spikes():
+    gov = LoadGovernor(target_fps=50, window=100, percentile=95)
+    for i in range(300):
+        assert gov.record(60.0 if i % 50 == 0 else 15.0) is None
+    assert gov.level.name == "high"
+
+
+def test_band_must_be_ordered():
+    with pytest.raises(ValueError):
+        LoadGovernor(upgrade_below=1.0, downgrade_above=1.0)
+
+
+def test_vsync_jitter_around_the_budget_does_not_downgrade():
+    gov = LoadGovernor(target_fps=60, window=120)
+    jitter = [16.2, 16.7, 17.1, 16.5, 18.4, 16.6, 16.9, 17.8]
+    assert feed_cycle(gov, jitter, 1200) == []
+    assert gov.level.name == "high"
+
+
+def feed_cycle(gov, frames_ms, n):
+    changes = []
+    for i in range(n):
+        level = gov.record(frames_ms[i % len(frames_ms)])
+        if level is not None:
+            changes.append(level.name)
+    return changes
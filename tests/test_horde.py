@@ -0,0 +1,63 @@
+import numpy as np
+
+from aiden.horde import ShardedHorde
+
+
+def test_zombies_converge_and_report_contact():
+    h = ShardedHorde(capacity=8, shards=2)
+    try:
+        a = h.spawn(10.0, 0.0, speed=4.0)
+        b = h.spawn(-0.5, 0.0, speed=4.0)
+        contacts = h.step(1.0, 0.0, 0.0)
+        pos, heading = h.transforms()
+        assert np.allclose(pos[a], (6.0, 0.0))
+        # never overshoots the target
+        assert np.allclose(pos[b], (0.0, 0.0))
+        # facing -X means heading +90 in Panda3D terms
+        assert abs(heading[a] - 90.0) < 1e-4
+        assert list(contacts) == [b]
+    finally:
+        h.close()
+
+
+def test_zombie_is_handed_off_between_shards():
+    h = ShardedHorde(capacity=16, shards=2)
+    try:
+        # the rebalanced boundary lands on the median x, here x=5
+        for x in (-30.0, -20.0, 5.0, 10.0, 20.0, 30.0):
+            h.spawn(x, 50.0, speed=0.0)
+        runner = h.spawn(-1.0, 0.0, speed=10.0)
+        h.step(0.0, 0.0, 0.0)
+        assert h.state.owner[1][runner] == 0
+        h.step(1.0, 100.0, 0.0)
+        # now at x=9: owned by the right-hand shard for the next tick
+        assert h.state.owner[0][runner] == 1
+        h.step(0.5, 100.0, 0.0)
+        assert np.allclose(h.transforms()[0][runner], (14.0, 0.0))
+    finally:
+        h.close()
+
+
+def test_kill_frees_slot():
+    h = ShardedHorde(capacity=2)
+    try:
+        s = h.spawn(0.0, 0.0, 1.0)
+        assert len(h) == 1
+        h.kill(s)
+        assert len(h) == 0
+        assert h.state.owner[0][s] == -1
+    finally:
+        h.close()
+
+
+def test_zero_speed_holds_a_zombie_until_released():
+    h = ShardedHorde(capacity=4, shards=1)
+    try:
+        z = h.spawn(10.0, 0.0, speed=0.0)
+        h.step(1.0, 0.0, 0.0)
+        assert np.allclose(h.transforms()[0][z], (10.0, 0.0))
+        h.set_speed(z, 4.0)
+        h.step(1.0, 0.0, 0.0)
+        assert np.allclose(h.transforms()[0][z], (6.0, 0.0))
+    finally:
+        h.close()
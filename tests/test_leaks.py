@@ -0,0 +1,77 @@
+from panda3d.core import NodePath
+
+from aiden.actors import Zombie
+from aiden.ecs import EntityStore
+from aiden.leaks import LeakTracker, count_objects
+
+
+class Widget:
+    pass
+
+
+def test_count_objects_by_type_name():
+    keep = [Widget() for _ in range(5)]
+    counts = count_objects(("Widget", "NoSuchType"))
+    assert counts["Widget"] == 5 and counts["NoSuchType"] == 0
+    del keep
+
+
+def test_growth_ignores_warmup_and_fluctuation():
+    tracker = LeakTracker()
+    flat = [{"nodes": n, "rss_kb": 1000 + n} for n in (50, 90, 100, 100, 101, 100, 102)]
+    tracker.samples = [dict(s, t=i) for i, s in enumerate(flat)]
+    assert tracker.growth(warmup=2) == {}
+
+    tracker.samples.append({"nodes": 140, "rss_kb": 1000 + 20 * 1024, "t": 99})
+    assert tracker.growth(warmup=2) == {"nodes": (100, 140), "rss_kb": (1100, 1000 + 20 * 1024)}
+
+
+def test_tracker_samples_process_counters():
+    tracker = LeakTracker()
+    sample = tracker.sample("start")
+    assert sample["label"] == "start" and sample["rss_kb"] > 0
+    assert "py.Zombie" in sample
+
+
+def test_detached_but_held_nodes_count_as_growth():
+    tracker = LeakTracker()
+    render = NodePath()
+    held = []
+    for cycle in range(8):
+        for _ in range(5):
+            node = render.attachNewNode(f"zombie{cycle}")
+            tracker.watch(node)
+            if cycle < 4:
+                node.removeNode()
+            else:
+                # off the scene graph, but something still holds the handle
+                node.detachNode()
+                held.append(node)
+        tracker.sample()
+    assert render.getNumChildren() == 0
+    assert tracker.samples[3]["live_nodes"] == 0
+    assert tracker.growth(warmup=2)["live_nodes"] == (0, 20)
+
+    del node
+    held.clear()
+    assert tracker.sample()["live_nodes"] == 0
+
+
+class CleanupActor:
+    def __init__(self):
+        self.cleaned = False
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+def test_zombie_cleanup_releases_actor_node_and_entity():
+    store = EntityStore()
+    parent = NodePath()
+    z = Zombie(NodePath(), "z1", store=store)
+    z.reparent_to(parent)
+    actor = z.actor = CleanupActor()
+    z.cleanup()
+    assert actor.cleaned and z.actor is None
+    assert z.node not in parent._children
+    assert len(store) == 0 and not z.alive
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from aiden.rag.llm import LLMError, OllamaClient
+from aiden.rag.stub_llm import StubModelServer
+
+
+def _run(server, body):
+    async def main():
+        srv = await server.start("127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            return await body(f"http://127.0.0.1:{port}")
+        finally:
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_identical_prompts_share_one_generation():
+    server = StubModelServer("one two three four", token_delay=0.01)
+
+    async def body(url):
+        client = OllamaClient(url)
+        first = asyncio.ensure_future(client.generate("same"))
+        await asyncio.sleep(0.025)  # join mid-stream
+        rest = await asyncio.gather(*[client.generate("same") for _ in range(4)])
+        client.close()
+        return [await first] + rest, client
+
+    answers, client = _run(server, body)
+    assert answers == ["one two three four"] * 5
+    assert server.requests == 1
+    assert client.coalesced == 4
+
+
+def test_connections_are_reused_and_concurrency_is_bounded():
+    server = StubModelServer(lambda prompt: prompt.upper(), token_delay=0.005)
+
+    async def body(url):
+        client = OllamaClient(url, max_concurrency=3)
+        for i in range(3):
+            assert await client.generate(f"q {i}") == f"Q {i}"
+        answers = await asyncio.gather(*[client.generate(f"p {i}") for i in range(10)])
+        client.close()
+        return answers
+
+    answers = _run(server, body)
+    assert answers == [f"P {i}" for i in range(10)]
+    assert server.max_active <= 3
+    assert server.connections <= 3
+    assert server.requests == 13
+
+
+def test_abandoned_stream_does_not_poison_pool():
+    server = StubModelServer("a b c d e f", token_delay=0.005)
+
+    async def body(url):
+        client = OllamaClient(url)
+        stream = client.stream("x")
+        async for _ in stream:
+            break
+        await stream.aclose()
+        answer = await client.generate("y")
+        client.close()
+        return answer
+
+    assert _run(server, body) == "a b c d e f"
+
+
+def test_model_errors_reach_every_caller():
+    def reply(prompt):
+        raise RuntimeError("boom")
+
+    server = StubModelServer(reply)
+
+    async def body(url):
+        client = OllamaClient(url)
+        results = await asyncio.gather(*[client.generate("p") for _ in range(2)], return_exceptions=True)
+        client.close()
+        return results
+
+    results = _run(server, body)
+    assert all(isinstance(r, LLMError) for r in results)
+    assert server.requests == 1
+
+
+def test_connection_reset_raises_llm_error():
+    import socket
+    import struct
+
+    async def reset(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        sock = writer.get_extra_info("socket")
+        # linger 0: close sends RST instead of FIN
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.transport.abort()
+
+    async def main():
+        srv = await asyncio.start_server(reset, "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        client = OllamaClient(f"http://127.0.0.1:{port}")
+        try:
+            with pytest.raises(LLMError):
+                await client.generate("p")
+        finally:
+            client.close()
+            srv.close()
+            await srv.wait_closed()
+
+    asyncio.run(main())
+
+
+def _unused_port():
+    import socket
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_unreachable_model_server_raises_llm_error():
+    async def main():
+        client = OllamaClient(f"http://127.0.0.1:{_unused_port()}", coalesce=False)
+        try:
+            with pytest.raises(LLMError, match="cannot reach model server"):
+                await client.generate("p")
+            # shared generations report it the same way
+            client.coalesce = True
+            with pytest.raises(LLMError, match="cannot reach model server"):
+                await client.generate("p")
+        finally:
+            client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+import numpy as np
+
+from aiden.rag.numpy_store import NumpyStore, normalize
+
+
+def _corpus(n=500, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vecs = rng.normal(size=(n, dim)).astype(np.float32)
+    ids = [f"c{i}" for i in range(n)]
+    return ids, vecs
+
+
+def test_exact_search_matches_brute_force_and_survives_reopen(tmp_path):
+    ids, vecs = _corpus()
+    store = NumpyStore(tmp_path)
+    store.upsert(ids, vecs, [f"doc {i}" for i in ids], [{"n": i} for i in range(len(ids))])
+    queries = vecs[:3] + 0.01
+    before_flush = store.query(queries, 5)
+    store.flush()
+
+    reopened = NumpyStore(tmp_path)
+    assert reopened.count() == len(ids)
+    hits = reopened.query(queries, 5)
+    expected = np.argsort(-(normalize(queries) @ normalize(vecs).T), axis=1)[:, :5]
+    for row, exp in zip(hits, expected):
+        assert [h.id for h in row] == [ids[i] for i in exp]
+    assert [[h.id for h in r] for r in before_flush] == [[h.id for h in r] for r in hits]
+    assert hits[0][0].metadata == {"n": 0}
+
+
+def test_delete_and_upsert_are_visible_before_flush(tmp_path):
+    ids, vecs = _corpus(n=20)
+    store = NumpyStore(tmp_path)
+    store.upsert(ids, vecs, ids, [{}] * len(ids))
+    store.flush()
+    store.delete(["c0"])
+    assert store.query(vecs[0], 1)[0][0].id != "c0"
+    store.upsert(["c0"], vecs[:1], ["again"], [{}])
+    assert store.query(vecs[0], 1)[0][0].text == "again"
+    store.flush()
+    assert NumpyStore(tmp_path).count() == 20
+
+
+def test_ivf_search_finds_nearest_neighbours(tmp_path):
+    ids, vecs = _corpus(n=2000, dim=32, seed=1)
+    store = NumpyStore(tmp_path, ivf_lists=16, nprobe=16)
+    store.upsert(ids, vecs, ids, [{}] * len(ids))
+    store.flush()
+    assert (tmp_path / "ivf.npz").exists()
+    # probing every list is exact
+    hits = store.query(vecs[:10], 3)
+    assert [row[0].id for row in hits] == ids[:10]
+    # probing a few lists still finds the query's own vector
+    store.nprobe = 2
+    hits = store.query(vecs[:10], 1)
+    assert [row[0].id for row in hits] == ids[:10]
+
+
+def test_quantized_storage_shrinks_files_and_keeps_recall(tmp_path):
+    ids, vecs = _corpus(n=2000, dim=64)
+    queries = vecs[:20] + 0.05
+    truth = np.argsort(-(normalize(queries) @ normalize(vecs).T), axis=1)[:, :10]
+
+    sizes = {}
+    for dtype, rescore in (("float32", 0), ("float16", 0), ("int8", 0), ("int8", 4)):
+        path = tmp_path / f"{dtype}-{rescore}"
+        store = NumpyStore(path, dtype=dtype, rescore=rescore)
+        store.upsert(ids, vecs, ids, [{}] * len(ids))
+        store.flush()
+        sizes[dtype] = (path / "vectors.npy").stat().st_size
+        hits = NumpyStore(path, dtype=dtype, rescore=rescore).query(queries, 10)
+        found = [[int(h.id[1:]) for h in row] for row in hits]
+        recall = np.mean([len(set(f) & set(t)) / 10 for f, t in zip(found, truth)])
+        assert recall >= (0.999 if dtype == "float32" or rescore else 0.9)
+        if rescore:
+            # re-scored hits carry exact cosine scores
+            exact = normalize(queries[:1]) @ normalize(vecs[[found[0][0]]]).T
+            assert abs(hits[0][0].score - float(exact[0, 0])) < 1e-5
+
+    assert sizes["float16"] < sizes["float32"] * 0.55
+    assert sizes["int8"] < sizes["float32"] * 0.3
+
+
+def test_changing_dtype_reencodes_existing_store(tmp_path):
+    ids, vecs = _corpus(n=50)
+    store = NumpyStore(tmp_path)
+    store.upsert(ids, vecs, ids, [{}] * len(ids))
+    store.flush()
+    store = NumpyStore(tmp_path, dtype="int8")
+    store.flush()
+    assert np.load(tmp_path / "vectors.npy").dtype == np.int8
+    assert store.query(vecs[:1], 1)[0][0].id == "c0"
+
+
+def test_checkpoint_flush_appends_in_place_and_defers_clustering(tmp_path, monkeypatch):
+    import aiden.rag.numpy_store as numpy_store
+
+    calls = []
+    real_kmeans = numpy_store.kmeans
+    monkeypatch.setattr(numpy_store, "kmeans", lambda *a, **kw: calls.append(1) or real_kmeans(*a, **kw))
+    ids, vecs = _corpus(n=1200, dim=32, seed=2)
+    store = NumpyStore(tmp_path, ivf_lists=8, nprobe=1)
+    store.upsert(ids[:400], vecs[:400], ids[:400], [{}] * 400)
+    store.flush()
+    assert len(calls) == 1
+    inode = (tmp_path / "vectors.npy").stat().st_ino
+    for start in (400, 800):
+        batch = slice(start, start + 400)
+        store.upsert(ids[batch], vecs[batch], ids[batch], [{"n": start}] * 400)
+        store.flush(checkpoint=True)
+    assert len(calls) == 1
+    assert (tmp_path / "vectors.npy").stat().st_ino == inode
+    assert np.load(tmp_path / "vectors.npy").shape == (1200, 32)
+
+    # rows appended after the clustering are found even probing one list
+    reopened = NumpyStore(tmp_path, ivf_lists=8, nprobe=1)
+    assert reopened.count() == 1200
+    hits = reopened.query(vecs[[900, 1100]], 1)
+    assert [row[0].id for row in hits] == ["c900", "c1100"]
+    assert hits[0][0].metadata == {"n": 800}
+
+    reopened.flush()
+    assert len(calls) == 2
+    assert not (tmp_path / "docs.tail.jsonl").exists()
+    final = NumpyStore(tmp_path, ivf_lists=8, nprobe=8)
+    assert final._ivf[2][-1] == 1200
+    assert [row[0].id for row in final.query(vecs[[5, 1100]], 1)] == ["c5", "c1100"]
+
+
+def test_interrupted_checkpoint_keeps_the_rows_docs_list(tmp_path):
+    ids, vecs = _corpus(n=30)
+    store = NumpyStore(tmp_path)
+    store.upsert(ids[:10], vecs[:10], ids[:10], [{}] * 10)
+    store.flush()
+    store.upsert(ids[10:20], vecs[10:20], ids[10:20], [{}] * 10)
+    store.flush(checkpoint=True)
+    # vectors made it to disk, the last docs line only partly
+    tail = tmp_path / "docs.tail.jsonl"
+    tail.write_bytes(tail.read_bytes()[:-5])
+
+    store = NumpyStore(tmp_path)
+    assert store.count() == 19
+    store.upsert(ids[20:], vecs[20:], ids[20:], [{}] * 10)
+    store.flush(checkpoint=True)
+    reopened = NumpyStore(tmp_path)
+    assert reopened.count() == 29
+    assert reopened.query(vecs[25], 1)[0][0].id == "c25"
+    assert "c19" not in {h.id for h in reopened.query(vecs[19], 29)[0]}
+
+
+def test_quantized_checkpoint_encodes_only_appended_rows(tmp_path, monkeypatch):
+    import aiden.rag.numpy_store as numpy_store
+
+    encoded = []
+    real_quantize = numpy_store.quantize
+    monkeypatch.setattr(numpy_store, "quantize", lambda mat, dtype: encoded.append(len(mat)) or real_quantize(mat, dtype))
+    ids, vecs = _corpus(n=300, dim=32, seed=3)
+    store = NumpyStore(tmp_path, dtype="int8", rescore=4)
+    store.upsert(ids[:200], vecs[:200], ids[:200], [{}] * 200)
+    store.flush()
+    stored = np.load(tmp_path / "vectors.npy")
+    store.upsert(ids[200:], vecs[200:], ids[200:], [{}] * 100)
+    store.flush(checkpoint=True)
+    assert encoded == [200, 100]
+    after = np.load(tmp_path / "vectors.npy")
+    assert np.array_equal(after[:200], stored)
+    assert len(np.load(tmp_path / "scales.npy")) == len(np.load(tmp_path / "vectors.f32.npy")) == 300
+
+    reopened = NumpyStore(tmp_path, dtype="int8", rescore=4)
+    assert reopened.ids() == ids
+    np.testing.assert_allclose(reopened.embeddings(["c250"])[0], normalize(vecs[250]), atol=1e-6)
+    assert reopened.query(vecs[250], 1)[0][0].id == "c250"
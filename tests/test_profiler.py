@@ -0,0 +1,49 @@
+import time
+
+from aiden.profiler import FrameSampler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def hot():
+    _busy(0.004)
+
+
+def cold():
+    _busy(0.001)
+
+
+def update():
+    hot()
+    cold()
+
+
+def _run_frames(sampler):
+    while not sampler.done:
+        with sampler.frame():
+            update()
+        time.sleep(0.002)  # between frames nothing is sampled
+
+
+def test_samples_only_inside_frames_and_finds_hot_spot(tmp_path):
+    sampler = FrameSampler(frames=40, interval=0.0005)
+    try:
+        _run_frames(sampler)
+    finally:
+        sampler.stop()
+    assert sampler.frames_seen == 40
+    assert sampler.samples > 20
+    times = sampler.function_times()
+    # every stack is rooted at the function that opened the frame
+    assert all(stack[0].endswith(":_run_frames") for stack in sampler.stacks)
+    assert times["test_profiler.py:hot"][1] > times["test_profiler.py:cold"][1]
+    assert times["test_profiler.py:update"][0] < times["test_profiler.py:update"][1]
+
+    collapsed, table = sampler.write(tmp_path / "prof")
+    lines = open(collapsed).read().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert "test_profiler.py:hot" in open(table).read()
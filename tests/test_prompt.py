@@ -0,0 +1,41 @@
+from aiden.rag.prompt import PromptBuilder, count_tokens
+from aiden.rag.store import Hit
+
+
+def _hit(cid, text, score, tokens=None):
+    meta = {"tokens": tokens} if tokens is not None else {}
+    return Hit(cid, text, score, meta)
+
+
+def test_count_tokens_splits_long_words_and_punctuation():
+    assert count_tokens("") == 0
+    assert count_tokens("a b c") == 3
+    assert count_tokens("internationalisation!") == 6
+
+
+def test_chunks_are_packed_by_relevance_within_budget():
+    builder = PromptBuilder(max_prompt_tokens=60, max_answer_tokens=32)
+    hits = [
+        _hit("low", "least relevant but short", 0.1),
+        _hit("big", "word " * 40, 0.8),
+        _hit("top", "yellow balls since 1986", 0.9),
+        _hit("dup", "Yellow  balls since 1986", 0.85),
+        _hit("top", "yellow balls since 1986", 0.9),
+    ]
+    prompt = builder.build("when were balls yellow?", hits)
+    assert [h.id for h in prompt.hits] == ["top", "low"]
+    assert prompt.dropped == 3
+    assert prompt.tokens <= 60
+    assert prompt.text.index("1986") < prompt.text.index("least relevant")
+    assert prompt.options == {"num_predict": 32}
+
+
+def test_cached_counts_are_trusted_and_oversized_chunks_truncated():
+    builder = PromptBuilder(max_prompt_tokens=40)
+    # metadata from ingestion wins over re-counting
+    prompt = builder.build("q", [_hit("a", "word " * 100, 1.0, tokens=5)])
+    assert prompt.hits[0].text.count("word") == 100
+
+    prompt = builder.build("q", [_hit("b", "word " * 100, 1.0)])
+    assert 0 < prompt.hits[0].text.count("word") < 40
+    assert prompt.tokens <= 40
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from aiden.rag.bench import main, percentiles
+
+CORPUS = Path(__file__).resolve().parents[1] / "data" / "clean_docs.txt"
+
+
+def test_percentiles():
+    stats = percentiles([1.0] * 98 + [50.0, 100.0])
+    assert stats["n"] == 100
+    assert stats["p50_ms"] == 1.0
+    assert stats["max_ms"] == 100.0
+    assert percentiles([]) == {}
+
+
+def test_benchmark_writes_comparable_json(tmp_path):
+    out = tmp_path / "bench.json"
+    main([
+        str(CORPUS), "--backends", "numpy", "--embedder", "hashing-64", "--questions", "3",
+        "--repeats", "1", "--rounds", "2", "--token-delay", "0", "--scale", "2", "--output", str(out),
+    ])
+    results = json.loads(out.read_text())
+    run = results["runs"][0]
+    assert run["backend"] == "numpy"
+    assert run["ingest"]["chunks"] > 0
+    assert run["ingest"]["embedding_cache_hit_rate"] == 1.0
+    assert set(run["retrieval"]) == {"vector", "hybrid"}
+    assert run["retrieval"]["hybrid"]["recall@4"] > 0
+    quant = run["quantization"]
+    assert quant["int8"]["size_ratio"] > 2
+    assert 0 < quant["int8"]["recall_vs_float32"] <= 1
+    # second round is answered from the response cache
+    assert run["chat"]["no_cache"]["llm_requests"] == 6
+    assert run["chat"]["response_cache"]["llm_requests"] == 3
+
+
+def test_bench_ingest_closes_the_embedding_cache_when_ingest_fails(tmp_path, monkeypatch):
+    import sqlite3
+
+    import pytest
+
+    import aiden.rag.bench as bench
+    from aiden.rag.config import RagConfig, build_embedder
+
+    config = RagConfig(persist_dir=str(tmp_path), backend="numpy", embedder="hashing-64")
+    embedder = build_embedder(config)
+
+    def failing_ingester(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(bench, "build_embedder", lambda config: embedder)
+    monkeypatch.setattr(bench, "_ingester", failing_ingester)
+    with pytest.raises(OSError):
+        bench.bench_ingest(config, CORPUS)
+    with pytest.raises(sqlite3.ProgrammingError):
+        embedder.cache._db.execute("select 1")
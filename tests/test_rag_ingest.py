@@ -0,0 +1,86 @@
+from aiden.rag.chunking import iter_chunks, split_long
+from aiden.rag.embeddings import HashingEmbedder
+from aiden.rag.ingest import Ingester
+from aiden.rag.manifest import Manifest
+from aiden.rag.prompt import count_tokens
+
+
+class MemoryStore:
+    def __init__(self):
+        self.rows = {}
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        for i, e, d, m in zip(ids, embeddings, documents, metadatas):
+            self.rows[i] = (e, d, m)
+
+    def delete(self, ids):
+        for i in ids:
+            self.rows.pop(i, None)
+
+    def flush(self, checkpoint=False):
+        pass
+
+    def count(self):
+        return len(self.rows)
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dim=32)
+        self.embedded = 0
+
+    def __call__(self, texts):
+        self.embedded += len(texts)
+        return super().__call__(texts)
+
+
+def test_chunks_follow_paragraphs_and_split_long_text(tmp_path):
+    doc = tmp_path / "a.txt"
+    doc.write_text("first line\nstill first\n\nsecond para\n", encoding="utf-8")
+    chunks = list(iter_chunks(doc))
+    assert [c.text for c in chunks] == ["first line\nstill first", "second para"]
+    pieces = list(split_long("word " * 100, max_chars=60, overlap=10))
+    assert len(pieces) > 1
+    assert all(len(p) <= 60 for p in pieces)
+
+
+def test_reingest_only_embeds_changes(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("alpha fact\n\nbeta fact\n", encoding="utf-8")
+    (corpus / "b.md").write_text("gamma fact\n", encoding="utf-8")
+    manifest = tmp_path / "manifest.json"
+    store, emb = MemoryStore(), CountingEmbedder()
+
+    stats = Ingester(store, emb, manifest, batch_size=2, workers=2).run([corpus])
+    assert stats.chunks_embedded == 3
+    assert store.count() == 3
+    version = Manifest.load(manifest).corpus_version
+    # token counts are cached for prompt packing
+    assert all(m["tokens"] == count_tokens(d) > 0 for _, d, m in store.rows.values())
+
+    # unchanged corpus: nothing embedded, files skipped by fingerprint
+    stats = Ingester(store, emb, manifest).run([corpus])
+    assert stats.chunks_embedded == 0
+    assert stats.files_skipped == 2
+    assert emb.embedded == 3
+
+    # edit one paragraph and delete a file
+    (corpus / "a.txt").write_text("alpha fact\n\ndelta fact\n", encoding="utf-8")
+    (corpus / "b.md").unlink()
+    stats = Ingester(store, emb, manifest).run([corpus])
+    assert stats.chunks_embedded == 1
+    assert stats.chunks_deleted == 2
+    assert sorted(d for _, d, _ in store.rows.values()) == ["alpha fact", "delta fact"]
+    assert Manifest.load(manifest).corpus_version != version
+
+
+def test_embedder_change_rebuilds(tmp_path):
+    doc = tmp_path / "a.txt"
+    doc.write_text("one\n\ntwo\n", encoding="utf-8")
+    manifest = tmp_path / "m.json"
+    store = MemoryStore()
+    Ingester(store, HashingEmbedder(16), manifest).run([doc])
+    stats = Ingester(store, HashingEmbedder(32), manifest).run([doc])
+    assert stats.chunks_embedded == 2
+    assert store.count() == 2
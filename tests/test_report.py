@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from aiden.bench_render import summarize
+from aiden.report import build_report, compare, main, session_summary
+
+
+def bench(scale=1.0):
+    runs = [
+        summarize(n, [(1.0 + n / 10) * scale * f for f in (0.9, 1.0, 1.1, 1.0)], [10 + n], {"nodes": 100 + n})
+        for n in (0, 50)
+    ]
+    return {"meta": {"benchmark": "render", "commit": "abc1234"}, "runs": runs}
+
+
+def events():
+    out = []
+    for s in range(120):
+        out.append({"t": s, "ev": "tick", "gt": float(s), "frames": 60, "frame_p50_ms": 10.0 + s / 60,
+                    "frame_p95_ms": 12.0 + s / 30, "frame_max_ms": 20.0, "zombies": s // 10, "quality": "high"})
+        if s % 10 == 0:
+            out.append({"t": s, "ev": "spawn", "gt": float(s)})
+        if s % 30 == 0:
+            out.append({"t": s, "ev": "kill", "gt": float(s)})
+    return out
+
+
+def test_compare_flags_only_slowdowns_over_threshold():
+    rows = compare({0: {"p95_ms": 11.5}, 50: {"p95_ms": 10.0}}, {0: {"p95_ms": 10.0}, 50: {"p95_ms": 12.0}},
+                   threshold=10.0, metrics=("p95_ms",))
+    assert [(r["zombies"], r["delta_pct"], r["regression"]) for r in rows] == [(0, 15.0, True), (50, -16.67, False)]
+
+
+def test_session_summary_rates_and_frame_times():
+    s = session_summary(events())
+    assert s["game_minutes"] == pytest.approx(119 / 60, abs=0.01)
+    assert s["events"]["spawn"] == 12 and s["events"]["kill"] == 4
+    assert s["per_minute"]["spawn"] == pytest.approx(12 / (119 / 60), abs=0.01)
+    assert s["tick_frame_p95_ms"]["worst"] == 20.0
+    assert s["zombies"] == {"mean": 5.5, "max": 11}
+
+
+def test_report_writes_summary_and_flags_regressions(tmp_path):
+    report = build_report(tmp_path, bench=bench(1.5), baseline=bench(1.0), events=events(),
+                          baseline_events=events(), plots=False)
+    assert report["regressions"] and all(r["metric"] in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+                                         for r in report["regressions"])
+    assert json.loads((tmp_path / "summary.json").read_text())["bench"]["runs"][1]["zombies"] == 50
+    md = (tmp_path / "summary.md").read_text()
+    assert "Render benchmark" in md and "regression" in md and "spawn: 12" in md
+
+
+def test_cli_writes_plots(tmp_path, capsys):
+    pytest.importorskip("matplotlib")
+    (tmp_path / "render.json").write_text(json.dumps(bench()))
+    log = tmp_path / "events.jsonl"
+    log.write_text("\n".join(json.dumps(e) for e in events()) + "\n")
+    out = tmp_path / "report"
+    assert main(["--bench", str(tmp_path / "render.json"), "--baseline", str(tmp_path / "render.json"),
+                 "--telemetry", str(log), "--out", str(out), "--fail-on-regression"]) == 0
+    names = {p.name for p in out.iterdir()}
+    assert {"bench_frame_times.png", "bench_percentiles.png", "session_frame_times.png",
+            "session_load.png", "session_rates.png", "summary.md", "summary.json"} <= names
+    assert "# Performance report" in capsys.readouterr().out
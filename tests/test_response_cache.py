@@ -0,0 +1,84 @@
+import asyncio
+
+import numpy as np
+
+from aiden.rag.pipeline import ChatPipeline
+from aiden.rag.response_cache import ResponseCache
+from aiden.rag.store import Hit
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_exact_and_semantic_lookup():
+    cache = ResponseCache(max_entries=4, similarity=0.9)
+    cache.put("Why are tennis balls yellow?", "TV visibility", vector=[1.0, 0.0])
+    assert cache.get("  why are TENNIS balls yellow ") == "TV visibility"
+    assert cache.get("why yellow balls", vector=[0.99, 0.05]) == "TV visibility"
+    assert cache.get("who invented rackets", vector=[0.0, 1.0]) is None
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_ttl_lru_and_corpus_version():
+    clock = Clock()
+    cache = ResponseCache(max_entries=2, ttl=10.0, clock=clock)
+    cache.put("a", "A", vector=[1, 0])
+    cache.put("b", "B", vector=[0, 1])
+    cache.get("a")  # a is now most recently used
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    clock.t = 11.0
+    assert cache.get("a") is None
+    # expired semantic rows are gone too
+    assert cache.get("x", vector=[1, 0]) is None
+
+    cache.put("d", "D")
+    cache.set_corpus_version("v1")
+    assert len(cache) == 0
+
+
+class FakeRetriever:
+    def __init__(self):
+        self.searches = 0
+
+    def embed(self, texts):
+        return np.array([[1.0, float(len(t) % 3)] for t in texts])
+
+    def search_vectors(self, vectors, k, queries=None):
+        self.searches += 1
+        return [[Hit("1", "Yellow balls since 1986.", 1.0)]]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def stream(self, prompt, options=None):
+        self.prompts.append(prompt)
+        for tok in ["Since ", "1986."]:
+            yield tok
+
+
+def test_pipeline_answers_repeats_from_cache():
+    retriever, llm = FakeRetriever(), FakeLLM()
+    version = {"v": "1"}
+    pipe = ChatPipeline(retriever, llm, cache=ResponseCache(), corpus_version=lambda: version["v"])
+
+    async def ask(q):
+        return "".join([t async for t in pipe.stream(q)])
+
+    assert asyncio.run(ask("When were balls yellow?")) == "Since 1986."
+    assert "Yellow balls since 1986." in llm.prompts[0]
+    assert asyncio.run(ask("when were balls yellow")) == "Since 1986."
+    assert len(llm.prompts) == 1
+    assert retriever.searches == 1
+    version["v"] = "2"
+    asyncio.run(ask("when were balls yellow"))
+    assert len(llm.prompts) == 2
@@ -0,0 +1,73 @@
+import time
+
+from aiden.telemetry import Telemetry, read_events
+
+
+def test_events_are_written_in_order_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    tel = Telemetry(path, flush_interval=0.01)
+    for i in range(5000):
+        tel.emit("hit", zombie=f"Zombie{i % 7}", hp=i)
+    tel.emit("kill", zombie="Zombie1", gt=3.5)
+    tel.close()
+    events = list(read_events(path))
+    assert len(events) == 5001
+    assert [e["hp"] for e in events[:-1]] == list(range(5000))
+    assert events[-1]["ev"] == "kill" and events[-1]["gt"] == 3.5
+    stats = tel.stats()
+    assert stats["written"] == 5001 and stats["pending"] == 0
+    assert stats["batches"] < 5001  # written in batches, not per event
+    tel.emit("late")  # ignored after close
+    assert tel.stats()["emitted"] == 5001
+
+
+def test_emit_does_not_wait_for_the_writer(tmp_path):
+    tel = Telemetry(tmp_path / "events.jsonl", flush_interval=0.01)
+    start = time.perf_counter()
+    for i in range(20000):
+        tel.emit("tick", i=i)
+    elapsed = time.perf_counter() - start
+    tel.close()
+    # a queue put per event: far below a frame even on a slow host
+    assert elapsed / 20000 < 50e-6
+    assert tel.stats()["written"] == 20000
+
+
+def test_rotation_keeps_the_newest_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    tel = Telemetry(path, rotate_bytes=2000, keep=2, batch=10, flush_interval=0.01)
+    for i in range(400):
+        tel.emit("spawn", n=i)
+    tel.close()
+    assert tel.stats()["rotations"] > 2
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+    assert all(p.stat().st_size <= 2000 for p in tmp_path.iterdir())
+    ns = [e["n"] for e in read_events(path)]
+    # oldest files were dropped; what is left is the contiguous newest tail
+    assert ns == list(range(ns[0], 400))
+
+
+class FullDisk:
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_lost_events_are_counted_as_dropped(tmp_path):
+    tel = Telemetry(tmp_path / "events.jsonl", flush_interval=0.01)
+    tel._file = FullDisk()
+    for i in range(10):
+        tel.emit("tick", i=i)
+    tel.emit("bad", key={(1, 2): 3})  # a tuple key cannot be serialized
+    tel.close()
+    stats = tel.stats()
+    assert stats["written"] == 0
+    assert stats["dropped"] == 11
+    assert stats["pending"] == 0
+    assert stats["errors"] >= 2
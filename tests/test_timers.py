@@ -0,0 +1,70 @@
+from aiden.timers import Cooldown, TimerScheduler
+
+
+def test_timers_fire_in_due_order_on_game_time():
+    timers = TimerScheduler()
+    fired = []
+    timers.call_later(0.5, fired.append, "b")
+    timers.call_later(0.2, fired.append, "a")
+    timers.call_later(0.5, fired.append, "c")  # same deadline: insertion order
+    assert timers.advance(0.1) == 0.1
+    assert fired == []
+    timers.advance(0.5)
+    assert fired == ["a", "b", "c"]
+    assert len(timers) == 0 and timers.next_due() is None
+
+
+def test_cancel_pause_and_time_scale():
+    timers = TimerScheduler()
+    fired = []
+    keep = timers.call_later(1.0, fired.append, "keep")
+    drop = timers.call_later(1.0, fired.append, "drop")
+    drop.cancel()
+    assert len(timers) == 1
+
+    timers.paused = True
+    assert timers.advance(5.0) == 0.0
+    assert fired == [] and timers.now == 0.0
+
+    timers.paused = False
+    timers.time_scale = 2.0
+    assert timers.advance(0.5) == 1.0
+    assert fired == ["keep"]
+    assert not keep.active
+
+
+def test_repeating_timer_coalesces_missed_intervals_and_can_cancel_itself():
+    timers = TimerScheduler()
+    ticks = []
+
+    def tick():
+        ticks.append(timers.now)
+        if len(ticks) == 4:
+            spawner.cancel()
+
+    spawner = timers.call_every(1.0, tick, first=0.5)
+    timers.advance(0.4)
+    assert ticks == []
+    timers.advance(2.0)  # due at 0.5 and 1.5: one call, next at 2.5
+    assert len(ticks) == 1
+    assert timers.next_due() == 2.5
+    timers.advance(10.0)  # a long frame skips nine intervals
+    assert len(ticks) == 2
+    assert timers.next_due() == 12.5
+    timers.advance(0.1)
+    timers.advance(1.0)
+    assert len(ticks) == 4
+    assert timers.next_due() is None
+
+
+def test_cooldown_uses_game_time():
+    timers = TimerScheduler()
+    cooldown = Cooldown(timers, 0.35)
+    assert cooldown.trigger()
+    assert not cooldown.trigger()
+    timers.paused = True
+    timers.advance(1.0)
+    assert not cooldown.ready()
+    timers.paused = False
+    timers.advance(0.35)
+    assert cooldown.trigger()
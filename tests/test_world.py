@@ -0,0 +1,126 @@
+import json
+
+from panda3d.core import NodePath
+
+from aiden.collision import CollisionLayers, GROUND
+from aiden.world import ChunkStreamer, WorldIndex, generate_world
+
+
+def _streamer(tmp_path, **kwargs):
+    generate_world(tmp_path, chunks=6, chunk_size=32.0, seed=3, props=2)
+    loaded_paths = []
+    items = []
+
+    def load_model(path):
+        loaded_paths.append(path)
+        return NodePath()
+
+    def on_item_load(spec, model):
+        items.append(spec["id"])
+        return spec["id"]
+
+    streamer = ChunkStreamer(
+        WorldIndex.load(tmp_path),
+        NodePath(),
+        load_model,
+        collision=CollisionLayers(NodePath()),
+        on_item_load=on_item_load,
+        on_item_unload=items.remove,
+        **kwargs,
+    )
+    return streamer, loaded_paths, items
+
+
+def test_generated_world_format(tmp_path):
+    generate_world(tmp_path, chunks=4, chunk_size=32.0, seed=1, props=3)
+    index = json.loads((tmp_path / "world.json").read_text())
+    assert len(index["chunks"]) == 16
+    chunks = [json.loads(p.read_text()) for p in tmp_path.glob("chunk_*.json")]
+    assert len(chunks) == 16
+    assert all(len(c["models"]) == 3 and c["ground_z"] == 0.0 and c["ground_color"] for c in chunks)
+    shards = sorted(i["id"] for c in chunks for i in c["items"])
+    assert shards == ["shard1", "shard2", "shard3"]
+    # the player spawn at (0, -20) is kept free of zombie spawn zones
+    for c in chunks:
+        for zone in c["spawn_zones"]:
+            assert abs(zone["pos"][0]) + abs(zone["pos"][1] + 20) > 20
+
+
+def test_streams_chunks_around_the_player(tmp_path):
+    streamer, loaded_paths, items = _streamer(tmp_path, load_radius=20.0, unload_radius=40.0)
+    try:
+        streamer.update(0.0, 32.0, wait=True)
+        # the player stands on a chunk corner: only the four touching chunks load
+        assert set(streamer.loaded) == set(streamer.index.near(0.0, 32.0, 20.0))
+        assert set(streamer.loaded) == {(-1, 0), (0, 0), (-1, 1), (0, 1)}
+        assert streamer.collision.count(GROUND) == 4
+        assert len(loaded_paths) == 4 * 2 + len(items)
+        assert sorted(items) == ["shard1", "shard2", "shard3"]
+        assert streamer.spawn_zones()
+        # every loaded chunk brings visible ground covering its square
+        for key, chunk in streamer.loaded.items():
+            grounds = [c for c in chunk.root._children if getattr(c.node(), "name", None) == f"ground-{key[0]}-{key[1]}"]
+            assert len(grounds) == 1
+            (geom,) = grounds[0].node().geoms
+            assert geom.primitives[0].verts == [(0, 1, 2), (0, 2, 3)]
+
+        # moving a little past the load radius keeps everything (hysteresis)
+        streamer.update(0.0, 62.0, wait=True)
+        assert (0, 0) in streamer.loaded
+
+        # far away, the old chunks and their items and ground go away
+        streamer.update(0.0, -150.0, wait=True)
+        assert not {(-1, 0), (0, 0), (-1, 1), (0, 1)} & set(streamer.loaded)
+        assert items == []
+        assert streamer.collision.count(GROUND) == len(streamer.loaded)
+        assert streamer.stats()["unloads"] >= 4
+    finally:
+        streamer.close()
+
+
+def test_collected_items_stay_collected(tmp_path):
+    streamer, _, items = _streamer(tmp_path, load_radius=20.0, unload_radius=40.0)
+    try:
+        streamer.update(0.0, 20.0, wait=True)
+        assert "shard1" in items
+        streamer.collected.add("shard1")
+        items.remove("shard1")
+        streamer.update(0.0, 200.0, wait=True)
+        streamer.update(0.0, 20.0, wait=True)
+        assert "shard1" not in items
+        assert "shard3" in items
+    finally:
+        streamer.close()
+
+
+def test_attach_is_bounded_per_frame(tmp_path):
+    streamer, _, _ = _streamer(tmp_path, load_radius=40.0, unload_radius=60.0, attach_per_frame=1)
+    try:
+        streamer.update(0.0, 0.0)
+        for future in list(streamer._pending.values()):
+            future.result()
+        streamer.update(0.0, 0.0)
+        assert len(streamer.loaded) <= 2
+        while streamer._pending:
+            streamer.update(0.0, 0.0)
+        assert len(streamer.loaded) == len(streamer.index.near(0.0, 0.0, 40.0))
+    finally:
+        streamer.close()
+
+
+def test_spawn_zones_keep_clear_of_the_player(tmp_path):
+    streamer, _, _ = _streamer(tmp_path, load_radius=60.0, unload_radius=80.0)
+    try:
+        streamer.update(16.0, 16.0, wait=True)
+        everywhere = streamer.spawn_zones()
+        # zone centres sit in chunk centres, the player on one of them
+        assert any(z["pos"] == [16.0, 16.0] for z in everywhere)
+        away = streamer.spawn_zones(16.0, 16.0, 25.0)
+        assert away and len(away) < len(everywhere)
+        for zone in away:
+            r = zone["radius"]
+            for cx, cy in ((-r, -r), (-r, r), (r, -r), (r, r)):
+                x, y = zone["pos"][0] + cx, zone["pos"][1] + cy
+                assert ((x - 16.0) ** 2 + (y - 16.0) ** 2) ** 0.5 >= 25.0
+    finally:
+        streamer.close()